@@ -0,0 +1,255 @@
+"""
+Registry of optional, import-heavy capabilities.
+
+PyMuPDF, pdfplumber, lxml, Pillow and boto3 add hundreds of milliseconds
+(and a lot of memory) to every process that imports them, yet most requests
+never touch them. OCR engines are never imported here at all: they live in
+the OCR service's worker processes, and LLM calls only need httpx, which
+the web stack loads anyway. Modules that need one ask this registry for
+it at the point of use instead of importing it at module level, so importing
+`app.main` stays cheap and the server can accept requests right away.
+Availability is checked without importing anything.
+
+After startup, `warm_up()` loads the extraction capabilities in the
+background (in this process, the extraction pool workers and the parsing
+sandbox's fork server) and starts the OCR workers, so the first upload does not pay for it. Readiness reports
+"serving" as soon as the app is up and "extraction warm" once that is done.
+
+Usage:
+    fitz = require("pymupdf")              # imports on first use, then cached
+    if is_available("pdfplumber"): ...     # no import
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CapabilityUnavailableError(ImportError):
+    """Raised by require() when a capability's package is not installed or fails to import."""
+
+
+@dataclass(frozen=True)
+class Capability:
+    name: str
+    module: str
+    group: str
+    description: str
+
+
+CAPABILITIES: Dict[str, Capability] = {
+    capability.name: capability
+    for capability in (
+        Capability("pymupdf", "fitz", "extraction", "PDF text, layout, rendering and images"),
+        Capability("pdfplumber", "pdfplumber", "extraction", "PDF text fallback"),
+        Capability("lxml", "lxml.etree", "extraction", "XML parser for DOCX text"),
+        Capability("pdf2image", "pdf2image", "extraction", "PDF rendering fallback (needs poppler)"),
+        Capability("pillow", "PIL.Image", "extraction", "WebP resume previews and profile thumbnails"),
+        Capability("boto3", "boto3", "storage", "S3-compatible client for resume storage (B2)"),
+    )
+}
+
+# Loaded by warm_up(); pdf2image is only a fallback and not worth loading up front
+WARM_UP_CAPABILITIES = ("pymupdf", "pdfplumber", "lxml", "boto3")
+EXTRACTION_WORKER_CAPABILITIES = ("pymupdf", "pdfplumber", "lxml", "pillow")
+
+
+def _capability(name: str) -> Capability:
+    if name not in CAPABILITIES:
+        raise KeyError(f"Unknown capability: {name}")
+    return CAPABILITIES[name]
+
+
+def _spec_exists(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def load_capabilities(names: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Import capabilities in this process; returns name -> load seconds (None
+    if unavailable). Also used as an extraction pool task to warm a worker.
+    """
+    loaded = {}
+    for name in names:
+        try:
+            started = time.perf_counter()
+            require(name)
+            loaded[name] = round(time.perf_counter() - started, 3)
+        except CapabilityUnavailableError:
+            loaded[name] = None
+    return loaded
+
+
+def _warm_extraction_worker(names: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extraction pool task: import the extraction code and its parsers in the worker."""
+    import app.services.resume_extractor  # noqa: F401
+    return load_capabilities(names)
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class CapabilityRegistry:
+    """
+    Lazily imported capabilities of this process, with load timings and the
+    state of the background warm-up: "cold", "warming", "warm" or "failed".
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # require() is called from worker threads too
+        self._modules: Dict[str, Any] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._available: Dict[str, bool] = {}
+        self._warm_state = "cold"
+        self._warm_started_at: Optional[float] = None
+        self._warm_finished_at: Optional[float] = None
+        self._worker_load_seconds: List[Dict[str, Any]] = []
+        self._warm_errors: List[str] = []
+
+    def is_available(self, name: str) -> bool:
+        """Whether the capability's package is installed (checked without importing it)."""
+        if name in self._modules:
+            return True
+        if name not in self._available:
+            self._available[name] = _spec_exists(_capability(name).module)
+        return self._available[name] and name not in self._errors
+
+    def require(self, name: str):
+        """The capability's module, imported on first use. Raises CapabilityUnavailableError."""
+        module = self._modules.get(name)
+        if module is not None:
+            return module
+        capability = _capability(name)
+        with self._lock:
+            if name in self._modules:
+                return self._modules[name]
+            if name in self._errors:
+                raise CapabilityUnavailableError(f"{name} is unavailable: {self._errors[name]}")
+            started = time.perf_counter()
+            try:
+                module = importlib.import_module(capability.module)
+            except Exception as e:
+                self._errors[name] = f"{type(e).__name__}: {e}"
+                logger.warning(f"Capability {name} ({capability.module}) could not be loaded: {e}")
+                raise CapabilityUnavailableError(f"{name} is unavailable: {self._errors[name]}") from e
+            self._load_seconds[name] = round(time.perf_counter() - started, 3)
+            self._modules[name] = module
+            return module
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._modules
+
+    @property
+    def extraction_warm(self) -> bool:
+        return self._warm_state == "warm"
+
+    async def warm_up(self, ocr: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Load the heavy capabilities off the event loop, start the extraction
+        pool workers with them loaded, and (if `ocr`, default
+        OCR_WARM_ON_STARTUP) wait for the OCR engine. Never raises.
+        """
+        if self._warm_state == "warming":
+            return self.get_status()
+        from app.services.extraction_executor import get_extraction_executor
+        from app.services.ocr_service import get_ocr_service
+
+        self._warm_state = "warming"
+        self._warm_started_at = time.time()
+        self._warm_errors = []
+        try:
+            await asyncio.to_thread(load_capabilities, WARM_UP_CAPABILITIES)
+
+            executor = get_extraction_executor()
+            results = await asyncio.gather(
+                *[
+                    executor.run(_warm_extraction_worker, EXTRACTION_WORKER_CAPABILITIES)
+                    for _ in range(executor.pool_size)
+                ],
+                return_exceptions=True
+            )
+            self._worker_load_seconds = [result for result in results if isinstance(result, dict)]
+            self._warm_errors += [f"extraction worker: {result}" for result in results if isinstance(result, Exception)]
+
+            if settings.EXTRACTION_SANDBOX:
+                # Starts the sandbox fork server, which preloads the parsers for every sandbox child
+                try:
+                    await executor.run_sandboxed(load_capabilities, EXTRACTION_WORKER_CAPABILITIES)
+                except Exception as e:
+                    self._warm_errors.append(f"extraction sandbox: {e}")
+
+            if settings.OCR_WARM_ON_STARTUP if ocr is None else ocr:
+                ocr_status = await get_ocr_service().warm_up()
+                if ocr_status["state"] not in ("ready", "unavailable"):
+                    self._warm_errors.append(f"ocr: {ocr_status['state']}")
+        except Exception as e:
+            self._warm_errors.append(f"{type(e).__name__}: {e}")
+
+        self._warm_finished_at = time.time()
+        self._warm_state = "failed" if self._warm_errors else "warm"
+        logger.info(
+            f"Extraction warm-up {self._warm_state} in {self._warm_finished_at - self._warm_started_at:.2f}s"
+            + (f": {self._warm_errors}" if self._warm_errors else "")
+        )
+        return self.get_status()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "warm_up": {
+                "state": self._warm_state,
+                "seconds": round(self._warm_finished_at - self._warm_started_at, 3)
+                if self._warm_finished_at and self._warm_started_at else None,
+                "extraction_workers": self._worker_load_seconds,
+                "errors": list(self._warm_errors),
+            },
+            "capabilities": {
+                name: {
+                    "group": capability.group,
+                    "description": capability.description,
+                    "available": self.is_available(name),
+                    "loaded": self.is_loaded(name),
+                    "load_seconds": self._load_seconds.get(name),
+                    "error": self._errors.get(name),
+                }
+                for name, capability in CAPABILITIES.items()
+            },
+        }
+
+
+# ============================================================================
+# CONVENIENCE FUNCTIONS
+# ============================================================================
+
+# Global singleton instance
+_capability_registry = None
+
+def get_capability_registry() -> CapabilityRegistry:
+    """Get or create the global CapabilityRegistry instance."""
+    global _capability_registry
+    if _capability_registry is None:
+        _capability_registry = CapabilityRegistry()
+    return _capability_registry
+
+
+def require(name: str):
+    """Import (once) and return a capability's module. Raises CapabilityUnavailableError."""
+    return get_capability_registry().require(name)
+
+
+def is_available(name: str) -> bool:
+    """Whether a capability is installed, without importing it."""
+    return get_capability_registry().is_available(name)
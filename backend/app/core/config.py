@@ -31,11 +31,111 @@ class Settings(BaseSettings):
     B2_BUCKET_NAME: str = os.getenv("B2_BUCKET_NAME", "")
     B2_ENDPOINT: str = os.getenv("B2_ENDPOINT", "")
 
+    # Blob storage for resumes, profile images and chat attachments: "s3" (B2 or another S3-compatible
+    # endpoint, configured above) or "local" (files under STORAGE_LOCAL_DIR, default backend/uploads).
+    # Objects above STORAGE_MULTIPART_THRESHOLD bytes are uploaded in parallel multipart chunks
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "s3")
+    STORAGE_LOCAL_DIR: str = os.getenv("STORAGE_LOCAL_DIR", "")
+    STORAGE_MAX_CONNECTIONS: int = int(os.getenv("STORAGE_MAX_CONNECTIONS", 32))
+    STORAGE_MULTIPART_THRESHOLD: int = int(os.getenv("STORAGE_MULTIPART_THRESHOLD", 8 * 1024 * 1024))
+    STORAGE_MULTIPART_CHUNK_SIZE: int = int(os.getenv("STORAGE_MULTIPART_CHUNK_SIZE", 8 * 1024 * 1024))
+    STORAGE_MAX_CONCURRENCY: int = int(os.getenv("STORAGE_MAX_CONCURRENCY", 4))
+    # Attempts per resume upload before an ingestion fails (its files are then deleted)
+    STORAGE_UPLOAD_ATTEMPTS: int = int(os.getenv("STORAGE_UPLOAD_ATTEMPTS", 3))
+    # Resume downloads: "proxy" serves them through the API from a local LRU disk cache of up to
+    # RESUME_CACHE_MAX_BYTES (0 disables it; RESUME_CACHE_DIR defaults to the system temp dir),
+    # "redirect" answers with a presigned storage URL valid for RESUME_PRESIGNED_URL_TTL seconds
+    RESUME_DOWNLOAD_MODE: str = os.getenv("RESUME_DOWNLOAD_MODE", "proxy")
+    RESUME_CACHE_DIR: str = os.getenv("RESUME_CACHE_DIR", "")
+    RESUME_CACHE_MAX_BYTES: int = int(os.getenv("RESUME_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+    RESUME_PRESIGNED_URL_TTL: int = int(os.getenv("RESUME_PRESIGNED_URL_TTL", 300))
+    # Previews rendered at ingest for PDF resumes and stored next to them: a WebP of the first page
+    # RESUME_PREVIEW_WIDTH pixels wide, and WebP thumbnails of the profile picture for each of
+    # RESUME_THUMBNAIL_SIZES (comma-separated, pixels on the long side)
+    RESUME_PREVIEWS_ENABLED: bool = os.getenv("RESUME_PREVIEWS_ENABLED", "true").lower() == "true"
+    RESUME_PREVIEW_WIDTH: int = int(os.getenv("RESUME_PREVIEW_WIDTH", 480))
+    RESUME_PREVIEW_QUALITY: int = int(os.getenv("RESUME_PREVIEW_QUALITY", 60))
+    RESUME_THUMBNAIL_SIZES: str = os.getenv("RESUME_THUMBNAIL_SIZES", "64,160")
+
     # Zoom Integration
     ZOOM_CLIENT_ID: str = os.getenv("ZOOM_CLIENT_ID", "")
     ZOOM_CLIENT_SECRET: str = os.getenv("ZOOM_CLIENT_SECRET", "")
     ZOOM_ACCOUNT_ID: str = os.getenv("ZOOM_ACCOUNT_ID", "")
 
+    # LLM providers (OpenAI-compatible chat completions)
+    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    GROQ_API_BASE: str = os.getenv("GROQ_API_BASE", "https://api.groq.com/openai/v1")
+    GROQ_MODEL: str = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+    HUGGINGFACEHUB_API_TOKEN: str = os.getenv("HUGGINGFACEHUB_API_TOKEN", "")
+    HF_API_BASE: str = os.getenv("HF_API_BASE", "https://router.huggingface.co/v1")
+    HF_MODEL: str = os.getenv("HF_MODEL", "mistralai/Mistral-7B-Instruct-v0.2")
+
+    # LLM gateway limits
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", 30))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", 2))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", 0.5))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", 8))
+
+    # Extraction tier routing (circuit breakers per LLM tier; hedge Tier 1 with regex after N seconds, 0 disables)
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+    CIRCUIT_ERROR_RATE: float = float(os.getenv("CIRCUIT_ERROR_RATE", 0.5))
+    CIRCUIT_MIN_SAMPLES: int = int(os.getenv("CIRCUIT_MIN_SAMPLES", 10))
+    CIRCUIT_WINDOW: int = int(os.getenv("CIRCUIT_WINDOW", 50))
+    CIRCUIT_COOLDOWN_SECONDS: float = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", 30))
+    EXTRACTION_HEDGE_AFTER_SECONDS: float = float(os.getenv("EXTRACTION_HEDGE_AFTER_SECONDS", 0))
+
+    # Resume extraction process pool
+    EXTRACTION_POOL_SIZE: int = int(os.getenv("EXTRACTION_POOL_SIZE", 2))
+    EXTRACTION_QUEUE_DEPTH: int = int(os.getenv("EXTRACTION_QUEUE_DEPTH", 32))
+    EXTRACTION_TASK_TIMEOUT: float = float(os.getenv("EXTRACTION_TASK_TIMEOUT", 120))
+    # Parsing budgets. With EXTRACTION_SANDBOX each upload is parsed in its own child process that is
+    # killed after EXTRACTION_PARSE_TIMEOUT seconds and limited to EXTRACTION_MEMORY_LIMIT_MB of address
+    # space; only the first EXTRACTION_MAX_PAGES pages are read, and page renders / embedded images are
+    # capped at EXTRACTION_MAX_PAGE_PIXELS
+    EXTRACTION_SANDBOX: bool = os.getenv("EXTRACTION_SANDBOX", "true").lower() == "true"
+    EXTRACTION_PARSE_TIMEOUT: float = float(os.getenv("EXTRACTION_PARSE_TIMEOUT", 60))
+    EXTRACTION_MEMORY_LIMIT_MB: int = int(os.getenv("EXTRACTION_MEMORY_LIMIT_MB", 1024))
+    EXTRACTION_MAX_PAGES: int = int(os.getenv("EXTRACTION_MAX_PAGES", 30))
+    EXTRACTION_MAX_PAGE_PIXELS: int = int(os.getenv("EXTRACTION_MAX_PAGE_PIXELS", 25_000_000))
+    # Load PDF/DOCX parsers and start the extraction workers in the background after startup
+    EXTRACTION_WARM_ON_STARTUP: bool = os.getenv("EXTRACTION_WARM_ON_STARTUP", "true").lower() == "true"
+
+    # Shared OCR worker pool (OCR_ENGINE: auto, easyocr or tesseract)
+    OCR_POOL_SIZE: int = int(os.getenv("OCR_POOL_SIZE", 1))
+    OCR_ENGINE: str = os.getenv("OCR_ENGINE", "auto")
+    OCR_TASK_TIMEOUT: float = float(os.getenv("OCR_TASK_TIMEOUT", 120))
+    OCR_WARM_ON_STARTUP: bool = os.getenv("OCR_WARM_ON_STARTUP", "true").lower() == "true"
+    # Stop OCR'ing further pages once a PDF has this much text (0 OCRs every page that needs it)
+    OCR_ENOUGH_TEXT_CHARS: int = int(os.getenv("OCR_ENOUGH_TEXT_CHARS", 6000))
+
+    # Streaming uploads: files are kept in memory up to UPLOAD_SPOOL_THRESHOLD bytes, then spooled to a
+    # temp file in UPLOAD_TMP_DIR (the system temp dir when empty)
+    UPLOAD_SPOOL_THRESHOLD: int = int(os.getenv("UPLOAD_SPOOL_THRESHOLD", 1024 * 1024))
+    UPLOAD_TMP_DIR: str = os.getenv("UPLOAD_TMP_DIR", "")
+    CHAT_ATTACHMENT_MAX_BYTES: int = int(os.getenv("CHAT_ATTACHMENT_MAX_BYTES", 25 * 1024 * 1024))
+
+    # Resume ingestion queue ("sync" processes uploads in the request, "queue" hands them to workers)
+    INGEST_MODE: str = os.getenv("INGEST_MODE", "sync")
+    INGEST_LEASE_SECONDS: int = int(os.getenv("INGEST_LEASE_SECONDS", 120))
+    INGEST_MAX_ATTEMPTS: int = int(os.getenv("INGEST_MAX_ATTEMPTS", 3))
+    INGEST_POLL_INTERVAL: float = float(os.getenv("INGEST_POLL_INTERVAL", 2))
+    INGEST_WORKER_CONCURRENCY: int = int(os.getenv("INGEST_WORKER_CONCURRENCY", 2))
+
+    # Background rescoring when jobs change
+    RESCORE_BATCH_SIZE: int = int(os.getenv("RESCORE_BATCH_SIZE", 500))
+
+    # In-memory skill index for candidate retrieval
+    SKILL_INDEX_ENABLED: bool = os.getenv("SKILL_INDEX_ENABLED", "true").lower() == "true"
+    SKILL_INDEX_SNAPSHOT_PATH: str = os.getenv("SKILL_INDEX_SNAPSHOT_PATH", "data/skill_index.npz")
+    SKILL_INDEX_REFRESH_SECONDS: float = float(os.getenv("SKILL_INDEX_REFRESH_SECONDS", 60))
+    SKILL_INDEX_SNAPSHOT_SECONDS: float = float(os.getenv("SKILL_INDEX_SNAPSHOT_SECONDS", 600))
+    SKILL_INDEX_OVERSAMPLE: int = int(os.getenv("SKILL_INDEX_OVERSAMPLE", 3))
+
+    # Bulk resume import (ZIP / multi-file)
+    BULK_IMPORT_CONCURRENCY: int = int(os.getenv("BULK_IMPORT_CONCURRENCY", 4))
+    BULK_IMPORT_MAX_FILES: int = int(os.getenv("BULK_IMPORT_MAX_FILES", 1000))
+
     class Config:
         case_sensitive = True
 
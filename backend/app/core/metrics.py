@@ -0,0 +1,20 @@
+"""
+Small helpers for the in-process metrics that services expose on their
+status endpoints.
+"""
+
+from typing import Dict, Iterable
+
+
+def summarize_durations(samples: Iterable[float]) -> Dict[str, float]:
+    """Summarize a window of durations (seconds) as avg/p50/p95/max in milliseconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    count = len(ordered)
+    return {
+        "avg_ms": round(sum(ordered) / count * 1000, 2),
+        "p50_ms": round(ordered[count // 2] * 1000, 2),
+        "p95_ms": round(ordered[min(count - 1, int(count * 0.95))] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
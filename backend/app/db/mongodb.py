@@ -28,6 +28,8 @@ async def create_indexes():
     await db.applications.create_index("candidate_email")
     await db.applications.create_index("final_score")
     await db.applications.create_index([("job_id", 1), ("candidate_email", 1)])  # Compound index for duplicate detection
+    await db.applications.create_index([("job_id", 1), ("file_hash", 1)])
+    await db.applications.create_index("ingest_job_id", sparse=True)
     
     # Messages collection indexes for Chat
     await db.messages.create_index("sender_id")
@@ -45,6 +47,19 @@ async def create_indexes():
     await db.review_batches.create_index("recruiter_id")
     await db.review_batches.create_index("status")
     
+    # Ingestion queue indexes
+    await db.ingest_jobs.create_index([("status", 1), ("created_at", 1)])
+    await db.ingest_jobs.create_index([("status", 1), ("lease_expires_at", 1)])
+    await db.ingest_jobs.create_index([("status", 1), ("notified", 1)])
+    await db.ingest_jobs.create_index([("job_id", 1), ("file_hash", 1)])
+    
+    # Candidate-job scores (top-K per job, all scores of an application)
+    await db.job_scores.create_index([("application_id", 1), ("job_id", 1)], unique=True)
+    await db.job_scores.create_index([("job_id", 1), ("final_score", -1), ("application_id", 1)])
+    
+    # Extraction cache (one entry per file content + extractor version)
+    await db.extraction_cache.create_index([("content_hash", 1), ("extractor_version", 1)], unique=True)
+    
     print("✓ Database indexes created successfully")
 
 async def connect_to_mongo():
@@ -1,12 +1,20 @@
 from fastapi import FastAPI
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from app.core.capabilities import get_capability_registry
 from app.core.config import settings
 from app.db.mongodb import connect_to_mongo, close_mongo_connection
-from app.routers import auth, users, jobs, applications, review, notifications, chat, interviews, search
+from app.routers import auth, users, jobs, applications, review, notifications, chat, interviews, search, system
 from app.services.socket_manager import create_socket_app
 from app.services.interview_reminder import check_upcoming_interviews
+from app.services.extraction_executor import shutdown_extraction_executor
+from app.services.blob_storage import shutdown_blob_storage
+from app.services.ingest_queue import relay_ingest_events
+from app.services.llm_gateway import close_llm_gateway
+from app.services.skill_index import get_skill_index
+from app.services.ocr_service import get_ocr_service, shutdown_ocr_service
 import asyncio
 import os
 
@@ -33,16 +41,48 @@ app.add_middleware(
 async def startup_event():
     await connect_to_mongo()
     asyncio.create_task(check_upcoming_interviews())
+    asyncio.create_task(relay_ingest_events())
+    if settings.SKILL_INDEX_ENABLED:
+        asyncio.create_task(get_skill_index().run())
+    if settings.EXTRACTION_WARM_ON_STARTUP:
+        # Load parsers, extraction workers and (with OCR_WARM_ON_STARTUP) the OCR model in the
+        # background: requests are served meanwhile, and the first upload is not slow
+        asyncio.create_task(get_capability_registry().warm_up())
+    elif settings.OCR_WARM_ON_STARTUP:
+        asyncio.create_task(get_ocr_service().warm_up())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     await close_mongo_connection()
+    shutdown_extraction_executor()
+    shutdown_ocr_service()
+    shutdown_blob_storage()
+    await close_llm_gateway()
 
 # Routers
 api_root_router = APIRouter()
 @api_root_router.get("/")
 def api_v1_root():
     return {"status": "ok", "version": "v1"}
+
+@api_root_router.get("/ready")
+def readiness(require_extraction: bool = False):
+    """
+    Readiness probe. "serving" is true as soon as the app accepts requests;
+    "extraction_warm" once parsers, extraction workers and OCR are loaded.
+    With ?require_extraction=true, answers 503 until extraction is warm.
+    """
+    registry = get_capability_registry()
+    warm_up = registry.get_status()["warm_up"]
+    body = {
+        "serving": True,
+        "extraction_warm": registry.extraction_warm,
+        "warm_up_state": warm_up["state"],
+        "warm_up_seconds": warm_up["seconds"],
+    }
+    if require_extraction and not registry.extraction_warm:
+        return JSONResponse(status_code=503, content=body)
+    return body
 app.include_router(api_root_router, prefix=settings.API_V1_STR, tags=["root"])
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"])
 app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
@@ -53,6 +93,7 @@ app.include_router(notifications.router, prefix=f"{settings.API_V1_STR}/notifica
 app.include_router(chat.router, prefix=f"{settings.API_V1_STR}/chat", tags=["chat"])
 app.include_router(interviews.router, prefix=f"{settings.API_V1_STR}/interviews", tags=["interviews"])
 app.include_router(search.router, prefix=f"{settings.API_V1_STR}/search", tags=["search"])
+app.include_router(system.router, prefix=f"{settings.API_V1_STR}/system", tags=["system"])
 
 # Static files - serve uploaded resumes
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
@@ -1,21 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Body, Query
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Body, Query, Request
+from fastapi.responses import FileResponse, JSONResponse
 from typing import List, Optional
 from app.core.deps import get_current_active_user, check_role, get_db
 from app.schemas.job import ApplicationCreate, ApplicationInDB, ApplicationStatus
 from app.schemas.user import UserInDB, UserRole
-from app.services.resume_extractor import extract_text_from_bytes, extract_profile_picture_from_pdf
-from app.services.smart_extractor import smart_extract_candidate_info
-from app.services.scoring_engine import evaluate_application_v2
+from app.services.resume_pipeline import (
+    process_resume_upload, check_duplicate_file, get_job_or_404, receive_resume_upload
+)
+from app.services.ingest_queue import enqueue_ingest_job, find_active_ingest_job, serialize_ingest_job
+from app.services.bulk_import import run_bulk_import
+from app.services.job_scores import attach_global_job_scores, delete_scores_for_applications, get_job_score
+from app.services.skill_index import get_skill_index
+from app.core.config import settings
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
 import os
 import aiofiles
 import uuid
-import hashlib
-import time
-from app.services.b2_storage_service import upload_resume_to_b2, delete_resume_from_b2
+from app.services.b2_storage_service import delete_resumes_from_b2, resume_download_response
 
 router = APIRouter()
 
@@ -23,6 +26,25 @@ UPLOAD_DIR = "uploads"
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
 
+# /upload reads its multipart body itself (streamed), so the form is documented here
+RESUME_UPLOAD_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "job_id": {"type": "string"},
+                        "file": {"type": "string", "format": "binary"},
+                    },
+                }
+            }
+        },
+    }
+}
+
 async def _enrich_application(app: dict, db: AsyncIOMotorDatabase) -> dict:
     app["_id"] = str(app["_id"])
 
@@ -60,255 +82,102 @@ async def _enrich_application(app: dict, db: AsyncIOMotorDatabase) -> dict:
 
     return app
 
-@router.post("/upload", response_model=ApplicationInDB)
+@router.post("/upload", response_model=ApplicationInDB, openapi_extra=RESUME_UPLOAD_FORM)
 async def upload_resume(
-    job_id: Optional[str] = Form(None),
-    file: UploadFile = File(...),
+    request: Request,
     current_user: UserInDB = Depends(check_role([UserRole.ADMIN, UserRole.TEAM_LEAD, UserRole.RECRUITER])),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """HR/Admin uploads a resume for a job posting."""
-    job = None
-    if job_id:
-        # Check if job exists
-        job = await db.jobs.find_one({"_id": ObjectId(job_id)})
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+    """
+    HR/Admin uploads a resume for a job posting (form fields `file` and optional `job_id`).
 
-    # Read file content ONCE
-    file_content = await file.read()
-    
-    # Validate file type and size
-    file_ext = file.filename.split(".")[-1].lower()
-    if file_ext not in ["pdf", "doc", "docx"]:
-        raise HTTPException(status_code=400, detail="Only PDF, DOC, and DOCX files are allowed.")
-        
-    if len(file_content) > 5 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File size exceeds the 5MB limit.")
-    
-    # Generate file hash for duplicate detection
-    file_hash = hashlib.md5(file_content).hexdigest()
-    
-    # Check by file hash to detect exact duplicate files early
-    existing_by_hash = await db.applications.find_one({
-        "job_id": job_id,
-        "file_hash": file_hash
-    })
-    if existing_by_hash:
-        raise HTTPException(
-            status_code=400,
-            detail="This exact resume file has already been uploaded for this job"
-        )
-    
-    # Extract text and parsed data using the bytes
-    extracted_text = ""
-    parsed_candidate_data = {}
-    
-    try:
-        # Use extract_text_from_bytes with the content we already have
-        extracted_text = extract_text_from_bytes(file_content, file.filename)
-        
-        # Use Smart Extractor (3-tier: LlamaParse+Groq -> Mistral7B -> Regex)
-        parsed_candidate_data = await smart_extract_candidate_info(
-            file_content=file_content,
-            filename=file.filename,
-            resume_text=extracted_text
-        )
-        
-        extraction_tier = parsed_candidate_data.get('extraction_tier', 0)
-        extraction_method = parsed_candidate_data.get('extraction_method', 'unknown')
-        tier_names = {1: 'LlamaParse+Groq', 2: 'Mistral 7B', 3: 'Regex', 0: 'Failed'}
-        
-        print(f"✓ Successfully extracted {len(extracted_text)} chars from {file.filename}")
-        print(f"✓ Extraction Tier: {extraction_tier} ({tier_names.get(extraction_tier, 'Unknown')})")
-        print(f"✓ Parsed data: name={parsed_candidate_data.get('name')}, skills={len(parsed_candidate_data.get('skills', []))}")
-    except Exception as e:
-        import traceback
-        print(f"✗ Resume extraction error: {e}")
-        traceback.print_exc()
-        extracted_text = ""
-        parsed_candidate_data = {}
-    
-    # Check for duplicate resume (same candidate email for same job)
-    candidate_email = parsed_candidate_data.get("email")
-    if candidate_email:
-        existing_app = await db.applications.find_one({
-            "job_id": job_id,
-            "candidate_email": candidate_email
-        })
-        if existing_app:
-            if job_id:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"A resume for candidate with email '{candidate_email}' already exists for this job"
-                )
-            else:
+    The file is streamed: a wrong type or an oversized file is rejected
+    after the first few KB, it is hashed while it arrives, and larger files
+    are spooled to disk so the parser opens them by path.
+
+    With INGEST_MODE=queue the file is stored and queued for an ingestion
+    worker, and the endpoint returns 202 with the ingest job id instead.
+    """
+    async with await receive_resume_upload(request) as upload:
+        job_id = upload.fields.get("job_id") or None
+        job = await get_job_or_404(db, job_id)
+
+        # Type and size were checked while streaming. A spooled upload is passed on
+        # by path (parsed, stored and queued from disk); only small ones are in memory
+        file_content = None if upload.path else await upload.read()
+
+        if settings.INGEST_MODE == "queue":
+            await check_duplicate_file(db, job_id, upload.file_hash)
+            if await find_active_ingest_job(db, job_id, upload.file_hash):
                 raise HTTPException(
-                    status_code=400, 
-                    detail=f"A global resume for candidate with email '{candidate_email}' already exists"
+                    status_code=400,
+                    detail="This exact resume file is already queued for this job"
                 )
-            
-    # Build safely formatted filename for Drive
-    candidate_name = parsed_candidate_data.get("name")
-    if candidate_name:
-        safe_name = "".join([c if c.isalpha() or c.isdigit() else "_" for c in candidate_name]).strip("_").lower()
-    else:
-        safe_name = "unknown_candidate"
-        
-    timestamp = int(time.time())
-    drive_filename = f"{safe_name}_{timestamp}.{file_ext}"
-    
-    # Extract & Upload Profile Picture
-    profile_image_url = None
-    if file_ext == "pdf":
-        try:
-            profile_pic_bytes = extract_profile_picture_from_pdf(file_content)
-            if profile_pic_bytes:
-                pic_filename = f"{safe_name}_{timestamp}_profile.jpg"
-                _, profile_image_url = await upload_resume_to_b2(profile_pic_bytes, pic_filename, "image/jpeg")
-                print(f"✓ Profile picture extracted and uploaded: {profile_image_url}")
-        except Exception as e:
-            print(f"✗ Profile picture extraction/upload error: {e}")
-            
-    # Upload to Backblaze B2
-    try:
-        if file_ext == "pdf":
-            drive_mime = "application/pdf"
-        elif file_ext == "doc":
-            drive_mime = "application/msword"
-        else:
-            drive_mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            
-        file_name, file_url = await upload_resume_to_b2(file_content, drive_filename, drive_mime)
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"B2 upload failed: {str(e)}")
-    
-    # Production scoring v2
-    scoring_result = {
-        "skill_score": 0.0,
-        "experience_score": 0.0,
-        "education_score": 0.0,
-        "final_score": 0.0,
-        "matched_skills": [],
-        "missing_skills": [],
-        "skill_coverage": 0.0,
-        "breakdown": {}
-    }
-    global_job_scores = None
-
-    if job_id and job:
-        try:
-            scoring_result = await evaluate_application_v2(
-                parsed_candidate_data, 
-                extracted_text, 
-                job
+            ingest_id = await enqueue_ingest_job(
+                db,
+                file_content=file_content,
+                filename=upload.filename,
+                job_id=job_id,
+                uploaded_by=current_user.id,
+                file_hash=upload.file_hash,
+                file_path=upload.path
             )
-        except Exception as e:
-            import traceback
-            print(f"Scoring error: {e}")
-            traceback.print_exc()
-            
-    # Always compute global_job_scores for Resume Database (global talent pool)
-    global_job_scores = []
-    active_jobs = await db.jobs.find({"is_active": {"$ne": False}}).to_list(length=200)
-    for active_job in active_jobs:
-        try:
-            job_score = await evaluate_application_v2(
-                parsed_candidate_data,
-                extracted_text,
-                active_job
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"ingest_id": ingest_id, "status": "queued"}
             )
-            global_job_scores.append({
-                "job_id": str(active_job["_id"]),
-                "job_title": active_job.get("title"),
-                "final_score": job_score.get("final_score", 0.0),
-                "skill_score": job_score.get("skill_score", 0.0),
-                "experience_score": job_score.get("experience_score", 0.0),
-                "education_score": job_score.get("education_score", 0.0),
-                "matched_skills": job_score.get("matched_skills", []),
-                "status": "applied",
-                "applied_at": datetime.utcnow()
-            })
-        except Exception as e:
-            print(f"Error scoring against job {active_job.get('_id')}: {e}")
-            pass
-    
-    application_doc = {
-        "job_id": job_id,
-        "uploaded_by": current_user.id,  # HR/Admin who uploaded the resume
-        "job_title": job.get("title") if job else None,
-        "global_job_scores": global_job_scores,
-        "file_name": file_name,
-        "resume_url": file_url,
-        "profile_image_url": profile_image_url,
-        "extracted_text": extracted_text,
-        
-        # Scores (raw 0-100 scale)
-        "skill_score": scoring_result.get("skill_score", 0.0),
-        "experience_score": scoring_result.get("experience_score", 0.0),
-        "education_score": scoring_result.get("education_score", 0.0),
-        "final_score": scoring_result.get("final_score", 0.0),
-        
-        # Score display format (showing contribution out of max weight)
-        # Weights: skill=50%, experience=35%, education=15%
-        "score_display": {
-            "skill": f"{round(scoring_result.get('skill_score', 0.0) * 0.50, 1)}/50",
-            "experience": f"{round(scoring_result.get('experience_score', 0.0) * 0.35, 1)}/35",
-            "education": f"{round(scoring_result.get('education_score', 0.0) * 0.15, 1)}/15",
-            "total": f"{round(scoring_result.get('final_score', 0.0), 1)}/100"
-        },
-        
-        # Scoring breakdown (actual contribution values)
-        "score_breakdown": scoring_result.get("breakdown", {}),
-        
-        # Skill matching details
-        "matched_skills": scoring_result.get("matched_skills", []),
-        "missing_skills": scoring_result.get("missing_skills", []),
-        "skill_coverage": scoring_result.get("skill_coverage", 0.0),
-        
-        # Candidate extracted info (flattened for easy querying)
-        "candidate_name_extracted": parsed_candidate_data.get("name"),
-        "candidate_email": parsed_candidate_data.get("email"),
-        "candidate_phone": parsed_candidate_data.get("phone"),
-        "candidate_linkedin": parsed_candidate_data.get("linkedin_url"),
-        "candidate_github": parsed_candidate_data.get("github_url"),
-        "candidate_experience_years": parsed_candidate_data.get("experience_years", 0),
-        "candidate_experience_months": parsed_candidate_data.get("experience_months", 0),
-        "candidate_education": parsed_candidate_data.get("education", []),
-        "candidate_skills": parsed_candidate_data.get("skills", []),
-        "candidate_certifications": parsed_candidate_data.get("certifications", []),
-        "candidate_summary": parsed_candidate_data.get("summary", ""),
-        "extraction_method": parsed_candidate_data.get("extraction_method", "regex"),
-        "extraction_tier": parsed_candidate_data.get("extraction_tier", 3),
-        
-        # NEW: Rich extraction data from Smart Extractor
-        "experience_details": parsed_candidate_data.get("experience_details", []),
-        "domain_experience": parsed_candidate_data.get("domain_experience", []),
-        "awards": parsed_candidate_data.get("awards", []),
-        "education_details": parsed_candidate_data.get("education_details", []),
-        
-        # File hash for duplicate detection
-        "file_hash": file_hash,
-        
-        # Review workflow fields
-        "review_status": "pending",
-        "review_batch_id": None,
-        "sent_for_review_at": None,
-        "reviewed_at": None,
-        "reviewed_by": None,
-        "comments": [],
-        
-        "status": ApplicationStatus.APPLIED.value,
-        "applied_at": datetime.utcnow()
-    }
-    
-    result = await db.applications.insert_one(application_doc)
-    application_doc["_id"] = str(result.inserted_id)
-    
+
+        application_doc = await process_resume_upload(
+            db,
+            file_content=file_content,
+            filename=upload.filename,
+            job_id=job_id,
+            uploaded_by=current_user.id,
+            job=job,
+            file_hash=upload.file_hash,
+            file_path=upload.path,
+            file_size=upload.size
+        )
+
     return ApplicationInDB(**application_doc)
 
+
+@router.post("/bulk-upload")
+async def bulk_upload_resumes(
+    job_id: Optional[str] = Form(None),
+    files: List[UploadFile] = File(...),
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN, UserRole.TEAM_LEAD, UserRole.RECRUITER])),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Upload many resumes at once, as individual files and/or ZIP archives.
+
+    Exact duplicates are skipped by content hash, and progress is emitted
+    per file on `bulk_import:progress`. Returns a per-file summary.
+    """
+    job = await get_job_or_404(db, job_id)
+    return await run_bulk_import(db, files, job_id, job, current_user.id)
+
+
+@router.get("/ingest/{ingest_id}")
+async def get_ingest_status(
+    ingest_id: str,
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN, UserRole.TEAM_LEAD, UserRole.RECRUITER])),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Check the status of a queued resume upload."""
+    if not ObjectId.is_valid(ingest_id):
+        raise HTTPException(status_code=400, detail="Invalid ingest job ID")
+
+    ingest_job = await db.ingest_jobs.find_one({"_id": ObjectId(ingest_id)})
+    if not ingest_job:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+
+    if current_user.role != UserRole.ADMIN and ingest_job.get("uploaded_by") != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this ingest job")
+
+    return serialize_ingest_job(ingest_job)
+
 @router.get("/")
 async def list_applications(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
@@ -348,8 +217,11 @@ async def list_applications(
     # Execute query with pagination and sorting
     cursor = db.applications.find(query_filter).sort(sort_by, sort_direction).skip(skip).limit(limit)
     
+    raw_apps = await cursor.to_list(length=limit)
+    await attach_global_job_scores(db, raw_apps)
+    
     apps = []
-    async for app in cursor:
+    for app in raw_apps:
         app = await _enrich_application(app, db)
         apps.append(ApplicationInDB(**app))
     
@@ -385,8 +257,11 @@ async def get_job_applications(
     total_count = await db.applications.count_documents(query_filter)
     cursor = db.applications.find(query_filter).sort("applied_at", -1).skip(skip).limit(limit)
     
+    raw_apps = await cursor.to_list(length=limit)
+    await attach_global_job_scores(db, raw_apps)
+    
     apps = []
-    async for app in cursor:
+    for app in raw_apps:
         app = await _enrich_application(app, db)
         apps.append(ApplicationInDB(**app))
     
@@ -400,10 +275,15 @@ async def get_job_applications(
 @router.get("/{application_id}/resume")
 async def download_resume(
     application_id: str,
+    request: Request,
     current_user: UserInDB = Depends(check_role([UserRole.ADMIN, UserRole.TEAM_LEAD, UserRole.RECRUITER])),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """Fetch the resume directly from Backblaze B2 (or local fallback) and proxy it securely."""
+    """
+    Fetch the resume from Backblaze B2 (or local fallback). Supports Range
+    and If-None-Match; with RESUME_DOWNLOAD_MODE=redirect it answers with a
+    short-lived presigned URL instead of proxying the bytes.
+    """
     if not ObjectId.is_valid(application_id):
         raise HTTPException(status_code=400, detail="Invalid application ID")
         
@@ -411,20 +291,10 @@ async def download_resume(
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
         
-    # Proxy from B2
+    # From B2: presigned redirect, or proxied through the local disk cache (Range / ETag aware)
     file_name = app.get("file_name")
     if file_name:
-        from app.services.b2_storage_service import get_b2_client
-        import botocore
-        from app.core.config import settings
-        
-        b2_client = get_b2_client()
-        try:
-            response = b2_client.get_object(Bucket=settings.B2_BUCKET_NAME, Key=f"resumes/{file_name}")
-            return StreamingResponse(response['Body'], media_type=response.get('ContentType', 'application/pdf'))
-        except botocore.exceptions.ClientError as e:
-            print(f"B2 Fetch Error: {e}")
-            raise HTTPException(status_code=404, detail="Resume file not found in cloud storage")
+        return await resume_download_response(request, file_name)
             
     # Fallback to legacy local
     resume_path = app.get("resume_file_path")
@@ -553,11 +423,11 @@ async def delete_application(
             detail="Cannot delete application that is currently under review"
         )
     
-    # Delete the resume file from B2
+    # Delete the resume file (and its profile picture / previews) from B2
     file_name = app.get("file_name")
     if file_name:
         try:
-            await delete_resume_from_b2(file_name)
+            await delete_resumes_from_b2([file_name, *app.get("derived_file_names", [])])
         except Exception as e:
             print(f"Warning: Could not delete resume file from B2 {file_name}: {e}")
             
@@ -569,8 +439,10 @@ async def delete_application(
         except Exception as e:
             print(f"Warning: Could not delete old resume file {resume_path}: {e}")
     
-    # Delete the application from database
+    # Delete the application and its job scores from database
     await db.applications.delete_one({"_id": ObjectId(application_id)})
+    await delete_scores_for_applications(db, [application_id])
+    get_skill_index().remove_applications([application_id])
     
     return {"success": True, "message": "Application deleted successfully"}
 
@@ -588,6 +460,8 @@ async def bulk_delete_applications(
     deleted_count = 0
     skipped_count = 0
     errors = []
+    deleted_ids = []
+    file_names = []
     
     for app_id in application_ids:
         if not ObjectId.is_valid(app_id):
@@ -613,14 +487,11 @@ async def bulk_delete_applications(
             skipped_count += 1
             continue
         
-        # Delete from B2
-        file_name = app.get("file_name")
-        if file_name:
-            try:
-                await delete_resume_from_b2(file_name)
-            except Exception:
-                pass
-                
+        # Deleted from B2 together, after the loop
+        if app.get("file_name"):
+            file_names.append(app["file_name"])
+            file_names.extend(app.get("derived_file_names", []))
+
         # Delete old local resume file if exists
         resume_path = app.get("resume_file_path")
         if resume_path and os.path.exists(resume_path):
@@ -631,8 +502,13 @@ async def bulk_delete_applications(
         
         # Delete from database
         await db.applications.delete_one({"_id": ObjectId(app_id)})
+        deleted_ids.append(app_id)
         deleted_count += 1
     
+    await delete_resumes_from_b2(file_names)
+    await delete_scores_for_applications(db, deleted_ids)
+    get_skill_index().remove_applications(deleted_ids)
+    
     return {
         "success": True,
         "deleted": deleted_count,
@@ -660,8 +536,11 @@ async def get_resume_database(
     total_count = await db.applications.count_documents(query_filter)
     cursor = db.applications.find(query_filter).sort("applied_at", -1).skip(skip).limit(limit)
     
+    raw_apps = await cursor.to_list(length=limit)
+    await attach_global_job_scores(db, raw_apps)
+    
     apps = []
-    async for app in cursor:
+    for app in raw_apps:
         app = await _enrich_application(app, db)
         apps.append(ApplicationInDB(**app))
     
@@ -692,8 +571,7 @@ async def assign_application_to_job(
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
         
-    global_scores = app.get("global_job_scores", [])
-    selected_score_entry = next((score for score in global_scores if score.get("job_id") == job_id), None)
+    selected_score_entry = await get_job_score(db, app, job_id)
     
     if not selected_score_entry:
         raise HTTPException(status_code=400, detail="Candidate has no global score for the selected job")
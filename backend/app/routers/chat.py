@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-import os
-import shutil
+from fastapi import APIRouter, Depends, HTTPException, Request
 import uuid
 from typing import List
 from app.core.deps import get_db, get_current_active_user
 from app.schemas.user import UserInDB
 from app.schemas.chat import MessageResponse, ChatContact, GroupCreate, GroupResponse, GroupUpdate
+from app.core.config import settings
+from app.services.blob_storage import BlobStorageError, get_blob_storage
+from app.services.upload_stream import receive_upload
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from bson import ObjectId
@@ -297,42 +298,61 @@ async def mark_messages_read(
     )
     return {"status": "success", "modified_count": result.modified_count}
 
-@router.post("/upload")
+CHAT_UPLOAD_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+@router.post("/upload", openapi_extra=CHAT_UPLOAD_FORM)
 async def upload_chat_attachment(
-    file: UploadFile = File(...),
+    request: Request,
     current_user: UserInDB = Depends(get_current_active_user)
 ):
-    # Validation
+    # Validation (extension, content and size are checked while the file streams in)
     allowed_extensions = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".txt", ".csv", ".webm", ".ogg", ".mp3", ".wav", ".m4a"}
-    filename, file_ext = os.path.splitext(file.filename)
-    if file_ext.lower() not in allowed_extensions:
-        raise HTTPException(status_code=400, detail="File type not allowed")
-        
-    # Check if image, audio, or document
-    image_exts = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
-    audio_exts = {".webm", ".ogg", ".mp3", ".wav", ".m4a"}
-    
-    if file_ext.lower() in image_exts:
-        file_type = "image"
-    elif file_ext.lower() in audio_exts:
-        file_type = "audio"
-    else:
-        file_type = "document"
-    
-    # Save file path relation
-    UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads", "chat_attachments")
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    
-    secure_name = f"{uuid.uuid4()}{file_ext.lower()}"
-    file_path = os.path.join(UPLOAD_DIR, secure_name)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
+    async with await receive_upload(
+        request,
+        max_bytes=settings.CHAT_ATTACHMENT_MAX_BYTES,
+        allowed_extensions=allowed_extensions,
+        extension_error="File type not allowed"
+    ) as upload:
+        file_ext = f".{upload.extension}"
+
+        # Check if image, audio, or document
+        image_exts = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+        audio_exts = {".webm", ".ogg", ".mp3", ".wav", ".m4a"}
+
+        if file_ext in image_exts:
+            file_type = "image"
+        elif file_ext in audio_exts:
+            file_type = "audio"
+        else:
+            file_type = "document"
+
+        # Stored through the shared blob storage (local uploads dir or B2), off the event loop
+        key = f"chat_attachments/{uuid.uuid4()}{file_ext}"
+        try:
+            if upload.path:
+                blob = await get_blob_storage().put_file(key, upload.path, upload.content_type)
+            else:
+                blob = await get_blob_storage().put(key, await upload.read(), upload.content_type)
+        except BlobStorageError as e:
+            raise HTTPException(status_code=500, detail=f"Attachment upload failed: {e}")
+
     return {
-        "file_url": f"/uploads/chat_attachments/{secure_name}",
+        "file_url": blob.url,
         "file_type": file_type,
-        "file_name": file.filename
+        "file_name": upload.filename
     }
 
 @router.get("/unread-count")
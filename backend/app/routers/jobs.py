@@ -5,6 +5,9 @@ from app.schemas.job import JobCreate, JobInDB, JobBase, JobUpdate
 from app.schemas.user import UserInDB, UserRole
 from app.schemas.notification import NotificationType
 from app.services.socket_manager import emit_notification, emit_job_created, emit_job_status
+from app.services.rescoring import schedule_job_rescore
+from app.services.job_scores import delete_scores_for_applications, get_top_candidates
+from app.services.skill_index import get_skill_index
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
@@ -102,6 +105,9 @@ async def create_job(
         "created_by_name": current_user.name or current_user.email
     })
     
+    # Score the existing talent pool against the new job in the background
+    schedule_job_rescore(job_doc["_id"], "created")
+    
     return JobInDB(**job_doc)
 
 @router.get("/")
@@ -161,6 +167,39 @@ async def read_job(job_id: str, db: AsyncIOMotorDatabase = Depends(get_db)):
     job["applicants_count"] = count
     return JobInDB(**job)
 
+@router.get("/{job_id}/top-candidates")
+async def read_top_candidates(
+    job_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200),
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN, UserRole.TEAM_LEAD, UserRole.RECRUITER])),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Best-matching candidates from the whole resume database for a job, highest score first."""
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    if not await db.jobs.find_one({"_id": ObjectId(job_id)}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await get_top_candidates(db, job_id, skip=skip, limit=limit)
+
+@router.get("/{job_id}/candidate-matches")
+async def read_candidate_matches(
+    job_id: str,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN, UserRole.TEAM_LEAD, UserRole.RECRUITER])),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Best-matching candidates for a job straight from the skill index, scored
+    exactly, without waiting for the job to be rescored against the pool.
+    """
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    job = await db.jobs.find_one({"_id": ObjectId(job_id)})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await get_skill_index().search(db, job, limit=limit)
+
 @router.put("/{job_id}", response_model=JobInDB)
 async def update_job(
     job_id: str,
@@ -180,6 +219,7 @@ async def update_job(
     
     updated_job = await db.jobs.find_one({"_id": ObjectId(job_id)})
     updated_job["_id"] = str(updated_job["_id"])
+    schedule_job_rescore(job_id, "updated")
     return JobInDB(**updated_job)
 
 @router.delete("/{job_id}")
@@ -198,6 +238,7 @@ async def delete_job(
         raise HTTPException(status_code=403, detail="Not authorized to delete this job")
         
     await db.jobs.delete_one({"_id": ObjectId(job_id)})
+    schedule_job_rescore(job_id, "deleted")
     return {"message": "Job deleted successfully"}
 
 
@@ -233,11 +274,15 @@ async def bulk_delete_jobs(
             skipped_count += 1
             continue
         
-        # Delete associated applications first
+        # Delete associated applications (and their scores) first
+        app_ids = [str(a["_id"]) async for a in db.applications.find({"job_id": job_id}, {"_id": 1})]
         await db.applications.delete_many({"job_id": job_id})
+        await delete_scores_for_applications(db, app_ids)
+        get_skill_index().remove_applications(app_ids)
         
         # Delete the job
         await db.jobs.delete_one({"_id": ObjectId(job_id)})
+        schedule_job_rescore(job_id, "deleted")
         deleted_count += 1
     
     return {
@@ -281,6 +326,9 @@ async def toggle_job_active(
         "changed_by": current_user.name or current_user.email
     })
     
+    # Activation scores the talent pool against the job; deactivation removes its scores
+    schedule_job_rescore(job_id, "activated" if new_status else "deactivated")
+    
     return {"message": f"Job {'activated' if new_status else 'deactivated'} successfully", "is_active": new_status}
 
 
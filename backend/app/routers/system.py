@@ -0,0 +1,114 @@
+from fastapi import APIRouter, Depends
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.capabilities import get_capability_registry
+from app.core.deps import check_role, get_db
+from app.schemas.user import UserInDB, UserRole
+from app.services.blob_cache import get_blob_cache
+from app.services.extraction_cache import get_extraction_cache
+from app.services.extraction_executor import get_extraction_executor
+from app.services.llm_gateway import get_llm_gateway
+from app.services.ocr_service import get_ocr_service
+from app.services.rescoring import get_rescore_scheduler
+from app.services.skill_index import get_skill_index
+from app.services.smart_extractor import get_extraction_routing_state
+
+router = APIRouter()
+
+
+@router.get("/extraction/metrics")
+async def get_extraction_metrics(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Extraction pool configuration, counters and queue-wait vs. run-time stats. Admin only."""
+    return get_extraction_executor().get_metrics()
+
+
+@router.get("/extraction/cache")
+async def get_extraction_cache_stats(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Extraction cache hit/miss counters for this API process. Admin only."""
+    return get_extraction_cache().get_stats()
+
+
+@router.get("/storage/cache")
+async def get_resume_cache_stats(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Resume download disk cache size and hit/miss counters for this API process. Admin only."""
+    return get_blob_cache().get_stats()
+
+
+@router.get("/capabilities")
+async def get_capabilities(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Lazily loaded dependencies (installed/loaded, load time) and the extraction warm-up state. Admin only."""
+    return get_capability_registry().get_status()
+
+
+@router.post("/capabilities/warm-up")
+async def warm_up_capabilities(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Load parsers, extraction workers and the OCR engine now, and wait until done. Admin only."""
+    return await get_capability_registry().warm_up(ocr=True)
+
+
+@router.get("/ocr")
+async def get_ocr_status(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """OCR worker pool state (cold/warming/ready/unavailable), loaded engine and page counters. Admin only."""
+    return get_ocr_service().get_status()
+
+
+@router.post("/ocr/warm-up")
+async def warm_up_ocr(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Start the OCR workers and wait until the engine is loaded. Admin only."""
+    return await get_ocr_service().warm_up()
+
+
+@router.get("/llm/metrics")
+async def get_llm_metrics(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """LLM gateway configuration plus per-tier call, retry, token and latency stats. Admin only."""
+    return get_llm_gateway().get_metrics()
+
+
+@router.get("/extraction/routing")
+async def get_extraction_routing(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Per-tier circuit breaker state, rolling error rate/latency and hedge counters. Admin only."""
+    return get_extraction_routing_state()
+
+
+@router.get("/rescoring")
+async def get_rescoring_status(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Background job rescoring: in-progress jobs, queued reruns and recent results. Admin only."""
+    return get_rescore_scheduler().get_status()
+
+
+@router.get("/skill-index")
+async def get_skill_index_status(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN]))
+):
+    """Candidate skill index size, freshness, snapshot and last query timings. Admin only."""
+    return get_skill_index().get_status()
+
+
+@router.post("/skill-index/rebuild")
+async def rebuild_skill_index(
+    current_user: UserInDB = Depends(check_role([UserRole.ADMIN])),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Rebuild the skill index from MongoDB, e.g. so resume text is matched against newly added job skills. Admin only."""
+    service = get_skill_index()
+    await service.rebuild(db)
+    return service.get_status()
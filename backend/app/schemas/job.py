@@ -79,8 +79,12 @@ class ApplicationBase(BaseModel):
 class ApplicationCreate(ApplicationBase):
     uploaded_by: Optional[str] = None  # HR/Admin who uploaded the resume
     file_name: Optional[str] = None
+    file_size: Optional[int] = None  # bytes
     resume_url: Optional[str] = None
     profile_image_url: Optional[str] = None
+    # WebP previews rendered at ingest (PDF resumes): first page, and profile picture thumbnails by size
+    resume_preview_url: Optional[str] = None
+    profile_thumbnail_urls: Dict[str, str] = {}
     extracted_text: Optional[str] = None
 
 class CandidateExtractedData(BaseModel):
@@ -153,6 +157,7 @@ class ApplicationInDB(ApplicationCreate):
     candidate_summary: Optional[str] = None
     extraction_method: Optional[str] = None  # "llamaparse_groq", "mistral_7b", or "regex"
     extraction_tier: Optional[int] = None  # 1=LlamaParse+Groq, 2=Mistral7B, 3=Regex
+    extractor_version: Optional[str] = None  # Extraction logic version (see extraction_cache.EXTRACTOR_VERSION)
     
     # NEW: Rich extraction data from Smart Extractor
     experience_details: Optional[List[Dict[str, Any]]] = None  # Company-by-company breakdown
@@ -171,8 +176,9 @@ class ApplicationInDB(ApplicationCreate):
     reviewed_by: Optional[str] = None  # Team Lead user ID
     comments: List[Comment] = []
     
-    # Global Scoring for Resume Database
+    # Global Scoring for Resume Database (read from the job_scores collection)
     global_job_scores: Optional[List[Dict[str, Any]]] = None
+    scores_updated_at: Optional[datetime] = None
     
     # Other fields
     ranking_position: Optional[int] = None
@@ -1,60 +1,43 @@
-import os
-import boto3
-from botocore.exceptions import ClientError
-from fastapi import HTTPException
+"""
+Resume file storage under the 'resumes/' prefix, on the shared blob storage
+backend (Backblaze B2 in production, see app.services.blob_storage), and
+the resume download response (presigned redirect or cached proxy).
+"""
+
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+
 from app.core.config import settings
+from app.services.blob_cache import evict_cached_blobs, get_blob_cache
+from app.services.blob_storage import BlobNotFoundError, BlobStorageError, get_blob_storage
 
-def get_b2_client():
-    """Initializes and returns a boto3 client connected to Backblaze B2."""
-    if not settings.B2_KEY_ID or not settings.B2_APPLICATION_KEY:
-        raise HTTPException(
-            status_code=500,
-            detail="B2 Storage credentials (B2_KEY_ID, B2_APPLICATION_KEY) are not configured."
-        )
+RESUME_PREFIX = "resumes/"
+# Browsers may keep a copy but must revalidate (cheap with the ETag) so access checks still apply
+RESUME_CACHE_CONTROL = "private, no-cache"
 
-    try:
-        return boto3.client(
-            service_name='s3',
-            endpoint_url=settings.B2_ENDPOINT,
-            aws_access_key_id=settings.B2_KEY_ID,
-            aws_secret_access_key=settings.B2_APPLICATION_KEY
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to initialize B2 client: {str(e)}")
 
-async def upload_resume_to_b2(file_content: bytes, filename: str, mime_type: str = "application/pdf") -> tuple[str, str]:
+def resume_key(filename: str) -> str:
+    return f"{RESUME_PREFIX}{filename}"
+
+
+async def upload_resume_to_b2(
+    file_content: bytes, filename: str, mime_type: str = "application/pdf", file_path: Optional[str] = None
+) -> tuple[str, str]:
     """
     Uploads a resume to Backblaze B2 inside the 'resumes/' folder and returns the filename and public URL.
+    With `file_path` (a spooled upload) the file is streamed from disk instead of `file_content`.
     """
-    bucket_name = settings.B2_BUCKET_NAME
-    if not bucket_name:
-        raise HTTPException(status_code=500, detail="B2_BUCKET_NAME is not configured.")
-
-    b2_client = get_b2_client()
-    object_name = f"resumes/{filename}"
-
+    storage = get_blob_storage()
     try:
-        # Upload the file
-        b2_client.put_object(
-            Bucket=bucket_name,
-            Key=object_name,
-            Body=file_content,
-            ContentType=mime_type
-        )
-        
-        # Generate the public URL
-        # Format: https://{endpoint_hostname}/file/{bucket_name}/{key}
-        # Endpoint example: https://s3.us-west-002.backblazeb2.com
-        hostname = settings.B2_ENDPOINT.replace("https://s3.", "https://f000.", 1) 
-        if "f000" not in hostname:
-            hostname = settings.B2_ENDPOINT # Fallback if S3 API endpoint structure differs
-            
-        file_url = f"{hostname}/file/{bucket_name}/{object_name}"
-        
-        return filename, file_url
-
-    except ClientError as e:
-        raise HTTPException(status_code=500, detail=f"B2 Upload failed: {e.response['Error']['Message']}")
+        if file_path:
+            blob = await storage.put_file(resume_key(filename), file_path, mime_type)
+        else:
+            blob = await storage.put(resume_key(filename), file_content, mime_type)
+        return filename, blob.url
+    except BlobStorageError as e:
+        raise HTTPException(status_code=500, detail=f"B2 Upload failed: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error during B2 Upload: {str(e)}")
 
@@ -65,11 +48,127 @@ async def delete_resume_from_b2(filename: str):
     if not filename:
         return
 
-    bucket_name = settings.B2_BUCKET_NAME
-    b2_client = get_b2_client()
-    object_name = f"resumes/{filename}"
-
     try:
-        b2_client.delete_object(Bucket=bucket_name, Key=object_name)
+        await get_blob_storage().delete(resume_key(filename))
+        await evict_cached_blobs([resume_key(filename)])
     except Exception as e:
-        print(f"Warning: Failed to delete file {object_name} from B2: {e}")
+        print(f"Warning: Failed to delete file {resume_key(filename)} from B2: {e}")
+
+async def delete_resumes_from_b2(filenames: list[str]):
+    """Deletes many resume files concurrently; failures are logged, not raised."""
+    filenames = [filename for filename in filenames if filename]
+    if not filenames:
+        return
+    keys = [resume_key(filename) for filename in filenames]
+    try:
+        errors = await get_blob_storage().delete_many(keys)
+        await evict_cached_blobs(keys)
+    except BlobStorageError as e:
+        print(f"Warning: Failed to delete {len(filenames)} files from B2: {e}")
+        return
+    for key, error in errors.items():
+        if error:
+            print(f"Warning: Failed to delete file {key} from B2: {error}")
+
+async def download_resume_from_b2(filename: str) -> bytes:
+    """
+    Downloads a resume from Backblaze B2 by its filename (which maps to the 'resumes/' object key).
+    """
+    try:
+        return await get_blob_storage().get(resume_key(filename))
+    except BlobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Resume file not found in B2: {e}")
+    except BlobStorageError as e:
+        raise HTTPException(status_code=500, detail=f"B2 download failed: {e}")
+
+
+# ============================================================================
+# DOWNLOADS
+# ============================================================================
+
+def _etag_matches(header: Optional[str], etag: Optional[str]) -> bool:
+    """Whether an If-None-Match / If-Range header names `etag` (weak comparison)."""
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+def _requested_range(request: Request, size: int, etag: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    The single byte range asked for, as inclusive (start, end). None means
+    the whole file: no Range header, a stale If-Range, or several ranges.
+    Raises a 416 HTTPException for an unsatisfiable range.
+    """
+    header = request.headers.get("range", "")
+    if not header.startswith("bytes=") or "," in header:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range and not _etag_matches(if_range, etag):
+        return None
+    start, _, end = header[len("bytes="):].strip().partition("-")
+    try:
+        if start:
+            first, last = int(start), min(int(end) if end else size - 1, size - 1)
+        else:
+            first, last = max(size - int(end), 0), size - 1  # suffix range: the last N bytes
+    except ValueError:
+        return None
+    if first > last or first >= size:
+        raise HTTPException(
+            status_code=416, detail="Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"}
+        )
+    return first, last
+
+
+async def resume_download_response(request: Request, filename: str) -> Response:
+    """
+    Response for downloading a stored resume, according to RESUME_DOWNLOAD_MODE:
+
+    - redirect: a 307 to a presigned storage URL valid for RESUME_PRESIGNED_URL_TTL
+      seconds, so the bytes never pass through the API (falls back to proxying on
+      backends without presigned URLs)
+    - proxy: served from the local LRU disk cache, fetched from storage on a miss
+
+    Both proxied paths answer If-None-Match with 304 and Range / If-Range with 206.
+    """
+    key = resume_key(filename)
+    storage = get_blob_storage()
+
+    try:
+        if settings.RESUME_DOWNLOAD_MODE == "redirect":
+            url = await storage.presigned_url(key, settings.RESUME_PRESIGNED_URL_TTL, download_name=filename)
+            if url:
+                return RedirectResponse(url, status_code=307, headers={"Cache-Control": "no-store"})
+
+        cache = get_blob_cache()
+        cached = await cache.fetch(storage, key) if cache.enabled else None
+        blob = cached[1] if cached else await storage.head(key)
+        headers = {"Cache-Control": RESUME_CACHE_CONTROL}
+        if blob.etag:
+            headers["ETag"] = blob.etag
+        if _etag_matches(request.headers.get("if-none-match"), blob.etag):
+            return Response(status_code=304, headers=headers)
+
+        if cached:
+            # FileResponse handles Range and If-Range itself
+            return FileResponse(cached[0], media_type=blob.content_type, headers=headers)
+
+        # Too large for the cache (or cache disabled): stream the requested bytes from storage
+        byte_range = _requested_range(request, blob.size, blob.etag)
+        blob, chunks = await storage.stream(key, byte_range=byte_range)
+        headers["Accept-Ranges"] = "bytes"
+        if byte_range is None:
+            headers["Content-Length"] = str(blob.size)
+            return StreamingResponse(chunks, media_type=blob.content_type, headers=headers)
+        first, last = byte_range
+        headers["Content-Range"] = f"bytes {first}-{last}/{blob.size}"
+        headers["Content-Length"] = str(last - first + 1)
+        return StreamingResponse(chunks, status_code=206, media_type=blob.content_type, headers=headers)
+    except BlobNotFoundError as e:
+        print(f"B2 Fetch Error: {e}")
+        raise HTTPException(status_code=404, detail="Resume file not found in cloud storage")
+    except BlobStorageError as e:
+        print(f"B2 Fetch Error: {e}")
+        raise HTTPException(status_code=502, detail="Resume file could not be fetched from cloud storage")
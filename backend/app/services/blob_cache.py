@@ -0,0 +1,226 @@
+"""
+Local LRU disk cache of blobs fetched from storage, for the resume download
+proxy.
+
+Reviewers reopen the same resumes over and over; without a cache every view
+is a full GET from B2. Objects are downloaded once into RESUME_CACHE_DIR (a
+subdirectory per API process) and served from there (with Range support)
+until they are evicted, least recently used first, to keep the directory
+under RESUME_CACHE_MAX_BYTES.
+Resume blobs are never overwritten (each upload gets a new key), so cached
+copies do not need revalidation; delete() drops an object when its
+application is deleted.
+
+Concurrent requests for an object that is not cached yet share one download.
+The index lives in memory, so the cache starts empty after a restart; the
+directories of API processes that are no longer running are removed then.
+
+Usage:
+    cached = await get_blob_cache().fetch(storage, "resumes/x.pdf")
+    if cached:
+        path, blob = cached     # serve with FileResponse(path, ...)
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.services.blob_storage import BlobInfo, BlobStorage
+
+logger = logging.getLogger(__name__)
+
+
+class BlobDiskCache:
+    """Size-bounded LRU of blob files on local disk."""
+
+    def __init__(self, directory: str, max_bytes: int, max_object_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # One object may use at most a quarter of the cache, so a few big files cannot flush it
+        self.max_object_bytes = max_object_bytes or max_bytes // 4
+        self._entries: "OrderedDict[str, Tuple[str, BlobInfo]]" = OrderedDict()
+        self._size = 0
+        self._downloads: Dict[str, asyncio.Future] = {}
+        self._too_large: set = set()
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+        self._evictions = 0
+        self._errors = 0
+
+        # Leftovers from a previous process are not in the index: start clean
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    async def fetch(self, storage: BlobStorage, key: str) -> Optional[Tuple[str, BlobInfo]]:
+        """
+        (local path, blob info) of a cached copy, downloading it on a miss.
+        None when the object is too large to cache (the caller streams it).
+        Storage errors (BlobNotFoundError, ...) propagate.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and os.path.exists(entry[0]):
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+        if entry is not None:
+            self._forget(key)
+        if key in self._too_large:
+            self._bypassed += 1
+            return None
+
+        pending = self._downloads.get(key)
+        if pending is not None:
+            self._hits += 1
+            return await asyncio.shield(pending)
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._downloads[key] = future
+        try:
+            result = await self._download(storage, key)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here, so a miss without waiters does not log "never retrieved"
+            raise
+        finally:
+            del self._downloads[key]
+
+    async def _download(self, storage: BlobStorage, key: str) -> Optional[Tuple[str, BlobInfo]]:
+        blob, chunks = await storage.stream(key)
+        if blob.size > self.max_object_bytes:
+            await chunks.aclose()
+            self._too_large.add(key)
+            self._bypassed += 1
+            return None
+
+        path = os.path.join(self.directory, uuid.uuid4().hex + os.path.splitext(key)[1])
+        partial = path + ".part"
+        try:
+            file = await asyncio.to_thread(open, partial, "wb")
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(file.write, chunk)
+            finally:
+                await asyncio.to_thread(file.close)
+            await asyncio.to_thread(os.replace, partial, path)
+        except BaseException:
+            self._errors += 1
+            await asyncio.to_thread(_unlink, partial)
+            raise
+
+        self._entries[key] = (path, blob)
+        self._size += blob.size
+        await self._evict()
+        return path, blob
+
+    async def _evict(self):
+        # The newest entry (just fetched, about to be served) is never evicted
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            path = self._forget(key)
+            self._evictions += 1
+            await asyncio.to_thread(_unlink, path)
+
+    def _forget(self, key: str) -> str:
+        path, blob = self._entries.pop(key)
+        self._size -= blob.size
+        return path
+
+    async def delete(self, key: str):
+        """Drop an object from the cache (e.g. when it is deleted from storage)."""
+        self._too_large.discard(key)
+        if key in self._entries:
+            await asyncio.to_thread(_unlink, self._forget(key))
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "size_bytes": self._size,
+            "objects": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "bypassed": self._bypassed,
+            "evictions": self._evictions,
+            "errors": self._errors,
+        }
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def remove_dead_process_dirs(root: str) -> int:
+    """
+    Delete the cache directories (named by PID) of processes that have
+    exited, e.g. before a restart or a recycled uvicorn worker. Returns how
+    many were removed.
+    """
+    removed = 0
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        if name.isdigit() and int(name) != os.getpid() and not _process_alive(int(name)):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+            removed += 1
+    if removed:
+        logger.info(f"Removed {removed} resume cache directories of exited processes from {root}")
+    return removed
+
+
+# ============================================================================
+# CONVENIENCE FUNCTIONS
+# ============================================================================
+
+# Global singleton instance
+_blob_cache: Optional[BlobDiskCache] = None
+
+def get_blob_cache() -> BlobDiskCache:
+    """Get or create the global BlobDiskCache instance."""
+    global _blob_cache
+    if _blob_cache is None:
+        # One subdirectory per process: each API worker has its own index
+        root = settings.RESUME_CACHE_DIR or os.path.join(tempfile.gettempdir(), "ats_resume_cache")
+        remove_dead_process_dirs(root)
+        _blob_cache = BlobDiskCache(os.path.join(root, str(os.getpid())), settings.RESUME_CACHE_MAX_BYTES)
+    return _blob_cache
+
+
+async def evict_cached_blobs(keys):
+    """Drop deleted objects from this process's cache, if it has been created."""
+    if _blob_cache is not None:
+        for key in keys:
+            await _blob_cache.delete(key)
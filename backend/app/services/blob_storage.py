@@ -0,0 +1,435 @@
+"""
+Blob storage for resumes, profile images and chat attachments.
+
+One process-wide storage backend, chosen by STORAGE_BACKEND:
+
+    s3     Backblaze B2 or any S3-compatible endpoint (B2_* settings). A single
+           boto3 client with a connection pool of STORAGE_MAX_CONNECTIONS is
+           shared by every request; its blocking calls run in worker threads,
+           and objects above STORAGE_MULTIPART_THRESHOLD are uploaded in
+           parallel multipart chunks.
+    local  Files under STORAGE_LOCAL_DIR, served by the /uploads static mount.
+           For development and tests.
+
+Every operation is a coroutine and never blocks the event loop, so uploads,
+downloads and deletes for different requests run concurrently.
+
+Usage:
+    storage = get_blob_storage()
+    blob = await storage.put("resumes/jane.pdf", content, "application/pdf")
+    blob, chunks = await storage.stream("resumes/jane.pdf")
+    await storage.delete_many(["resumes/a.pdf", "resumes/b.pdf"])
+"""
+
+import asyncio
+import io
+import logging
+import mimetypes
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.capabilities import require
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 256 * 1024
+# Same directory main.py serves at /uploads
+DEFAULT_LOCAL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads")
+
+
+class BlobStorageError(RuntimeError):
+    """A storage operation failed (misconfiguration, network or backend error)."""
+
+
+class BlobNotFoundError(BlobStorageError):
+    """The requested object does not exist."""
+
+
+@dataclass
+class BlobInfo:
+    key: str
+    size: int
+    content_type: str
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+    url: Optional[str] = None
+
+
+def guess_content_type(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class BlobStorage:
+    """Interface of a storage backend. Keys are "/"-separated paths such as "resumes/jane_123.pdf"."""
+
+    name = "base"
+
+    async def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> BlobInfo:
+        raise NotImplementedError
+
+    async def put_file(self, key: str, path: str, content_type: Optional[str] = None) -> BlobInfo:
+        """Store a file from disk without reading it into memory."""
+        raise NotImplementedError
+
+    async def get(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    async def stream(
+        self, key: str, chunk_size: int = STREAM_CHUNK_SIZE, byte_range: Optional[Tuple[int, int]] = None
+    ) -> Tuple[BlobInfo, AsyncIterator[bytes]]:
+        """
+        Object metadata and an async iterator over its bytes (for
+        StreamingResponse); only bytes start..end (inclusive) with `byte_range`.
+        """
+        raise NotImplementedError
+
+    async def head(self, key: str) -> BlobInfo:
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        """Delete an object; deleting a missing object is not an error."""
+        raise NotImplementedError
+
+    async def delete_many(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Delete objects concurrently. Returns key -> error message (None when deleted)."""
+        results = await asyncio.gather(*[self.delete(key) for key in keys], return_exceptions=True)
+        return {key: str(result) if isinstance(result, Exception) else None for key, result in zip(keys, results)}
+
+    def public_url(self, key: str) -> str:
+        raise NotImplementedError
+
+    async def presigned_url(self, key: str, expires_in: int, download_name: Optional[str] = None) -> Optional[str]:
+        """A short-lived URL to read the object directly from the backend, or None if the backend has none."""
+        return None
+
+    def close(self):
+        pass
+
+
+class LocalBlobStorage(BlobStorage):
+    """Objects as files under `root`; public URLs point at the /uploads static mount."""
+
+    name = "local"
+
+    def __init__(self, root: str, url_prefix: str = "/uploads"):
+        self.root = os.path.abspath(root)
+        self.url_prefix = url_prefix.rstrip("/")
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise BlobStorageError(f"Invalid object key: {key}")
+        return path
+
+    def _info(self, key: str, path: str, content_type: Optional[str] = None) -> BlobInfo:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"Object not found: {key}")
+        return BlobInfo(
+            key=key,
+            size=stat.st_size,
+            content_type=content_type or guess_content_type(key),
+            etag=f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            url=self.public_url(key),
+        )
+
+    def _write(self, key: str, data: Optional[bytes], source: Optional[str], content_type: Optional[str]) -> BlobInfo:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written next to the target and renamed, so readers never see a partial file
+        partial = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            if source is not None:
+                shutil.copyfile(source, partial)
+            else:
+                with open(partial, "wb") as f:
+                    f.write(data)
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.unlink(partial)
+        return self._info(key, path, content_type)
+
+    async def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> BlobInfo:
+        return await asyncio.to_thread(self._write, key, data, None, content_type)
+
+    async def put_file(self, key: str, path: str, content_type: Optional[str] = None) -> BlobInfo:
+        return await asyncio.to_thread(self._write, key, None, path, content_type)
+
+    def _read(self, key: str) -> bytes:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"Object not found: {key}")
+
+    async def get(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._read, key)
+
+    async def head(self, key: str) -> BlobInfo:
+        return await asyncio.to_thread(self._info, key, self._path(key))
+
+    async def stream(
+        self, key: str, chunk_size: int = STREAM_CHUNK_SIZE, byte_range: Optional[Tuple[int, int]] = None
+    ) -> Tuple[BlobInfo, AsyncIterator[bytes]]:
+        path = self._path(key)
+        info = await asyncio.to_thread(self._info, key, path)
+        file = await asyncio.to_thread(open, path, "rb")
+        start, end = byte_range or (0, info.size - 1)
+        if start:
+            await asyncio.to_thread(file.seek, start)
+
+        async def chunks():
+            remaining = end - start + 1
+            try:
+                while remaining > 0:
+                    chunk = await asyncio.to_thread(file.read, min(chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+            finally:
+                file.close()
+
+        return info, chunks()
+
+    def _delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._delete, key)
+
+    def public_url(self, key: str) -> str:
+        return f"{self.url_prefix}/{key}"
+
+
+class S3BlobStorage(BlobStorage):
+    """
+    S3-compatible storage (Backblaze B2 by default). The boto3 client is
+    created once and shared: botocore clients are thread-safe and keep a
+    pool of keep-alive connections, so concurrent requests reuse them instead
+    of opening new TLS connections for every call.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str],
+        access_key_id: str,
+        secret_access_key: str,
+        max_connections: Optional[int] = None,
+        multipart_threshold: Optional[int] = None,
+        multipart_chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        if not bucket:
+            raise BlobStorageError("B2_BUCKET_NAME is not configured.")
+        if not access_key_id or not secret_access_key:
+            raise BlobStorageError("B2 Storage credentials (B2_KEY_ID, B2_APPLICATION_KEY) are not configured.")
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url or None
+        self._credentials = (access_key_id, secret_access_key)
+        self.max_connections = max_connections or settings.STORAGE_MAX_CONNECTIONS
+        self.multipart_threshold = multipart_threshold or settings.STORAGE_MULTIPART_THRESHOLD
+        self.multipart_chunk_size = multipart_chunk_size or settings.STORAGE_MULTIPART_CHUNK_SIZE
+        self.max_concurrency = max_concurrency or settings.STORAGE_MAX_CONCURRENCY
+        self._client = None
+        self._transfer_config = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The shared boto3 client, created on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    boto3 = require("boto3")
+                    from botocore.config import Config
+                    from boto3.s3.transfer import TransferConfig
+
+                    self._client = boto3.session.Session().client(
+                        service_name="s3",
+                        endpoint_url=self.endpoint_url,
+                        aws_access_key_id=self._credentials[0],
+                        aws_secret_access_key=self._credentials[1],
+                        config=Config(
+                            max_pool_connections=self.max_connections,
+                            retries={"max_attempts": 3, "mode": "standard"},
+                            tcp_keepalive=True,
+                        ),
+                    )
+                    self._transfer_config = TransferConfig(
+                        multipart_threshold=self.multipart_threshold,
+                        multipart_chunksize=self.multipart_chunk_size,
+                        max_concurrency=self.max_concurrency,
+                        use_threads=True,
+                    )
+        return self._client
+
+    def _call(self, key: str, operation: str, **kwargs):
+        """Run one client call (blocking), mapping botocore errors to BlobStorageError."""
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            return getattr(self.client, operation)(Bucket=self.bucket, Key=key, **kwargs)
+        except ClientError as e:
+            error = e.response.get("Error", {})
+            if error.get("Code") in ("NoSuchKey", "404", "NotFound"):
+                raise BlobNotFoundError(f"Object not found: {key}") from e
+            raise BlobStorageError(error.get("Message") or str(e)) from e
+        except BotoCoreError as e:
+            raise BlobStorageError(str(e)) from e
+
+    def _info(self, key: str, response: dict) -> BlobInfo:
+        return BlobInfo(
+            key=key,
+            size=response.get("ContentLength", 0),
+            content_type=response.get("ContentType") or guess_content_type(key),
+            etag=response.get("ETag"),
+            last_modified=response.get("LastModified"),
+            url=self.public_url(key),
+        )
+
+    def _upload(self, key: str, fileobj, content_type: str) -> BlobInfo:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        client = self.client
+        try:
+            # Switches to a multipart upload with parallel parts above the threshold
+            client.upload_fileobj(
+                fileobj, self.bucket, key, ExtraArgs={"ContentType": content_type}, Config=self._transfer_config
+            )
+        except (ClientError, BotoCoreError) as e:
+            raise BlobStorageError(str(e)) from e
+        return self._head(key)
+
+    def _head(self, key: str) -> BlobInfo:
+        return self._info(key, self._call(key, "head_object"))
+
+    async def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> BlobInfo:
+        content_type = content_type or guess_content_type(key)
+        if len(data) < self.multipart_threshold:
+            response = await asyncio.to_thread(self._call, key, "put_object", Body=data, ContentType=content_type)
+            return BlobInfo(
+                key=key, size=len(data), content_type=content_type, etag=response.get("ETag"),
+                last_modified=datetime.now(timezone.utc), url=self.public_url(key)
+            )
+        return await asyncio.to_thread(self._upload, key, io.BytesIO(data), content_type)
+
+    async def put_file(self, key: str, path: str, content_type: Optional[str] = None) -> BlobInfo:
+        def _upload_path():
+            with open(path, "rb") as f:
+                return self._upload(key, f, content_type or guess_content_type(key))
+        return await asyncio.to_thread(_upload_path)
+
+    async def get(self, key: str) -> bytes:
+        def _get():
+            response = self._call(key, "get_object")
+            with response["Body"] as body:
+                return body.read()
+        return await asyncio.to_thread(_get)
+
+    async def head(self, key: str) -> BlobInfo:
+        return await asyncio.to_thread(self._head, key)
+
+    async def stream(
+        self, key: str, chunk_size: int = STREAM_CHUNK_SIZE, byte_range: Optional[Tuple[int, int]] = None
+    ) -> Tuple[BlobInfo, AsyncIterator[bytes]]:
+        extra = {"Range": f"bytes={byte_range[0]}-{byte_range[1]}"} if byte_range else {}
+        response = await asyncio.to_thread(self._call, key, "get_object", **extra)
+        body = response["Body"]
+        if byte_range:
+            # ContentLength is the length of the range; the object size follows the "/" in ContentRange
+            response = {**response, "ContentLength": int(response["ContentRange"].rsplit("/", 1)[1])}
+
+        async def chunks():
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(body.read, chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                # Returns the connection to the pool (or drops it if the body was not fully read)
+                body.close()
+
+        return self._info(key, response), chunks()
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._call, key, "delete_object")
+
+    async def presigned_url(self, key: str, expires_in: int, download_name: Optional[str] = None) -> Optional[str]:
+        params = {"Bucket": self.bucket, "Key": key}
+        if download_name:
+            params["ResponseContentDisposition"] = f'inline; filename="{download_name}"'
+        # Signed locally, no request is made
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+
+    def public_url(self, key: str) -> str:
+        # B2 friendly URL: https://f000.{region}.backblazeb2.com/file/{bucket}/{key}
+        # Endpoint example: https://s3.us-west-002.backblazeb2.com
+        endpoint = (self.endpoint_url or "").rstrip("/")
+        hostname = endpoint.replace("https://s3.", "https://f000.", 1)
+        if "f000" not in hostname:
+            hostname = endpoint  # Fallback if S3 API endpoint structure differs
+        return f"{hostname}/file/{self.bucket}/{key}"
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+# ============================================================================
+# CONVENIENCE FUNCTIONS
+# ============================================================================
+
+# Global singleton instance
+_blob_storage: Optional[BlobStorage] = None
+
+def create_blob_storage(backend: Optional[str] = None) -> BlobStorage:
+    backend = (backend or settings.STORAGE_BACKEND).lower()
+    if backend == "local":
+        return LocalBlobStorage(settings.STORAGE_LOCAL_DIR or DEFAULT_LOCAL_DIR)
+    if backend == "s3":
+        return S3BlobStorage(
+            bucket=settings.B2_BUCKET_NAME,
+            endpoint_url=settings.B2_ENDPOINT,
+            access_key_id=settings.B2_KEY_ID,
+            secret_access_key=settings.B2_APPLICATION_KEY,
+        )
+    raise BlobStorageError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+def get_blob_storage() -> BlobStorage:
+    """Get or create the global storage backend."""
+    global _blob_storage
+    if _blob_storage is None:
+        _blob_storage = create_blob_storage()
+        logger.info(f"Blob storage backend: {_blob_storage.name}")
+    return _blob_storage
+
+
+def shutdown_blob_storage():
+    """Close the shared client's connections (on app shutdown)."""
+    global _blob_storage
+    if _blob_storage is not None:
+        _blob_storage.close()
+        _blob_storage = None
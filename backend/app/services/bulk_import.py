@@ -0,0 +1,281 @@
+"""
+Bulk resume import from ZIP archives or many uploaded files.
+
+Entries are streamed out of the archive one at a time (never the whole ZIP
+in memory), exact duplicates are dropped up front by content hash, and the
+remaining files run through the ingestion pipeline with bounded concurrency
+while per-file progress is pushed to the uploader over Socket.IO.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import uuid
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, UploadFile
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.services.ingest_queue import enqueue_ingest_job
+from app.services.parsed_document import file_extension
+from app.services.resume_pipeline import ALLOWED_RESUME_EXTENSIONS, MAX_RESUME_SIZE, process_resume_upload
+from app.services.socket_manager import emit_bulk_import_progress
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class BulkEntry:
+    """One resume inside the import, not yet read into memory."""
+    name: str
+    size: int
+    open: Callable[[], Any]
+    file_hash: Optional[str] = None
+    status: str = "pending"
+    error: Optional[str] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+
+
+def _is_zip(upload: UploadFile) -> bool:
+    # DOCX files are ZIP containers too, so go by the declared name/type rather than sniffing
+    return (
+        file_extension(upload.filename) == "zip"
+        or (upload.content_type or "").lower() in ("application/zip", "application/x-zip-compressed")
+    )
+
+
+def collect_entries(uploads: List[UploadFile]) -> List[BulkEntry]:
+    """
+    List resume entries from uploaded files and ZIP archives without reading their contents.
+    Unsupported or oversized entries are returned already marked as skipped.
+    """
+    entries: List[BulkEntry] = []
+
+    for upload in uploads:
+        upload.file.seek(0)
+        if _is_zip(upload):
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {upload.filename}")
+
+            for info in archive.infolist():
+                base_name = info.filename.rsplit("/", 1)[-1]
+                if info.is_dir() or not base_name or base_name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                entry = BulkEntry(
+                    name=base_name,
+                    size=info.file_size,
+                    open=lambda archive=archive, info=info: archive.open(info)
+                )
+                entries.append(entry)
+        else:
+            upload.file.seek(0, 2)
+            size = upload.file.tell()
+            upload.file.seek(0)
+
+            def _open(upload=upload):
+                # nullcontext so callers' `with` blocks don't close the upload
+                upload.file.seek(0)
+                return contextlib.nullcontext(upload.file)
+
+            entries.append(BulkEntry(name=upload.filename, size=size, open=_open))
+
+    for entry in entries:
+        if file_extension(entry.name) not in ALLOWED_RESUME_EXTENSIONS:
+            entry.status = "skipped"
+            entry.error = "Only PDF, DOC, and DOCX files are allowed."
+        elif entry.size > MAX_RESUME_SIZE:
+            entry.status = "skipped"
+            entry.error = "File size exceeds the 5MB limit."
+
+    return entries
+
+
+def hash_entries(entries: List[BulkEntry]):
+    """
+    Stream each pending entry once to compute its MD5, without holding it in memory.
+    Entries that cannot be read (corrupt, encrypted) are marked failed.
+    """
+    for entry in entries:
+        if entry.status != "pending":
+            continue
+        digest = hashlib.md5()
+        try:
+            with entry.open() as stream:
+                while True:
+                    chunk = stream.read(HASH_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+        except (zipfile.BadZipFile, RuntimeError, zlib.error, OSError) as e:
+            # RuntimeError: encrypted entry; zlib.error: broken deflate stream
+            entry.status = "failed"
+            entry.error = f"Could not read file from archive: {e}"
+            continue
+        entry.file_hash = digest.hexdigest()
+
+
+def _read_entry(entry: BulkEntry) -> bytes:
+    with entry.open() as stream:
+        return stream.read(MAX_RESUME_SIZE + 1)
+
+
+async def _mark_duplicates(db: AsyncIOMotorDatabase, entries: List[BulkEntry], job_id: Optional[str]):
+    """Drop repeated files within the batch and files already uploaded for this job."""
+    seen = set()
+    for entry in entries:
+        if entry.status != "pending":
+            continue
+        if entry.file_hash in seen:
+            entry.status = "duplicate"
+            entry.error = "Same file appears earlier in this import"
+        seen.add(entry.file_hash)
+
+    if not seen:
+        return
+
+    existing = set()
+    cursor = db.applications.find(
+        {"job_id": job_id, "file_hash": {"$in": list(seen)}},
+        {"file_hash": 1}
+    )
+    async for app in cursor:
+        existing.add(app.get("file_hash"))
+
+    for entry in entries:
+        if entry.status == "pending" and entry.file_hash in existing:
+            entry.status = "duplicate"
+            entry.error = "This exact resume file has already been uploaded for this job"
+
+
+async def run_bulk_import(
+    db: AsyncIOMotorDatabase,
+    uploads: List[UploadFile],
+    job_id: Optional[str],
+    job: Optional[dict],
+    uploaded_by: str,
+    concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Import every resume in `uploads` and return a per-file summary.
+
+    In INGEST_MODE=queue files are handed to ingestion workers instead of
+    being processed here, so the request returns as soon as they are queued.
+    """
+    import_id = uuid.uuid4().hex
+    concurrency = max(1, concurrency or settings.BULK_IMPORT_CONCURRENCY)
+
+    entries = collect_entries(uploads)
+    if len(entries) > settings.BULK_IMPORT_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files in one import ({len(entries)}); the limit is {settings.BULK_IMPORT_MAX_FILES}"
+        )
+
+    # Archive reads are blocking file I/O; keep them off the event loop
+    await asyncio.to_thread(hash_entries, entries)
+    await _mark_duplicates(db, entries, job_id)
+
+    total = len(entries)
+    processed = 0
+    progress_lock = asyncio.Lock()
+    read_lock = asyncio.Lock()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def _report(entry: BulkEntry):
+        nonlocal processed
+        async with progress_lock:
+            processed += 1
+            await emit_bulk_import_progress(uploaded_by, {
+                "import_id": import_id,
+                "filename": entry.name,
+                "status": entry.status,
+                "error": entry.error,
+                "processed": processed,
+                "total": total,
+                **entry.result
+            })
+
+    async def _process(entry: BulkEntry):
+        try:
+            # zipfile handles are not safe for concurrent reads
+            async with read_lock:
+                file_content = await asyncio.to_thread(_read_entry, entry)
+
+            if settings.INGEST_MODE == "queue":
+                ingest_id = await enqueue_ingest_job(
+                    db,
+                    file_content=file_content,
+                    filename=entry.name,
+                    job_id=job_id,
+                    uploaded_by=uploaded_by,
+                    file_hash=entry.file_hash,
+                    extra={"bulk_import_id": import_id}
+                )
+                entry.status = "queued"
+                entry.result = {"ingest_id": ingest_id}
+            else:
+                application_doc = await process_resume_upload(
+                    db,
+                    file_content=file_content,
+                    filename=entry.name,
+                    job_id=job_id,
+                    uploaded_by=uploaded_by,
+                    job=job,
+                    extra_fields={"bulk_import_id": import_id},
+                    file_hash=entry.file_hash
+                )
+                entry.status = "created"
+                entry.result = {
+                    "application_id": application_doc["_id"],
+                    "candidate_name": application_doc.get("candidate_name_extracted")
+                }
+        except HTTPException as e:
+            entry.status = "duplicate" if e.status_code == 400 and "already" in str(e.detail) else "failed"
+            entry.error = str(e.detail)
+        except Exception as e:
+            entry.status = "failed"
+            entry.error = str(e)
+        finally:
+            slots.release()
+            await _report(entry)
+
+    tasks = []
+    for entry in entries:
+        if entry.status != "pending":
+            await _report(entry)
+            continue
+        # Acquire before scheduling so at most `concurrency` files are held in memory
+        await slots.acquire()
+        tasks.append(asyncio.create_task(_process(entry)))
+    await asyncio.gather(*tasks)
+
+    counts: Dict[str, int] = {}
+    for entry in entries:
+        counts[entry.status] = counts.get(entry.status, 0) + 1
+
+    summary = {
+        "import_id": import_id,
+        "total": total,
+        "created": counts.get("created", 0),
+        "queued": counts.get("queued", 0),
+        "duplicates": counts.get("duplicate", 0),
+        "skipped": counts.get("skipped", 0),
+        "failed": counts.get("failed", 0),
+        "results": [
+            {"filename": entry.name, "status": entry.status, "error": entry.error, **entry.result}
+            for entry in entries
+        ]
+    }
+    await emit_bulk_import_progress(uploaded_by, {
+        "import_id": import_id,
+        "status": "completed",
+        "processed": total,
+        "total": total
+    })
+    return summary
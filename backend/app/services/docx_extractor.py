@@ -0,0 +1,231 @@
+"""
+Streaming text extraction for Word files.
+
+DOCX: python-docx builds the whole object model and its `paragraphs` only
+cover top-level body paragraphs, so text in tables, headers/footers and text
+boxes (where many resumes keep contact details and skills) is lost. This
+extractor streams the XML parts straight out of the zip with lxml's
+incremental parser and keeps only the text, in reading order:
+
+    headers  ->  body (paragraphs, table rows as "cell | cell", text boxes)  ->  footers
+
+Each top-level block (paragraph, table, content control) is turned into
+lines as soon as it has been parsed and then dropped, so memory stays flat
+on large files.
+
+DOC (legacy binary Word): converted with `antiword` or `catdoc` when one is
+installed. Files named .doc that are really DOCX are handled as DOCX.
+Anything else raises a ValueError telling the user to upload PDF or DOCX.
+
+Usage:
+    text = extract_docx_text(content)
+    text = extract_doc_text(content)
+"""
+
+import io
+import logging
+import re
+import shutil
+import subprocess
+import zipfile
+from typing import Iterator, List, Optional
+
+from app.core.capabilities import require
+
+logger = logging.getLogger(__name__)
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+W_P, W_TBL, W_TR, W_TC, W_SDT = W_NS + "p", W_NS + "tbl", W_NS + "tr", W_NS + "tc", W_NS + "sdt"
+W_R, W_T, W_TAB, W_BR, W_CR = W_NS + "r", W_NS + "t", W_NS + "tab", W_NS + "br", W_NS + "cr"
+W_TXBX_CONTENT = W_NS + "txbxContent"
+MC_FALLBACK = MC_NS + "Fallback"
+PART_ROOTS = (W_NS + "body", W_NS + "hdr", W_NS + "ftr")
+
+BODY_PART = "word/document.xml"
+HEADER_PART = re.compile(r"^word/header(\d*)\.xml$")
+FOOTER_PART = re.compile(r"^word/footer(\d*)\.xml$")
+
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_SIGNATURE = b"PK\x03\x04"
+
+DOC_CONVERTERS = (
+    ("antiword", ["antiword", "-w", "0", "-"]),
+    ("catdoc", ["catdoc", "-w"]),
+)
+DOC_CONVERT_TIMEOUT = 30
+
+INVALID_DOCX_MESSAGE = "Invalid DOCX file. Please convert to .docx if needed."
+
+
+# ============================================================================
+# DOCX
+# ============================================================================
+
+def _paragraph_lines(paragraph) -> List[str]:
+    """The paragraph's own text, then the lines of any text boxes anchored in it."""
+    if next(paragraph.iter(W_TAB, W_BR, W_CR, W_TXBX_CONTENT, MC_FALLBACK), None) is None:
+        # Plain paragraph (the vast majority): only w:t text, collected in C
+        return ["".join(paragraph.itertext(W_T, with_tail=False)).rstrip()]
+
+    # mc:Fallback repeats the mc:Choice content (e.g. a VML copy of a text box)
+    for fallback in list(paragraph.iter(MC_FALLBACK)):
+        fallback.getparent().remove(fallback)
+
+    boxes = []
+    box = next(paragraph.iter(W_TXBX_CONTENT), None)
+    while box is not None:
+        boxes += _container_lines(box)
+        box.getparent().remove(box)
+        box = next(paragraph.iter(W_TXBX_CONTENT), None)
+
+    parts = []
+    for element in paragraph.iter(W_T, W_TAB, W_BR, W_CR):
+        if element.tag == W_T:
+            parts.append(element.text or "")
+        elif element.tag == W_TAB:
+            # w:tab is also a tab-stop definition in the paragraph properties
+            if element.getparent().tag == W_R:
+                parts.append("\t")
+        else:
+            parts.append("\n")
+    return ["".join(parts).rstrip()] + boxes
+
+
+def _table_lines(table) -> List[str]:
+    """One line per row, cells joined with " | " (nested tables are flattened into their cell)."""
+    lines = []
+    for row in _children(table, W_TR):
+        cells = []
+        for cell in _children(row, W_TC):
+            text = " ".join(line.strip() for line in _container_lines(cell) if line.strip())
+            if text:
+                cells.append(text)
+        if cells:
+            lines.append(" | ".join(cells))
+    return lines
+
+
+def _children(element, tag: str) -> Iterator:
+    """Children with `tag`, looking through wrappers such as content controls (w:sdt/w:sdtContent)."""
+    for child in element:
+        if child.tag == tag:
+            yield child
+        elif child.tag in (W_SDT, W_NS + "sdtContent", W_NS + "customXml"):
+            yield from _children(child, tag)
+
+
+def _container_lines(container) -> List[str]:
+    """Lines of the blocks in a body, cell, text box or content control."""
+    lines = []
+    for child in container:
+        if child.tag == W_P:
+            lines += _paragraph_lines(child)
+        elif child.tag == W_TBL:
+            lines += _table_lines(child)
+        elif child.tag in (W_SDT, W_NS + "sdtContent", W_NS + "customXml"):
+            lines += _container_lines(child)
+    return lines
+
+
+def _iter_part_lines(stream) -> Iterator[str]:
+    """
+    Lines of one WordprocessingML part (document, header or footer), in
+    reading order. Only top-level blocks are handled as they finish parsing;
+    they are freed right after.
+    """
+    etree = require("lxml")
+    for _, element in etree.iterparse(
+        stream, events=("end",), tag=(W_P, W_TBL, W_SDT), resolve_entities=False, no_network=True, huge_tree=False
+    ):
+        parent = element.getparent()
+        if parent is None or parent.tag not in PART_ROOTS:
+            continue
+        if element.tag == W_P:
+            yield from _paragraph_lines(element)
+        elif element.tag == W_TBL:
+            yield from _table_lines(element)
+        else:
+            yield from _container_lines(element)
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _part_number(name: str, pattern) -> int:
+    number = pattern.match(name).group(1)
+    return int(number) if number else 0
+
+
+def extract_docx_text(content: bytes) -> str:
+    """Text of a DOCX file: headers, body (with tables and text boxes), footers. Raises ValueError if invalid."""
+    etree = require("lxml")
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            names = archive.namelist()
+            if BODY_PART not in names:
+                raise ValueError(INVALID_DOCX_MESSAGE)
+            headers = sorted((n for n in names if HEADER_PART.match(n)), key=lambda n: _part_number(n, HEADER_PART))
+            footers = sorted((n for n in names if FOOTER_PART.match(n)), key=lambda n: _part_number(n, FOOTER_PART))
+
+            lines: List[str] = []
+            seen_edge_lines = set()
+            for part in headers + [BODY_PART] + footers:
+                with archive.open(part) as stream:
+                    for line in _iter_part_lines(stream):
+                        if part != BODY_PART:
+                            # First-page/even-page variants usually repeat the default header/footer
+                            if not line.strip() or line in seen_edge_lines:
+                                continue
+                            seen_edge_lines.add(line)
+                        lines.append(line)
+    except (zipfile.BadZipFile, etree.XMLSyntaxError, KeyError, EOFError) as e:
+        logger.warning(f"DOCX extraction failed: {e}")
+        raise ValueError(INVALID_DOCX_MESSAGE)
+    return "\n".join(lines)
+
+
+# ============================================================================
+# DOC (legacy binary Word)
+# ============================================================================
+
+def doc_converters_installed() -> List[str]:
+    return [name for name, command in DOC_CONVERTERS if shutil.which(command[0])]
+
+
+def _convert_doc(name: str, command: List[str], content: bytes) -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            command, input=content, capture_output=True, timeout=DOC_CONVERT_TIMEOUT
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"{name} failed: {e}")
+        return None
+    if completed.returncode != 0:
+        logger.warning(f"{name} exited with {completed.returncode}: {completed.stderr[:200]!r}")
+        return None
+    return completed.stdout.decode("utf-8", errors="replace")
+
+
+def extract_doc_text(content: bytes) -> str:
+    """
+    Text of a legacy .doc file, via antiword or catdoc. A .doc that is
+    really a DOCX goes through extract_docx_text. Raises ValueError when the
+    file cannot be read.
+    """
+    if content.startswith(ZIP_SIGNATURE):
+        return extract_docx_text(content)
+    if not content.startswith(OLE_SIGNATURE):
+        raise ValueError("This .doc file is not a Word document. Please upload a PDF or DOCX file.")
+
+    converters = [(name, command) for name, command in DOC_CONVERTERS if shutil.which(command[0])]
+    if not converters:
+        raise ValueError(
+            "Legacy .doc files cannot be read on this server. Please save the resume as PDF or DOCX and upload it again."
+        )
+    for name, command in converters:
+        text = _convert_doc(name, command, content)
+        if text and text.strip():
+            return text
+    raise ValueError("Could not read this .doc file. Please save the resume as PDF or DOCX and upload it again.")
@@ -0,0 +1,143 @@
+"""
+Content-addressed cache for resume extraction results.
+
+The same resume file is often uploaded to several jobs (or to the global pool).
+Text extraction, OCR and the LLM call only depend on the file bytes, so their
+output is stored once per (file hash, extractor version) and reused on every
+later upload of that file.
+
+Bump EXTRACTOR_VERSION whenever extraction logic changes in a way that should
+invalidate previously cached results.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+EXTRACTOR_VERSION = "2026.10.4"
+
+
+def normalize_extracted_text(text: str) -> str:
+    """Normalize line endings and drop trailing whitespace so equal documents cache equal text."""
+    if not text:
+        return ""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+class MongoExtractionCacheStore:
+    """Stores cache entries in the `extraction_cache` collection."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db.extraction_cache
+
+    async def get(self, content_hash: str, extractor_version: str) -> Optional[dict]:
+        return await self.collection.find_one_and_update(
+            {"content_hash": content_hash, "extractor_version": extractor_version},
+            {"$set": {"last_hit_at": datetime.utcnow()}, "$inc": {"hit_count": 1}}
+        )
+
+    async def put(self, content_hash: str, extractor_version: str, entry: Dict[str, Any]):
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {"content_hash": content_hash, "extractor_version": extractor_version},
+                {
+                    "$set": {**entry, "updated_at": now},
+                    "$setOnInsert": {"created_at": now, "hit_count": 0}
+                },
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Two uploads of the same file raced; the other one already stored it
+            pass
+
+
+class ExtractionCache:
+    """
+    Front for an extraction cache store, with process-local hit/miss counters.
+
+    Cache failures never fail an upload: lookups that error are counted and
+    treated as misses.
+    """
+
+    def __init__(self, extractor_version: str = EXTRACTOR_VERSION):
+        self.extractor_version = extractor_version
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._errors = 0
+
+    def _store(self, db: AsyncIOMotorDatabase) -> MongoExtractionCacheStore:
+        return MongoExtractionCacheStore(db)
+
+    async def get(self, db: AsyncIOMotorDatabase, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Return {"extracted_text", "parsed_candidate_data"} for a cached file, or None."""
+        try:
+            entry = await self._store(db).get(content_hash, self.extractor_version)
+        except Exception as e:
+            self._errors += 1
+            logger.warning("Extraction cache lookup failed for %s: %s", content_hash, e)
+            entry = None
+
+        if not entry:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        return {
+            "extracted_text": entry.get("extracted_text", ""),
+            "parsed_candidate_data": entry.get("parsed_candidate_data", {}),
+        }
+
+    async def put(
+        self,
+        db: AsyncIOMotorDatabase,
+        content_hash: str,
+        extracted_text: str,
+        parsed_candidate_data: Dict[str, Any]
+    ):
+        """
+        Store a successful extraction. Failed extractions, and degraded ones produced
+        while a better tier was unavailable, are not cached so they get retried.
+        """
+        if not extracted_text or parsed_candidate_data.get("extraction_tier", 0) == 0:
+            return
+        if parsed_candidate_data.get("degraded"):
+            return
+        try:
+            await self._store(db).put(content_hash, self.extractor_version, {
+                "extracted_text": extracted_text,
+                "parsed_candidate_data": parsed_candidate_data,
+            })
+            self._writes += 1
+        except Exception as e:
+            self._errors += 1
+            logger.warning("Extraction cache write failed for %s: %s", content_hash, e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "extractor_version": self.extractor_version,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "writes": self._writes,
+            "errors": self._errors,
+        }
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get or create the global ExtractionCache instance."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
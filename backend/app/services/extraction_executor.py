@@ -0,0 +1,382 @@
+"""
+Process pool for CPU-bound resume extraction.
+
+PyMuPDF, pdfplumber and OCR calls burn CPU for seconds at a time. Running them
+directly inside an async handler freezes every other request on the uvicorn
+worker, so upload code submits them here and awaits the result instead.
+
+Untrusted documents can also be parsed with run_sandboxed: each task gets its
+own child process with an address-space limit, which is killed when it runs
+past its timeout. A malformed or adversarial file then costs one child, not
+a pool worker that stays busy (or a pool that breaks) for everyone else.
+
+Usage:
+    executor = get_extraction_executor()
+    text = await executor.run(extract_text_from_bytes, content, filename)
+    document = await executor.run_sandboxed(prepare_document, content, filename, memory_limit_mb=1024)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import summarize_durations
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting sandbox thread checks whether its caller was cancelled
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class ExtractionQueueFullError(RuntimeError):
+    """Raised when more tasks are waiting for a worker than the queue depth allows."""
+
+
+class ExtractionTimeoutError(TimeoutError):
+    """Raised when an extraction task does not finish within its timeout."""
+
+
+class ExtractionAbortedError(RuntimeError):
+    """Raised when a sandboxed task dies: it ran out of its memory budget or crashed."""
+
+
+def _run_timed(fn: Callable, args: tuple, kwargs: dict):
+    """Worker-side wrapper that records when the task actually started running."""
+    started_at = time.time()
+    result = fn(*args, **kwargs)
+    return started_at, time.time(), result
+
+
+# ============================================================================
+# SANDBOX (one killable child process per task)
+# ============================================================================
+
+# Imported once by the fork server, so sandbox children start with the parsers loaded
+SANDBOX_PRELOAD = ["app.services.resume_extractor", "fitz", "pdfplumber", "lxml.etree"]
+
+_sandbox_context = None
+
+
+def _get_sandbox_context():
+    """
+    Fork server where available: children are forked from a small, single
+    threaded server process that has the parsers preloaded, so starting one
+    costs milliseconds. Elsewhere children are spawned (slower, still isolated).
+    """
+    global _sandbox_context
+    if _sandbox_context is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            _sandbox_context = multiprocessing.get_context("forkserver")
+            _sandbox_context.set_forkserver_preload(SANDBOX_PRELOAD)
+        else:
+            _sandbox_context = multiprocessing.get_context("spawn")
+    return _sandbox_context
+
+
+def _sandbox_main(conn, memory_limit_mb: Optional[int], fn: Callable, args: tuple, kwargs: dict):
+    """Child process: apply the memory limit, run the task and send back ("ok" | "error" | "memory", payload)."""
+    try:
+        if memory_limit_mb:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        conn.send(("ok", _run_timed(fn, args, kwargs)))
+    except MemoryError:
+        conn.send(("memory", f"exceeded the {memory_limit_mb} MB memory limit"))
+    except Exception as e:
+        try:
+            conn.send(("error", e))
+        except Exception:
+            # The exception itself does not pickle: send its text
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+    finally:
+        conn.close()
+
+
+def _run_in_sandbox(
+    fn: Callable,
+    args: tuple,
+    kwargs: dict,
+    timeout: float,
+    memory_limit_mb: Optional[int],
+    cancelled: Optional[threading.Event] = None
+):
+    """
+    Run one task in a fresh child (blocking) and return _run_timed's result.
+    Kills the child on timeout, or as soon as `cancelled` is set (returning None).
+    """
+    context = _get_sandbox_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_sandbox_main, args=(sender, memory_limit_mb, fn, args, kwargs), daemon=True
+    )
+    process.start()
+    sender.close()
+    try:
+        # poll() also returns when the child dies without answering (recv then raises EOFError)
+        deadline = time.monotonic() + timeout
+        while not receiver.poll(max(0.0, min(CANCEL_POLL_INTERVAL, deadline - time.monotonic()))):
+            if cancelled is not None and cancelled.is_set():
+                return None
+            if time.monotonic() >= deadline:
+                raise ExtractionTimeoutError(f"Extraction exceeded {timeout}s timeout and was stopped")
+        try:
+            status, payload = receiver.recv()
+        except EOFError:
+            process.join(5)
+            if process.exitcode is not None and process.exitcode < 0:
+                reason = signal.Signals(-process.exitcode).name
+            else:
+                reason = f"exit code {process.exitcode}"
+            raise ExtractionAbortedError(f"Extraction process died ({reason}), likely over its memory budget")
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join(5)
+
+    if status == "memory":
+        raise ExtractionAbortedError(f"Extraction {payload}")
+    if status == "error":
+        raise payload
+    return payload
+
+
+class ExtractionExecutor:
+    """
+    ProcessPoolExecutor wrapper with admission control, timeouts and metrics.
+
+    At most `pool_size` tasks are handed to the pool at once; up to `queue_depth`
+    further callers wait their turn on the event loop, and anything beyond that
+    is rejected with ExtractionQueueFullError so callers can shed load.
+
+    A task that exceeds its timeout is reported as failed, but a running
+    process cannot be interrupted, so its worker stays busy until it finishes.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        task_timeout: Optional[float] = None,
+        metrics_window: int = 500
+    ):
+        self.pool_size = max(1, pool_size or settings.EXTRACTION_POOL_SIZE)
+        self.queue_depth = max(0, queue_depth if queue_depth is not None else settings.EXTRACTION_QUEUE_DEPTH)
+        self.task_timeout = task_timeout or settings.EXTRACTION_TASK_TIMEOUT
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+
+        self._queue_wait = deque(maxlen=metrics_window)
+        self._run_time = deque(maxlen=metrics_window)
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "rejected": 0,
+            "sandboxed": 0,
+            "aborted": 0,
+        }
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Lazily create the pool. Uses spawn so workers never inherit driver threads."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.pool_size,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Extraction pool started with {self.pool_size} workers")
+        return self._pool
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        return self._slots
+
+    def _reset_pool(self):
+        """Drop a broken pool so the next task starts a fresh one."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` in a worker process and return its result.
+
+        `fn` and its arguments must be picklable (module-level functions).
+        """
+        slots = self._get_slots()
+        submitted_at = await self._admit(slots)
+        try:
+            try:
+                future = self._get_pool().submit(_run_timed, fn, args, kwargs)
+            except BrokenProcessPool:
+                self._reset_pool()
+                future = self._get_pool().submit(_run_timed, fn, args, kwargs)
+        except Exception:
+            self._running -= 1
+            slots.release()
+            self._counters["failed"] += 1
+            raise
+
+        def _release(_):
+            # Free the slot only when the process is actually done, even after a timeout
+            self._running -= 1
+            slots.release()
+
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(_release, f))
+
+        try:
+            started_at, finished_at, result = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=timeout or self.task_timeout
+            )
+        except asyncio.TimeoutError:
+            self._counters["timed_out"] += 1
+            logger.warning(f"Extraction task {getattr(fn, '__name__', fn)} timed out")
+            raise ExtractionTimeoutError(
+                f"Extraction exceeded {timeout or self.task_timeout}s timeout"
+            )
+        except BrokenProcessPool:
+            self._counters["failed"] += 1
+            self._reset_pool()
+            raise
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+
+        self._counters["completed"] += 1
+        self._queue_wait.append(max(0.0, started_at - submitted_at))
+        self._run_time.append(max(0.0, finished_at - started_at))
+        return result
+
+    async def _admit(self, slots: asyncio.Semaphore) -> float:
+        """Wait for a slot (or reject when the queue is full); returns the submit time."""
+        if slots.locked() and self._waiting >= self.queue_depth:
+            self._counters["rejected"] += 1
+            raise ExtractionQueueFullError(
+                f"Extraction queue is full ({self._waiting} waiting, {self._running} running)"
+            )
+
+        submitted_at = time.time()
+        self._counters["submitted"] += 1
+        self._waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        return submitted_at
+
+    async def run_sandboxed(
+        self,
+        fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run `fn(*args, **kwargs)` in its own child process and return its result.
+
+        Shares the pool's slots and queue, so sandboxed and pooled tasks
+        together never exceed `pool_size`. The child is killed when it exceeds
+        `timeout` (ExtractionTimeoutError) and dies if it allocates more than
+        `memory_limit_mb` of address space (ExtractionAbortedError). If the
+        caller is cancelled the child is killed, and the slot is freed once it
+        has exited.
+        """
+        slots = self._get_slots()
+        submitted_at = await self._admit(slots)
+        timeout = timeout or self.task_timeout
+        self._counters["sandboxed"] += 1
+        cancelled = threading.Event()
+        task = asyncio.ensure_future(asyncio.to_thread(
+            _run_in_sandbox, fn, args, kwargs, timeout, memory_limit_mb, cancelled
+        ))
+
+        def _release(finished: asyncio.Future):
+            # Free the slot only when the sandbox thread is done and its child reaped
+            self._running -= 1
+            slots.release()
+            if not finished.cancelled():
+                finished.exception()  # retrieved here in case the caller was cancelled
+
+        task.add_done_callback(_release)
+
+        try:
+            started_at, finished_at, result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        except ExtractionTimeoutError:
+            self._counters["timed_out"] += 1
+            logger.warning(f"Sandboxed extraction task {getattr(fn, '__name__', fn)} timed out and was killed")
+            raise
+        except ExtractionAbortedError as e:
+            self._counters["aborted"] += 1
+            logger.warning(f"Sandboxed extraction task {getattr(fn, '__name__', fn)} aborted: {e}")
+            raise
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+
+        self._counters["completed"] += 1
+        self._queue_wait.append(max(0.0, started_at - submitted_at))
+        self._run_time.append(max(0.0, finished_at - started_at))
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of pool configuration, counters and queue-wait vs. run-time stats."""
+        return {
+            "pool_size": self.pool_size,
+            "queue_depth": self.queue_depth,
+            "task_timeout_seconds": self.task_timeout,
+            "running": self._running,
+            "waiting": self._waiting,
+            **self._counters,
+            "queue_wait": summarize_durations(self._queue_wait),
+            "run_time": summarize_durations(self._run_time),
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("Extraction pool stopped")
+
+
+# ============================================================================
+# CONVENIENCE FUNCTIONS
+# ============================================================================
+
+# Global singleton instance
+_extraction_executor = None
+
+def get_extraction_executor() -> ExtractionExecutor:
+    """Get or create the global ExtractionExecutor instance."""
+    global _extraction_executor
+    if _extraction_executor is None:
+        _extraction_executor = ExtractionExecutor()
+    return _extraction_executor
+
+
+def shutdown_extraction_executor():
+    """Stop the worker processes (called on application shutdown)."""
+    global _extraction_executor
+    if _extraction_executor is not None:
+        _extraction_executor.shutdown()
+        _extraction_executor = None
@@ -0,0 +1,233 @@
+"""
+Durable, Mongo-backed queue for resume ingestion.
+
+The upload endpoint stores the file in GridFS and inserts an `ingest_jobs`
+document; ingestion workers (`python -m app.workers.ingest`) claim jobs with
+a time-limited lease, so a job whose worker dies is picked up again once the
+lease expires.
+
+Job lifecycle: queued -> running -> done | failed (running -> queued on a
+retryable error while attempts remain).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket
+
+from app.core.config import settings
+
+INGEST_FILES_BUCKET = "ingest_files"
+
+ACTIVE_STATUSES = ["queued", "running"]
+FINISHED_STATUSES = ["done", "failed"]
+
+
+def _get_bucket(db: AsyncIOMotorDatabase) -> AsyncIOMotorGridFSBucket:
+    return AsyncIOMotorGridFSBucket(db, bucket_name=INGEST_FILES_BUCKET)
+
+
+def serialize_ingest_job(ingest_job: dict) -> Dict[str, Any]:
+    """Public, JSON-safe view of an ingest job (no GridFS internals)."""
+    created_at = ingest_job.get("created_at")
+    updated_at = ingest_job.get("updated_at")
+    return {
+        "ingest_id": str(ingest_job["_id"]),
+        "status": ingest_job.get("status"),
+        "filename": ingest_job.get("filename"),
+        "job_id": ingest_job.get("job_id"),
+        "attempts": ingest_job.get("attempts", 0),
+        "application_id": ingest_job.get("application_id"),
+        "error": ingest_job.get("error"),
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None,
+    }
+
+
+async def enqueue_ingest_job(
+    db: AsyncIOMotorDatabase,
+    file_content: Optional[bytes],
+    filename: str,
+    job_id: Optional[str],
+    uploaded_by: str,
+    file_hash: str,
+    extra: Optional[Dict[str, Any]] = None,
+    file_path: Optional[str] = None
+) -> str:
+    """
+    Store the file and queue it for ingestion. Returns the ingest job id.
+    A spooled upload (`file_path`) is streamed into GridFS from disk.
+    """
+    metadata = {"job_id": job_id, "uploaded_by": uploaded_by, "file_hash": file_hash}
+    if file_path:
+        with open(file_path, "rb") as source:
+            file_id = await _get_bucket(db).upload_from_stream(filename, source, metadata=metadata)
+    else:
+        file_id = await _get_bucket(db).upload_from_stream(filename, file_content, metadata=metadata)
+
+    now = datetime.utcnow()
+    ingest_doc = {
+        "status": "queued",
+        "file_id": file_id,
+        "filename": filename,
+        "file_hash": file_hash,
+        "job_id": job_id,
+        "uploaded_by": uploaded_by,
+        "attempts": 0,
+        "max_attempts": settings.INGEST_MAX_ATTEMPTS,
+        "worker_id": None,
+        "lease_expires_at": None,
+        "application_id": None,
+        "error": None,
+        "notified": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+    if extra:
+        ingest_doc.update(extra)
+
+    result = await db.ingest_jobs.insert_one(ingest_doc)
+    return str(result.inserted_id)
+
+
+async def find_active_ingest_job(db: AsyncIOMotorDatabase, job_id: Optional[str], file_hash: str) -> Optional[dict]:
+    """Find a queued/running ingest job for the same file and job posting."""
+    return await db.ingest_jobs.find_one({
+        "job_id": job_id,
+        "file_hash": file_hash,
+        "status": {"$in": ACTIVE_STATUSES}
+    })
+
+
+async def claim_ingest_job(db: AsyncIOMotorDatabase, worker_id: str) -> Optional[dict]:
+    """
+    Atomically claim the oldest queued job, or a running job whose lease expired.
+    """
+    now = datetime.utcnow()
+    return await db.ingest_jobs.find_one_and_update(
+        {
+            "$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_expires_at": {"$lt": now}}
+            ]
+        },
+        {
+            "$set": {
+                "status": "running",
+                "worker_id": worker_id,
+                "lease_expires_at": now + timedelta(seconds=settings.INGEST_LEASE_SECONDS),
+                "updated_at": now
+            },
+            "$inc": {"attempts": 1}
+        },
+        sort=[("created_at", 1)],
+        return_document=True
+    )
+
+
+async def renew_lease(db: AsyncIOMotorDatabase, ingest_id: ObjectId, worker_id: str) -> bool:
+    """Extend the lease while still owning the job. Returns False if the lease was lost."""
+    now = datetime.utcnow()
+    result = await db.ingest_jobs.update_one(
+        {"_id": ingest_id, "worker_id": worker_id, "status": "running"},
+        {"$set": {
+            "lease_expires_at": now + timedelta(seconds=settings.INGEST_LEASE_SECONDS),
+            "updated_at": now
+        }}
+    )
+    return result.modified_count == 1
+
+
+async def keep_lease_alive(db: AsyncIOMotorDatabase, ingest_id: ObjectId, worker_id: str):
+    """Background heartbeat renewing the lease until cancelled."""
+    interval = max(1, settings.INGEST_LEASE_SECONDS // 3)
+    while True:
+        await asyncio.sleep(interval)
+        if not await renew_lease(db, ingest_id, worker_id):
+            print(f"[Ingest] Lost lease on {ingest_id}")
+            return
+
+
+async def load_ingest_file(db: AsyncIOMotorDatabase, file_id) -> bytes:
+    """Read the stored upload back from GridFS."""
+    stream = await _get_bucket(db).open_download_stream(file_id)
+    return await stream.read()
+
+
+async def delete_ingest_file(db: AsyncIOMotorDatabase, file_id):
+    try:
+        await _get_bucket(db).delete(file_id)
+    except Exception as e:
+        print(f"Warning: Failed to delete ingest file {file_id}: {e}")
+
+
+async def complete_ingest_job(db: AsyncIOMotorDatabase, ingest_job: dict, worker_id: str, application_id: str):
+    """Mark a job done and drop its stored file."""
+    result = await db.ingest_jobs.update_one(
+        {"_id": ingest_job["_id"], "worker_id": worker_id},
+        {"$set": {
+            "status": "done",
+            "application_id": application_id,
+            "error": None,
+            "lease_expires_at": None,
+            "updated_at": datetime.utcnow()
+        }}
+    )
+    if result.modified_count:
+        await delete_ingest_file(db, ingest_job["file_id"])
+
+
+async def fail_ingest_job(
+    db: AsyncIOMotorDatabase,
+    ingest_job: dict,
+    worker_id: str,
+    error: str,
+    retryable: bool = True
+):
+    """Requeue the job if attempts remain and the error is retryable, otherwise fail it."""
+    attempts = ingest_job.get("attempts", 0)
+    max_attempts = ingest_job.get("max_attempts", settings.INGEST_MAX_ATTEMPTS)
+    final = not retryable or attempts >= max_attempts
+
+    result = await db.ingest_jobs.update_one(
+        {"_id": ingest_job["_id"], "worker_id": worker_id},
+        {"$set": {
+            "status": "failed" if final else "queued",
+            "error": error,
+            "lease_expires_at": None,
+            "updated_at": datetime.utcnow()
+        }}
+    )
+    if final and result.modified_count:
+        await delete_ingest_file(db, ingest_job["file_id"])
+
+
+async def relay_ingest_events():
+    """
+    Background task for API processes: forward finished ingest jobs to the
+    uploader over Socket.IO. Workers run in separate processes without client
+    connections, so completion is relayed from the job documents.
+    """
+    from app.db.mongodb import get_db
+    from app.services.socket_manager import emit_ingest_status
+
+    print("Ingest Event Relay Started...")
+
+    while True:
+        try:
+            db = get_db()
+            while db is not None:
+                # Claim each notification atomically so multiple API workers never double-emit
+                ingest_job = await db.ingest_jobs.find_one_and_update(
+                    {"status": {"$in": FINISHED_STATUSES}, "notified": False},
+                    {"$set": {"notified": True}}
+                )
+                if not ingest_job:
+                    break
+                await emit_ingest_status(ingest_job.get("uploaded_by"), serialize_ingest_job(ingest_job))
+        except Exception as e:
+            print(f"Ingest Relay Error: {str(e)}")
+
+        await asyncio.sleep(settings.INGEST_POLL_INTERVAL)
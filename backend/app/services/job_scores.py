@@ -0,0 +1,170 @@
+"""
+Candidate-job scores stored in their own `job_scores` collection.
+
+One document per (application, job) pair replaces the `global_job_scores`
+array that used to be embedded in every application. Top-K candidates for a
+job is then an indexed range scan on (job_id, final_score desc), and
+application documents no longer grow with every new job.
+
+Reads fall back to a legacy embedded `global_job_scores` array for
+applications that have not been backfilled yet.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteMany, ReplaceOne
+
+# Application fields returned alongside a candidate's score in ranked lists
+CANDIDATE_SUMMARY_PROJECTION = {
+    "candidate_name_extracted": 1, "candidate_email": 1, "candidate_phone": 1,
+    "candidate_skills": 1, "candidate_experience_years": 1, "candidate_education": 1,
+    "profile_image_url": 1, "profile_thumbnail_urls": 1, "resume_preview_url": 1, "job_id": 1, "job_title": 1, "status": 1, "applied_at": 1,
+}
+
+
+def build_job_score_doc(application_id: str, job: dict, job_score: Dict[str, Any], scored_at: datetime) -> Dict[str, Any]:
+    """The `job_scores` document for one application scored against one job."""
+    return {
+        "application_id": str(application_id),
+        "job_id": str(job["_id"]),
+        "job_title": job.get("title"),
+        "final_score": job_score.get("final_score", 0.0),
+        "skill_score": job_score.get("skill_score", 0.0),
+        "experience_score": job_score.get("experience_score", 0.0),
+        "education_score": job_score.get("education_score", 0.0),
+        "skill_coverage": job_score.get("skill_coverage", 0.0),
+        "matched_skills": job_score.get("matched_skills", []),
+        "missing_skills": job_score.get("missing_skills", []),
+        "scored_at": scored_at,
+    }
+
+
+def to_global_score_entry(score_doc: dict) -> Dict[str, Any]:
+    """Shape a `job_scores` document like an entry of the old `global_job_scores` array (API compatibility)."""
+    return {
+        "job_id": score_doc.get("job_id"),
+        "job_title": score_doc.get("job_title"),
+        "final_score": score_doc.get("final_score", 0.0),
+        "skill_score": score_doc.get("skill_score", 0.0),
+        "experience_score": score_doc.get("experience_score", 0.0),
+        "education_score": score_doc.get("education_score", 0.0),
+        "matched_skills": score_doc.get("matched_skills", []),
+        "status": "applied",
+        "applied_at": score_doc.get("scored_at"),
+    }
+
+
+def score_upsert(score_doc: dict) -> ReplaceOne:
+    """Bulk-write operation replacing the stored score for this (application, job) pair."""
+    return ReplaceOne(
+        {"application_id": score_doc["application_id"], "job_id": score_doc["job_id"]},
+        score_doc,
+        upsert=True
+    )
+
+
+async def write_job_scores(db: AsyncIOMotorDatabase, score_docs: List[dict]):
+    """Upsert score documents in one unordered bulk write."""
+    if score_docs:
+        await db.job_scores.bulk_write([score_upsert(doc) for doc in score_docs], ordered=False)
+
+
+async def replace_application_scores(
+    db: AsyncIOMotorDatabase,
+    application_id: str,
+    scored_jobs: Iterable[Tuple[dict, Dict[str, Any]]],
+    scored_at: Optional[datetime] = None,
+    touch_application: bool = True
+) -> List[dict]:
+    """
+    Store an application's scores against a set of jobs, dropping any it had
+    for other jobs, and stamp `scores_updated_at` on the application (unless
+    the caller already stored it). Returns the written score documents.
+    """
+    scored_at = scored_at or datetime.utcnow()
+    score_docs = [build_job_score_doc(application_id, job, job_score, scored_at) for job, job_score in scored_jobs]
+    job_ids = [doc["job_id"] for doc in score_docs]
+
+    operations = [DeleteMany({"application_id": str(application_id), "job_id": {"$nin": job_ids}})]
+    operations.extend(score_upsert(doc) for doc in score_docs)
+    await db.job_scores.bulk_write(operations, ordered=True)
+
+    if touch_application:
+        await db.applications.update_one(
+            {"_id": ObjectId(application_id)},
+            {"$set": {"scores_updated_at": scored_at}}
+        )
+    return score_docs
+
+
+async def delete_scores_for_job(db: AsyncIOMotorDatabase, job_id: str) -> int:
+    result = await db.job_scores.delete_many({"job_id": str(job_id)})
+    return result.deleted_count
+
+
+async def delete_scores_for_applications(db: AsyncIOMotorDatabase, application_ids: List[str]) -> int:
+    if not application_ids:
+        return 0
+    result = await db.job_scores.delete_many({"application_id": {"$in": [str(a) for a in application_ids]}})
+    return result.deleted_count
+
+
+async def get_job_score(db: AsyncIOMotorDatabase, application: dict, job_id: str) -> Optional[Dict[str, Any]]:
+    """An application's score for one job, in `global_job_scores` entry shape."""
+    score_doc = await db.job_scores.find_one({"application_id": str(application["_id"]), "job_id": job_id})
+    if score_doc:
+        return to_global_score_entry(score_doc)
+
+    legacy_scores = application.get("global_job_scores") or []
+    return next((score for score in legacy_scores if score.get("job_id") == job_id), None)
+
+
+async def attach_global_job_scores(db: AsyncIOMotorDatabase, applications: List[dict]):
+    """
+    Fill `global_job_scores` on a page of applications from the `job_scores`
+    collection with one query, keeping the response shape the UI expects.
+    """
+    if not applications:
+        return
+
+    by_application: Dict[str, List[dict]] = {}
+    cursor = db.job_scores.find(
+        {"application_id": {"$in": [str(app["_id"]) for app in applications]}},
+        {"_id": 0, "missing_skills": 0}
+    ).sort("final_score", -1)
+    async for score_doc in cursor:
+        by_application.setdefault(score_doc["application_id"], []).append(to_global_score_entry(score_doc))
+
+    for app in applications:
+        scores = by_application.get(str(app["_id"]))
+        if scores is not None:
+            app["global_job_scores"] = scores
+        elif app.get("global_job_scores") is None:
+            app["global_job_scores"] = []
+
+
+async def get_top_candidates(db: AsyncIOMotorDatabase, job_id: str, skip: int = 0, limit: int = 20) -> Dict[str, Any]:
+    """Highest-scoring applications for a job, paginated, served from the (job_id, final_score) index."""
+    total = await db.job_scores.count_documents({"job_id": job_id})
+    score_docs = await db.job_scores.find(
+        {"job_id": job_id},
+        {"_id": 0}
+    ).sort([("final_score", -1), ("application_id", 1)]).skip(skip).limit(limit).to_list(length=limit)
+
+    app_ids = [ObjectId(doc["application_id"]) for doc in score_docs if ObjectId.is_valid(doc["application_id"])]
+    applications = {}
+    async for app in db.applications.find({"_id": {"$in": app_ids}}, CANDIDATE_SUMMARY_PROJECTION):
+        app["_id"] = str(app["_id"])
+        applications[app["_id"]] = app
+
+    items = []
+    for rank, score_doc in enumerate(score_docs, start=skip + 1):
+        application = applications.get(score_doc["application_id"])
+        if application is None:
+            continue
+        items.append({"rank": rank, **score_doc, "application": application})
+
+    return {"items": items, "total": total, "skip": skip, "limit": limit}
@@ -3,60 +3,37 @@ LLM-based Resume and JD extraction service using HuggingFace Mistral-7B.
 Falls back to regex extraction if LLM fails.
 """
 
-import os
 import re
 import json
 import logging
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.services.llm_gateway import get_llm_gateway
+from app.services.skill_matcher import get_skill_matcher
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# LLM initialization
-_llm_model = None
-_llm_available = False
-
 
-def get_llm():
-    """Lazy-load the HuggingFace LLM model."""
-    global _llm_model, _llm_available
-    
-    if _llm_model is not None:
-        return _llm_model
-    
-    try:
-        from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
-        
-        api_token = os.getenv("HUGGINGFACEHUB_API_TOKEN", "")
-        if not api_token:
-            logger.warning("HUGGINGFACEHUB_API_TOKEN not set. LLM extraction disabled.")
-            _llm_available = False
-            return None
-        
-        _llm_model = ChatHuggingFace(
-            llm=HuggingFaceEndpoint(
-                repo_id="mistralai/Mistral-7B-Instruct-v0.2",
-                task="conversational",
-                huggingfacehub_api_token=api_token
-            )
-        )
-        _llm_available = True
-        logger.info("HuggingFace LLM model loaded successfully.")
-        return _llm_model
-    except Exception as e:
-        logger.error(f"Failed to load HuggingFace LLM: {e}")
-        _llm_available = False
-        return None
+def is_llm_available() -> bool:
+    """Check if the HuggingFace LLM is configured."""
+    return get_llm_gateway().is_configured("huggingface")
 
 
-def is_llm_available() -> bool:
-    """Check if LLM is available."""
-    global _llm_available
-    if _llm_model is None:
-        get_llm()
-    return _llm_available
+async def _invoke_llm(prompt: str, tier: str) -> str:
+    """Send a single-turn prompt to Mistral-7B through the shared LLM gateway."""
+    response = await get_llm_gateway().chat(
+        "huggingface",
+        messages=[{"role": "user", "content": prompt}],
+        model=settings.HF_MODEL,
+        tier=tier,
+        temperature=0.1,
+        max_tokens=1024
+    )
+    return response.content
 
 
 class LLMResumeExtractor:
@@ -102,30 +79,25 @@ Output JSON:
         "terraform", "ansible", "prometheus", "grafana"
     }
     
-    def __init__(self):
-        self.llm = get_llm()
-    
-    def extract_resume_data(self, resume_text: str) -> Dict[str, Any]:
+    async def extract_resume_data(self, resume_text: str) -> Dict[str, Any]:
         """
         Extract structured data from resume text.
         Uses LLM as primary method, falls back to regex if LLM fails.
         """
-        print(resume_text)  # Debug: print first 500 chars of resume text
-        if self.llm and is_llm_available():
+        if is_llm_available():
             try:
-                return self._extract_with_llm(resume_text)
+                return await self._extract_with_llm(resume_text)
             except Exception as e:
                 logger.warning(f"LLM extraction failed, using fallback: {e}")
         
         return self._extract_with_regex(resume_text)
     
-    def _extract_with_llm(self, resume_text: str) -> Dict[str, Any]:
+    async def _extract_with_llm(self, resume_text: str) -> Dict[str, Any]:
         """Extract resume data using LLM."""
         prompt = self.RESUME_EXTRACTION_PROMPT.format(resume_text=resume_text[:4000])
         
         try:
-            response = self.llm.invoke(prompt)
-            response_text = response.content if hasattr(response, 'content') else str(response)
+            response_text = await _invoke_llm(prompt, tier="tier2")
             
             # Clean response - remove markdown formatting if present
             response_text = response_text.strip()
@@ -373,8 +345,9 @@ Output JSON:
         
         # 6. Skills extraction
         found_skills = []
+        skills_in_text = get_skill_matcher(self.TECHNICAL_SKILLS).matched(text)
         for skill in self.TECHNICAL_SKILLS:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
+            if skill in skills_in_text:
                 found_skills.append(skill.title())
         
         # 7. Education extraction - extract actual degree names
@@ -440,26 +413,22 @@ Output JSON:
     
     TECHNICAL_SKILLS = LLMResumeExtractor.TECHNICAL_SKILLS
     
-    def __init__(self):
-        self.llm = get_llm()
-    
-    def extract_jd_data(self, jd_text: str) -> Dict[str, Any]:
+    async def extract_jd_data(self, jd_text: str) -> Dict[str, Any]:
         """Extract structured data from job description."""
-        if self.llm and is_llm_available():
+        if is_llm_available():
             try:
-                return self._extract_with_llm(jd_text)
+                return await self._extract_with_llm(jd_text)
             except Exception as e:
                 logger.warning(f"LLM JD extraction failed, using fallback: {e}")
         
         return self._extract_with_regex(jd_text)
     
-    def _extract_with_llm(self, jd_text: str) -> Dict[str, Any]:
+    async def _extract_with_llm(self, jd_text: str) -> Dict[str, Any]:
         """Extract JD data using LLM."""
         prompt = self.JD_EXTRACTION_PROMPT.format(jd_text=jd_text[:4000])
         
         try:
-            response = self.llm.invoke(prompt)
-            response_text = response.content if hasattr(response, 'content') else str(response)
+            response_text = await _invoke_llm(prompt, tier="jd")
             
             # Clean response
             response_text = response_text.strip()
@@ -506,8 +475,9 @@ Output JSON:
         
         # Skills
         found_skills = []
+        skills_in_text = get_skill_matcher(self.TECHNICAL_SKILLS).matched(text)
         for skill in self.TECHNICAL_SKILLS:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
+            if skill in skills_in_text:
                 found_skills.append(skill)
         
         return {
@@ -0,0 +1,274 @@
+"""
+Shared async gateway for LLM chat-completion calls (Groq and HuggingFace).
+
+Both providers expose an OpenAI-compatible `/chat/completions` endpoint, so a
+single pooled httpx.AsyncClient serves every extraction tier without blocking
+the event loop. A global semaphore caps in-flight LLM calls per process, and
+transient failures (timeouts, connection errors, 429 and 5xx) are retried a
+bounded number of times with jittered exponential backoff.
+
+Point GROQ_API_BASE / HF_API_BASE at `scripts/llm_stub_server.py` to exercise
+the extraction pipeline without real API keys or network access.
+
+Usage:
+    gateway = get_llm_gateway()
+    response = await gateway.chat("groq", messages, model="llama-3.1-8b-instant", tier="tier1")
+    text = response.content
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import summarize_durations
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class LLMGatewayError(RuntimeError):
+    """Raised when an LLM call fails after all retries, or the provider is not configured."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class LLMResponse:
+    content: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    attempts: int = 1
+
+
+@dataclass
+class _TierStats:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=500))
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class LLMGateway:
+    """
+    Pooled, rate-limited client for OpenAI-compatible chat completions.
+
+    Metrics are kept per tier label (e.g. "tier1", "tier2") so the cost and
+    latency of each extraction tier can be compared.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None
+    ):
+        self.max_concurrency = max(1, max_concurrency or settings.LLM_MAX_CONCURRENCY)
+        self.timeout = timeout or settings.LLM_TIMEOUT
+        self.max_retries = max(0, max_retries if max_retries is not None else settings.LLM_MAX_RETRIES)
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._stats: Dict[str, _TierStats] = {}
+
+    def _providers(self) -> Dict[str, Dict[str, str]]:
+        return {
+            "groq": {"base_url": settings.GROQ_API_BASE, "api_key": settings.GROQ_API_KEY},
+            "huggingface": {"base_url": settings.HF_API_BASE, "api_key": settings.HUGGINGFACEHUB_API_TOKEN},
+        }
+
+    def is_configured(self, provider: str) -> bool:
+        config = self._providers().get(provider)
+        return bool(config and config["api_key"] and config["base_url"])
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(10.0, self.timeout)),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                )
+            )
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _tier_stats(self, tier: str) -> _TierStats:
+        if tier not in self._stats:
+            self._stats[tier] = _TierStats()
+        return self._stats[tier]
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        retry_after = _retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, settings.LLM_RETRY_MAX_DELAY)
+        # Full jitter: spread retries from many uploads instead of hitting the provider in lockstep
+        ceiling = min(settings.LLM_RETRY_MAX_DELAY, settings.LLM_RETRY_BASE_DELAY * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def chat(
+        self,
+        provider: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        tier: str,
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> LLMResponse:
+        """
+        Send a chat-completion request and return the first choice's content.
+
+        Raises LLMGatewayError when the provider is not configured, returns a
+        non-retryable error, or keeps failing after `max_retries` retries.
+        """
+        config = self._providers().get(provider)
+        if not config or not self.is_configured(provider):
+            raise LLMGatewayError(f"LLM provider '{provider}' is not configured")
+
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": False,
+        }
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        if response_format:
+            payload["response_format"] = response_format
+
+        url = f"{config['base_url'].rstrip('/')}/chat/completions"
+        headers = {"Authorization": f"Bearer {config['api_key']}"}
+        stats = self._tier_stats(tier)
+        stats.calls += 1
+        started = time.perf_counter()
+
+        attempt = 0
+        while True:
+            response = None
+            try:
+                async with self._get_semaphore():
+                    self._in_flight += 1
+                    try:
+                        response = await self._get_client().post(
+                            url,
+                            json=payload,
+                            headers=headers,
+                            timeout=timeout or self.timeout
+                        )
+                    finally:
+                        self._in_flight -= 1
+
+                if response.status_code == 200:
+                    data = response.json()
+                    usage = data.get("usage") or {}
+                    result = LLMResponse(
+                        content=data["choices"][0]["message"]["content"] or "",
+                        model=data.get("model", model),
+                        prompt_tokens=int(usage.get("prompt_tokens") or 0),
+                        completion_tokens=int(usage.get("completion_tokens") or 0),
+                        latency=time.perf_counter() - started,
+                        attempts=attempt + 1
+                    )
+                    stats.prompt_tokens += result.prompt_tokens
+                    stats.completion_tokens += result.completion_tokens
+                    stats.latencies.append(result.latency)
+                    return result
+
+                error = LLMGatewayError(
+                    f"{provider} returned HTTP {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code
+                )
+                retryable = response.status_code in RETRYABLE_STATUS_CODES
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                error = LLMGatewayError(f"{provider} request failed: {type(e).__name__}: {e}")
+                retryable = True
+            except (KeyError, IndexError, ValueError) as e:
+                error = LLMGatewayError(f"{provider} returned a malformed response: {e}")
+                retryable = False
+
+            if not retryable or attempt >= self.max_retries:
+                stats.errors += 1
+                stats.latencies.append(time.perf_counter() - started)
+                raise error
+
+            delay = self._backoff(attempt, response)
+            attempt += 1
+            stats.retries += 1
+            logger.warning(f"LLM {tier} call failed ({error}); retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "config": {
+                "max_concurrency": self.max_concurrency,
+                "timeout_seconds": self.timeout,
+                "max_retries": self.max_retries,
+                "providers": {name: self.is_configured(name) for name in self._providers()},
+            },
+            "in_flight": self._in_flight,
+            "tiers": {
+                tier: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "prompt_tokens": stats.prompt_tokens,
+                    "completion_tokens": stats.completion_tokens,
+                    "latency": summarize_durations(stats.latencies),
+                }
+                for tier, stats in self._stats.items()
+            },
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_llm_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get or create the global LLMGateway instance."""
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway()
+    return _llm_gateway
+
+
+async def close_llm_gateway():
+    """Close the pooled HTTP client (called on application shutdown)."""
+    global _llm_gateway
+    if _llm_gateway is not None:
+        await _llm_gateway.close()
+        _llm_gateway = None
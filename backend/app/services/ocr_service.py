@@ -0,0 +1,351 @@
+"""
+Shared OCR service.
+
+OCR models are expensive: an EasyOCR reader takes seconds and hundreds of MB
+to load. Instead of building a reader per import, per module or per upload,
+a small pool of long-lived worker processes loads the engine once (in the
+pool initializer) and then recognizes page images sent to it.
+
+This is the only OCR path in the backend. Importing this module is cheap:
+nothing OCR-related is imported in the API process.
+
+Usage:
+    service = get_ocr_service()
+    text = await service.recognize_async([png_bytes, ...])   # API process
+    text = service.recognize([png_bytes, ...])               # scripts / sync code
+"""
+
+import asyncio
+import importlib.util
+import io
+import logging
+import multiprocessing
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("easyocr", "tesseract")
+
+
+class OCRUnavailableError(RuntimeError):
+    """Raised in a worker when no OCR engine could be loaded."""
+
+
+def ocr_engines_installed() -> List[str]:
+    """OCR engines that look installed, checked without importing them."""
+    engines = []
+    if importlib.util.find_spec("easyocr") is not None:
+        engines.append("easyocr")
+    if importlib.util.find_spec("pytesseract") is not None and shutil.which("tesseract"):
+        engines.append("tesseract")
+    return engines
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+
+_worker_engine: Optional[str] = None
+_worker_reader = None
+_worker_load_seconds = 0.0
+_worker_errors: List[str] = []
+
+
+def _init_ocr_worker(preference: str):
+    """
+    Pool initializer: load the first usable engine once per worker process.
+    Never raises, since a failing initializer breaks the whole pool; workers
+    without an engine answer every task with OCRUnavailableError instead.
+    """
+    global _worker_engine, _worker_reader, _worker_load_seconds
+    candidates = [preference] if preference in ENGINES else list(ENGINES)
+    started = time.time()
+    for engine in candidates:
+        try:
+            if engine == "easyocr":
+                import easyocr
+                _worker_reader = easyocr.Reader(['en'], gpu=False)
+            else:
+                import pytesseract  # noqa: F401
+                if not shutil.which("tesseract"):
+                    raise RuntimeError("tesseract binary not found in PATH")
+            _worker_engine = engine
+            break
+        except Exception as e:
+            _worker_errors.append(f"{engine}: {type(e).__name__}: {e}")
+    _worker_load_seconds = time.time() - started
+
+
+def _worker_info() -> Dict[str, Any]:
+    """Which engine this worker loaded, and how long it took."""
+    return {
+        "engine": _worker_engine,
+        "load_seconds": round(_worker_load_seconds, 3),
+        "errors": list(_worker_errors),
+    }
+
+
+def _recognize_image(image_bytes: bytes) -> Tuple[str, Dict[str, Any]]:
+    """OCR one encoded image (PNG/JPEG/...) with the worker's engine. Returns (text, worker info)."""
+    if _worker_engine is None:
+        raise OCRUnavailableError("; ".join(_worker_errors) or "no OCR engine loaded")
+
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_bytes))
+    if _worker_engine == "easyocr":
+        import numpy as np
+        results = _worker_reader.readtext(np.array(image.convert("RGB")), detail=0, paragraph=True)
+        return "\n".join(results), _worker_info()
+
+    import pytesseract
+    return pytesseract.image_to_string(image), _worker_info()
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class OCRService:
+    """
+    Pool of OCR worker processes with a warm engine.
+
+    Pages are submitted one task each, so a multi-page scan is spread over
+    all workers, and callers can stop early once enough text is recognized.
+
+    States: "cold" (no workers yet), "warming" (workers are loading the
+    engine), "ready", and "unavailable" (no engine could be loaded, or none
+    is installed).
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        engine: Optional[str] = None,
+        task_timeout: Optional[float] = None
+    ):
+        self.pool_size = max(1, pool_size or settings.OCR_POOL_SIZE)
+        self.engine_preference = (engine or settings.OCR_ENGINE).lower()
+        self.task_timeout = task_timeout or settings.OCR_TASK_TIMEOUT
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()  # pages are submitted from worker threads
+        self._state = "cold"
+        self._worker_info: Optional[Dict[str, Any]] = None
+        self._started_at: Optional[float] = None
+        self._ready_at: Optional[float] = None
+        self._counters = {
+            "requests": 0,
+            "pages": 0,
+            "pages_skipped": 0,
+            "page_errors": 0,
+            "timed_out": 0,
+            "pool_restarts": 0,
+        }
+        self._ocr_seconds = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Lazily start the workers. Uses spawn so workers never inherit driver threads."""
+        with self._pool_lock:
+            if self._pool is None:
+                if not ocr_engines_installed():
+                    self._state = "unavailable"
+                    raise OCRUnavailableError("No OCR engine installed (easyocr, or pytesseract + tesseract)")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.pool_size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_ocr_worker,
+                    initargs=(self.engine_preference,)
+                )
+                self._state = "warming"
+                self._started_at = time.time()
+                logger.info(f"OCR pool started with {self.pool_size} workers (engine: {self.engine_preference})")
+            return self._pool
+
+    def _reset_pool(self):
+        """Drop a broken pool so the next request starts a fresh one."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._state = "cold"
+            self._counters["pool_restarts"] += 1
+
+    def _submit(self, fn, *args):
+        try:
+            return self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            self._reset_pool()
+            return self._get_pool().submit(fn, *args)
+
+    def _record_worker_info(self, info: Dict[str, Any]):
+        self._worker_info = info
+        if info.get("engine"):
+            if self._state != "ready":
+                self._state = "ready"
+                self._ready_at = time.time()
+                logger.info(f"OCR engine {info['engine']} loaded in {info['load_seconds']}s")
+        else:
+            self._state = "unavailable"
+            logger.warning(f"OCR workers could not load an engine: {info.get('errors')}")
+
+    def _page_result(self, future, page_number: int) -> Optional[str]:
+        """Text of one finished page task; failures are logged and counted, never raised."""
+        try:
+            text, info = future.result(timeout=0)
+            if self._state != "ready":
+                self._record_worker_info(info)
+            return text
+        except OCRUnavailableError as e:
+            self._state = "unavailable"
+            logger.warning(f"OCR unavailable: {e}")
+        except BrokenProcessPool:
+            self._reset_pool()
+        except (FutureTimeoutError, CancelledError):
+            future.cancel()
+        except Exception as e:
+            logger.warning(f"OCR failed on page {page_number}: {e}")
+        self._counters["page_errors"] += 1
+        return None
+
+    def recognize_pages(
+        self,
+        images: List[bytes],
+        stop_after_chars: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[Optional[str]]:
+        """
+        OCR encoded page images (blocking) and return one text per page.
+
+        At most `pool_size` pages are in flight, so with `stop_after_chars`
+        no further pages are started once that much text has been
+        recognized; pages that were never OCR'd (skipped, failed or timed
+        out) are None.
+        """
+        results: List[Optional[str]] = [None] * len(images)
+        if not images:
+            return results
+        self._counters["requests"] += 1
+        started = time.time()
+        deadline = started + (timeout or self.task_timeout)
+        running = {}
+        next_page = 0
+        collected = 0
+
+        while next_page < len(images) or running:
+            enough = bool(stop_after_chars) and collected >= stop_after_chars
+            while next_page < len(images) and len(running) < self.pool_size and not enough:
+                try:
+                    running[self._submit(_recognize_image, images[next_page])] = next_page
+                except OCRUnavailableError as e:
+                    logger.warning(f"OCR skipped: {e}")
+                    return results
+                next_page += 1
+            if not running:
+                break
+
+            done, _ = wait_futures(list(running), timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED)
+            if not done:
+                self._counters["timed_out"] += 1
+                logger.warning(f"OCR timed out with {len(running)} pages running")
+                for future in running:
+                    future.cancel()
+                break
+            for future in done:
+                page = running.pop(future)
+                results[page] = self._page_result(future, page + 1)
+                collected += len((results[page] or "").strip())
+
+        recognized = len([text for text in results if text is not None])
+        self._counters["pages"] += recognized
+        self._counters["pages_skipped"] += len(images) - next_page
+        self._ocr_seconds += time.time() - started
+        return results
+
+    def recognize(self, images: List[bytes], timeout: Optional[float] = None) -> str:
+        """OCR encoded page images (blocking). Returns the text of all pages, or "" if OCR is unavailable."""
+        return "\n\n".join(text for text in self.recognize_pages(images, timeout=timeout) if text)
+
+    async def recognize_pages_async(
+        self,
+        images: List[bytes],
+        stop_after_chars: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[Optional[str]]:
+        """recognize_pages without blocking the event loop (waits on the workers from a thread)."""
+        return await asyncio.to_thread(self.recognize_pages, images, stop_after_chars, timeout)
+
+    async def recognize_async(self, images: List[bytes], timeout: Optional[float] = None) -> str:
+        """OCR encoded page images without blocking the event loop."""
+        pages = await self.recognize_pages_async(images, timeout=timeout)
+        return "\n\n".join(text for text in pages if text)
+
+    async def warm_up(self) -> Dict[str, Any]:
+        """Start the workers and wait until the engine is loaded, so the first scan is not slow."""
+        try:
+            futures = [self._submit(_worker_info) for _ in range(self.pool_size)]
+        except OCRUnavailableError as e:
+            logger.info(f"OCR warm-up skipped: {e}")
+            return self.get_status()
+        try:
+            info = await asyncio.wait_for(asyncio.wrap_future(futures[0]), timeout=max(self.task_timeout, 300))
+            self._record_worker_info(info)
+        except BrokenProcessPool as e:
+            logger.warning(f"OCR warm-up failed: {e}")
+            self._reset_pool()
+        except Exception as e:
+            logger.warning(f"OCR warm-up failed: {e}")
+        return self.get_status()
+
+    def get_status(self) -> Dict[str, Any]:
+        pages = self._counters["pages"]
+        return {
+            "state": self._state,
+            "engine_preference": self.engine_preference,
+            "engines_installed": ocr_engines_installed(),
+            "engine": (self._worker_info or {}).get("engine"),
+            "engine_load_seconds": (self._worker_info or {}).get("load_seconds"),
+            "engine_errors": (self._worker_info or {}).get("errors", []),
+            "pool_size": self.pool_size,
+            "warm_up_seconds": round(self._ready_at - self._started_at, 3) if self._ready_at and self._started_at else None,
+            **self._counters,
+            "avg_seconds_per_page": round(self._ocr_seconds / pages, 3) if pages else None,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._state = "cold"
+            logger.info("OCR pool stopped")
+
+
+# ============================================================================
+# CONVENIENCE FUNCTIONS
+# ============================================================================
+
+# Global singleton instance
+_ocr_service = None
+
+def get_ocr_service() -> OCRService:
+    """Get or create the global OCRService instance."""
+    global _ocr_service
+    if _ocr_service is None:
+        _ocr_service = OCRService()
+    return _ocr_service
+
+
+def shutdown_ocr_service():
+    """Stop the OCR worker processes (called on application shutdown)."""
+    global _ocr_service
+    if _ocr_service is not None:
+        _ocr_service.shutdown()
+        _ocr_service = None
@@ -0,0 +1,398 @@
+"""
+One parsed view of an uploaded resume file.
+
+A ParsedDocument opens the file at most once (PyMuPDF for PDFs, pdfplumber
+only as a fallback, the streaming docx_extractor for DOCX/DOC) and lazily provides page text,
+page layout, rendered page images, embedded images and metadata, caching
+each as it is computed. The upload pipeline builds one per upload in the
+extraction pool and passes it to text extraction, profile-picture
+extraction and the SmartExtractor instead of handing raw bytes to each.
+
+Pickling drops the open parser handles but keeps everything computed so
+far, so a document prepared in a worker process can be used from the API
+process without parsing the file again.
+
+Parsing is bounded: only the first EXTRACTION_MAX_PAGES pages are read, and
+page renders and embedded images are capped at EXTRACTION_MAX_PAGE_PIXELS.
+"""
+
+import io
+import logging
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.capabilities import is_available, require
+from app.core.config import settings
+from app.services.docx_extractor import extract_doc_text, extract_docx_text
+
+logger = logging.getLogger(__name__)
+
+# Checked without importing; PyMuPDF itself is loaded when the first PDF is opened
+PYMUPDF_AVAILABLE = is_available("pymupdf")
+
+IMAGE_EXTENSIONS = ["png", "jpg", "jpeg", "bmp", "tiff", "webp"]
+
+
+def file_extension(filename: Optional[str]) -> str:
+    filename_lower = (filename or "").lower()
+    return filename_lower.split(".")[-1] if "." in filename_lower else ""
+
+
+def _image_coverage(image_boxes, page_box) -> float:
+    """Fraction of the page covered by image boxes (x0, y0, x1, y1), overlaps counted once per box."""
+    x0, y0, x1, y1 = page_box
+    page_area = max(1.0, (x1 - x0) * (y1 - y0))
+    covered = 0.0
+    for bx0, by0, bx1, by1 in image_boxes:
+        width = min(bx1, x1) - max(bx0, x0)
+        height = min(by1, y1) - max(by0, y0)
+        if width > 0 and height > 0:
+            covered += width * height
+    return round(min(1.0, covered / page_area), 3)
+
+
+class ParsedDocument:
+    """
+    Lazily parsed resume file.
+
+    Usage:
+        with ParsedDocument(content, filename) as document:
+            layouts = document.page_layouts()
+            png = document.render_page(0, dpi=150)
+
+    A document built from a spooled upload (`path`, no content) reads the
+    file only when something needs the bytes.
+    """
+
+    # Below this much text in total, pdfplumber is tried in case PyMuPDF missed the text layer
+    MIN_TEXT_LAYER_CHARS = 50
+
+    def __init__(
+        self,
+        content: Optional[bytes],
+        filename: str,
+        max_pages: Optional[int] = None,
+        max_page_pixels: Optional[int] = None,
+        path: Optional[str] = None
+    ):
+        self._content = content
+        self.path = path
+        self.filename = filename or ""
+        self.extension = file_extension(filename)
+        self.max_pages = max(1, max_pages or settings.EXTRACTION_MAX_PAGES)
+        self.max_page_pixels = max(1, max_page_pixels or settings.EXTRACTION_MAX_PAGE_PIXELS)
+
+        self._pdf = None
+        self._page_layouts: Optional[List[Dict[str, Any]]] = None
+        self._page_images: Dict[Tuple[int, int], bytes] = {}
+        self._embedded_images: Dict[int, List[Dict[str, Any]]] = {}
+        self._image_sizes: Dict[int, Tuple[int, int]] = {}
+        self._image_bytes: Dict[int, Optional[bytes]] = {}
+        self._word_text: Optional[str] = None
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._page_count: Optional[int] = None
+
+        # Set by resume_extractor.prepare_document: normalized text, or why extraction failed
+        # (both None when the text still needs OCR)
+        self.extracted_text: Optional[str] = None
+        self.extraction_error: Optional[str] = None
+        # Set by resume_extractor.render_previews: WebP first-page preview and profile thumbnails by size
+        self.page_preview: Optional[bytes] = None
+        self.profile_thumbnails: Dict[int, bytes] = {}
+
+    # ------------------------------------------------------------------
+    # Kind / lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.extension == "pdf"
+
+    @property
+    def is_docx(self) -> bool:
+        return self.extension == "docx"
+
+    @property
+    def is_doc(self) -> bool:
+        return self.extension == "doc"
+
+    @property
+    def is_image(self) -> bool:
+        return self.extension in IMAGE_EXTENSIONS
+
+    @property
+    def content(self) -> Optional[bytes]:
+        """The file bytes; read from `path` on first use for a spooled upload."""
+        if self._content is None and self.path:
+            with open(self.path, "rb") as f:
+                self._content = f.read()
+        return self._content
+
+    @content.setter
+    def content(self, content: Optional[bytes]):
+        self._content = content
+
+    @property
+    def pdf(self):
+        """The PyMuPDF document, opened on first use (None without PyMuPDF or for non-PDFs)."""
+        if self._pdf is None and self.is_pdf and PYMUPDF_AVAILABLE:
+            if self.content is None:
+                raise RuntimeError(f"{self.filename}: content was detached; the document cannot be re-parsed")
+            self._pdf = require("pymupdf").open(stream=self.content, filetype="pdf")
+        return self._pdf
+
+    def close(self):
+        """Release parser handles. Cached results stay available."""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pdf"] = None
+        return state
+
+    def release_page_images(self):
+        """Forget rendered page images once they are no longer needed (e.g. after OCR)."""
+        self._page_images.clear()
+
+    def detach_content(self) -> Optional[bytes]:
+        """
+        Drop the file bytes (e.g. before sending the document back from a
+        worker); returns them. A spooled upload can still read them from `path`.
+        """
+        content, self._content = self._content, None
+        return content
+
+    # ------------------------------------------------------------------
+    # PDF pages
+    # ------------------------------------------------------------------
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            if self._page_layouts is not None:
+                self._page_count = len(self._page_layouts)
+            elif not self.is_pdf:
+                self._page_count = 0
+            else:
+                try:
+                    if self.pdf is not None:
+                        self._page_count = self.pdf.page_count
+                    else:
+                        with require("pdfplumber").open(io.BytesIO(self.content)) as pdf:
+                            self._page_count = len(pdf.pages)
+                except Exception as e:
+                    logger.warning(f"Could not count pages of {self.filename}: {e}")
+                    self._page_count = 0
+        return self._page_count
+
+    @property
+    def pages_to_read(self) -> int:
+        """Pages that are parsed: the first max_pages of the document."""
+        return min(self.page_count, self.max_pages)
+
+    @property
+    def truncated(self) -> bool:
+        """True when the document has more pages than max_pages and the rest were ignored."""
+        return self.is_pdf and self.page_count > self.max_pages
+
+    def page_layouts(self) -> List[Dict[str, Any]]:
+        """
+        Per page: text, text_chars, image_coverage (fraction of the page area
+        covered by images) and width/height in points. Empty if unreadable.
+        """
+        if self._page_layouts is None:
+            if self.truncated:
+                logger.warning(f"{self.filename}: reading only the first {self.max_pages} of {self.page_count} pages")
+            layouts = self._layouts_pymupdf() if PYMUPDF_AVAILABLE else []
+            if sum(page["text_chars"] for page in layouts) < self.MIN_TEXT_LAYER_CHARS:
+                layouts = self._layouts_pdfplumber() or layouts
+            self._page_layouts = layouts
+        return self._page_layouts
+
+    def page_texts(self) -> List[str]:
+        return [page["text"] for page in self.page_layouts()]
+
+    def _layouts_pymupdf(self) -> List[Dict[str, Any]]:
+        if not self.is_pdf:
+            return []
+        try:
+            layouts = []
+            for index in range(min(self.pdf.page_count, self.max_pages)):
+                page = self.pdf[index]
+                text = page.get_text()
+                rect = page.rect
+                boxes = [tuple(info["bbox"]) for info in page.get_image_info()]
+                layouts.append({
+                    "text": text,
+                    "text_chars": len(text.strip()),
+                    "image_coverage": _image_coverage(boxes, (rect.x0, rect.y0, rect.x1, rect.y1)),
+                    "width": rect.width,
+                    "height": rect.height,
+                })
+            return layouts
+        except Exception as e:
+            logger.warning(f"pymupdf page analysis failed: {e}")
+            return []
+
+    def _layouts_pdfplumber(self) -> List[Dict[str, Any]]:
+        if not self.is_pdf:
+            return []
+        try:
+            layouts = []
+            with require("pdfplumber").open(io.BytesIO(self.content)) as pdf:
+                for page in pdf.pages[:self.max_pages]:
+                    text = page.extract_text() or ""
+                    boxes = [(image["x0"], image["top"], image["x1"], image["bottom"]) for image in page.images]
+                    layouts.append({
+                        "text": text,
+                        "text_chars": len(text.strip()),
+                        "image_coverage": _image_coverage(boxes, (0, 0, page.width, page.height)),
+                        "width": float(page.width),
+                        "height": float(page.height),
+                    })
+            return layouts
+        except Exception:
+            return []
+
+    def _render_dpi(self, index: int, dpi: int) -> int:
+        """`dpi`, lowered if needed so the rendered page stays within max_page_pixels."""
+        layouts = self._page_layouts or []
+        if index < len(layouts):
+            width, height = layouts[index]["width"], layouts[index]["height"]
+        elif self.pdf is not None:
+            width, height = self.pdf[index].rect.width, self.pdf[index].rect.height
+        else:
+            return dpi
+        pixels = (width / 72 * dpi) * (height / 72 * dpi)
+        if pixels <= self.max_page_pixels:
+            return dpi
+        capped = max(1, int(dpi * math.sqrt(self.max_page_pixels / pixels)))
+        logger.warning(f"{self.filename}: page {index + 1} rendered at {capped} instead of {dpi} DPI (pixel budget)")
+        return capped
+
+    def render_page(self, index: int, dpi: int) -> Optional[bytes]:
+        """Grayscale PNG of one page at `dpi`, or lower if that exceeds max_page_pixels (None if it cannot be rendered)."""
+        key = (index, dpi)
+        if key not in self._page_images:
+            if index >= self.max_pages:
+                return None
+            try:
+                render_dpi = self._render_dpi(index, dpi)
+                if self.pdf is not None:
+                    image = self.pdf[index].get_pixmap(dpi=render_dpi, colorspace=require("pymupdf").csGRAY).tobytes("png")
+                else:
+                    page_image = require("pdf2image").convert_from_bytes(
+                        self.content, dpi=render_dpi, first_page=index + 1, last_page=index + 1, grayscale=True
+                    )[0]
+                    buffer = io.BytesIO()
+                    page_image.save(buffer, format="PNG")
+                    image = buffer.getvalue()
+            except Exception as e:
+                logger.warning(f"Rendering PDF page {index + 1} failed: {e}")
+                return None
+            self._page_images[key] = image
+        return self._page_images[key]
+
+    def render_preview(self, index: int, width: int, quality: int) -> Optional[bytes]:
+        """Color WebP of one page scaled to `width` pixels (None without PyMuPDF/Pillow or if it cannot be rendered)."""
+        if index >= self.pages_to_read or self.pdf is None:
+            return None
+        try:
+            page = self.pdf[index]
+            zoom = width / max(1.0, page.rect.width)
+            if page.rect.width * page.rect.height * zoom * zoom > self.max_page_pixels:
+                return None
+            pixmap = page.get_pixmap(matrix=require("pymupdf").Matrix(zoom, zoom), alpha=False)
+            image = require("pillow").frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+            buffer = io.BytesIO()
+            image.save(buffer, format="WEBP", quality=quality)
+            return buffer.getvalue()
+        except Exception as e:
+            logger.warning(f"Rendering a preview of PDF page {index + 1} failed: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Embedded images
+    # ------------------------------------------------------------------
+
+    def embedded_images(self, index: int) -> List[Dict[str, Any]]:
+        """Images placed on a page: xref, width, height (bytes are only decoded by image_bytes)."""
+        if index not in self._embedded_images:
+            images = []
+            try:
+                if self.pdf is not None and index < self.pdf.page_count:
+                    for image in self.pdf[index].get_images(full=True):
+                        images.append({"xref": image[0], "width": image[2], "height": image[3]})
+                        self._image_sizes[image[0]] = (image[2], image[3])
+            except Exception as e:
+                logger.warning(f"Listing images on page {index + 1} failed: {e}")
+            self._embedded_images[index] = images
+        return self._embedded_images[index]
+
+    def image_bytes(self, xref: int) -> Optional[bytes]:
+        """Encoded bytes of one embedded image (None for images larger than max_page_pixels)."""
+        if xref not in self._image_bytes:
+            data = None
+            width, height = self._image_sizes.get(xref, (0, 0))
+            if width * height > self.max_page_pixels:
+                logger.warning(f"{self.filename}: skipping {width}x{height} image {xref} (pixel budget)")
+                self._image_bytes[xref] = None
+                return None
+            try:
+                extracted = self.pdf.extract_image(xref) if self.pdf is not None else None
+                data = extracted["image"] if extracted else None
+            except Exception as e:
+                logger.warning(f"Extracting image {xref} failed: {e}")
+            self._image_bytes[xref] = data
+        return self._image_bytes[xref]
+
+    # ------------------------------------------------------------------
+    # Word / metadata
+    # ------------------------------------------------------------------
+
+    def docx_text(self) -> str:
+        """Text of a DOCX file, including tables, headers/footers and text boxes. Raises ValueError if invalid."""
+        if self._word_text is None:
+            self._word_text = extract_docx_text(self.content)
+        return self._word_text
+
+    def doc_text(self) -> str:
+        """Text of a legacy .doc file (antiword/catdoc). Raises ValueError if it cannot be read."""
+        if self._word_text is None:
+            self._word_text = extract_doc_text(self.content)
+        return self._word_text
+
+    def _size_bytes(self) -> Optional[int]:
+        if self._content is not None:
+            return len(self._content)
+        if self.path:
+            return os.path.getsize(self.path)
+        return None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """File name/kind/size, page count and (for PDFs) the document info dictionary."""
+        if self._metadata is None:
+            metadata = {
+                "filename": self.filename,
+                "extension": self.extension,
+                "size_bytes": self._size_bytes(),
+                "page_count": self.page_count if self.is_pdf else None,
+                "pages_read": self.pages_to_read if self.is_pdf else None,
+            }
+            try:
+                if self.pdf is not None:
+                    metadata.update({key: value for key, value in (self.pdf.metadata or {}).items() if value})
+            except Exception:
+                pass
+            self._metadata = metadata
+        return self._metadata
@@ -0,0 +1,227 @@
+"""
+Incremental rescoring of the talent pool when jobs change.
+
+Creating, editing or re-activating a job rescores only that job against every
+stored application, in batches, in a background task, writing the results
+to the `job_scores` collection; deactivating or deleting a job removes its
+entries. Repeated triggers for the same job while a rescore is running are
+coalesced into a single follow-up run, so a burst of edits costs at most two
+passes.
+
+Progress is broadcast on the `rescore:progress` Socket.IO event.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteOne, UpdateOne
+
+from app.core.config import settings
+from app.services.job_scores import build_job_score_doc, delete_scores_for_job, score_upsert
+from app.services.scoring_engine import ResumeScorer
+from app.services.socket_manager import emit_rescore_progress
+
+logger = logging.getLogger(__name__)
+
+# Only what scoring needs; extracted_text is the largest field we read
+APPLICATION_SCORING_PROJECTION = {
+    "job_id": 1,
+    "extracted_text": 1,
+    "candidate_skills": 1,
+    "candidate_experience_years": 1,
+    "candidate_experience_months": 1,
+    "candidate_education": 1,
+}
+
+
+def candidate_from_application(app: dict) -> Dict[str, Any]:
+    """Rebuild the parsed candidate data that scoring expects from an application document."""
+    return {
+        "name": app.get("candidate_name_extracted"),
+        "email": app.get("candidate_email"),
+        "phone": app.get("candidate_phone"),
+        "linkedin_url": app.get("candidate_linkedin"),
+        "github_url": app.get("candidate_github"),
+        "skills": [s for s in app.get("candidate_skills") or [] if isinstance(s, str)],
+        "experience_years": app.get("candidate_experience_years") or 0,
+        "experience_months": app.get("candidate_experience_months") or 0,
+        "education": [e for e in app.get("candidate_education") or [] if isinstance(e, str)],
+        "certifications": app.get("candidate_certifications") or [],
+        "summary": app.get("candidate_summary") or "",
+    }
+
+
+def primary_score_fields(job_score: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level score fields for applications whose primary job is the rescored one."""
+    return {
+        "skill_score": job_score.get("skill_score", 0.0),
+        "experience_score": job_score.get("experience_score", 0.0),
+        "education_score": job_score.get("education_score", 0.0),
+        "final_score": job_score.get("final_score", 0.0),
+        "score_display": {
+            "skill": f"{round(job_score.get('skill_score', 0.0) * 0.50, 1)}/50",
+            "experience": f"{round(job_score.get('experience_score', 0.0) * 0.35, 1)}/35",
+            "education": f"{round(job_score.get('education_score', 0.0) * 0.15, 1)}/15",
+            "total": f"{round(job_score.get('final_score', 0.0), 1)}/100"
+        },
+        "score_breakdown": job_score.get("breakdown", {}),
+        "matched_skills": job_score.get("matched_skills", []),
+        "missing_skills": job_score.get("missing_skills", []),
+        "skill_coverage": job_score.get("skill_coverage", 0.0),
+    }
+
+
+async def rescore_job(db: AsyncIOMotorDatabase, job_id: str, progress: Optional[dict] = None) -> Dict[str, Any]:
+    """
+    Score one job against every application and replace its entries.
+
+    Inactive or missing jobs have their entries removed instead.
+    """
+    started = time.perf_counter()
+    job = await db.jobs.find_one({"_id": ObjectId(job_id)}) if ObjectId.is_valid(job_id) else None
+    if not job or job.get("is_active") is False:
+        removed = await remove_job_scores(db, job_id)
+        return {"job_id": job_id, "action": "removed", "updated": removed}
+
+    scorer = ResumeScorer()
+    batch_size = max(1, settings.RESCORE_BATCH_SIZE)
+    total = await db.applications.count_documents({})
+    processed = 0
+    if progress is not None:
+        progress.update({"total": total, "processed": 0})
+
+    cursor = db.applications.find({}, APPLICATION_SCORING_PROJECTION).batch_size(batch_size)
+    score_operations = []
+    application_operations = []
+    scored_at = datetime.utcnow()
+
+    async def _flush():
+        if score_operations:
+            await db.job_scores.bulk_write(score_operations, ordered=False)
+        if application_operations:
+            await db.applications.bulk_write(application_operations, ordered=False)
+        score_operations.clear()
+        application_operations.clear()
+
+    async for app in cursor:
+        try:
+            job_score = scorer.score_application(
+                candidate_from_application(app),
+                app.get("extracted_text") or "",
+                job
+            )
+        except Exception as e:
+            logger.warning(f"Rescore: failed to score application {app['_id']} for job {job_id}: {e}")
+            job_score = None
+
+        application_id = str(app["_id"])
+        if job_score is None:
+            score_operations.append(DeleteOne({"application_id": application_id, "job_id": job_id}))
+        else:
+            score_operations.append(score_upsert(build_job_score_doc(application_id, job, job_score, scored_at)))
+            updates = {"scores_updated_at": scored_at}
+            if app.get("job_id") == job_id:
+                updates.update(primary_score_fields(job_score))
+            application_operations.append(UpdateOne({"_id": app["_id"]}, {"$set": updates}))
+
+        processed += 1
+        if processed % batch_size == 0:
+            await _flush()
+            if progress is not None:
+                progress["processed"] = processed
+            await emit_rescore_progress({
+                "job_id": job_id, "status": "running", "processed": processed, "total": total
+            })
+            # Let request handlers run between batches
+            await asyncio.sleep(0)
+
+    await _flush()
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Rescore: job {job_id} scored against {processed} applications in {elapsed:.2f}s")
+    return {"job_id": job_id, "action": "rescored", "updated": processed, "seconds": round(elapsed, 2)}
+
+
+async def remove_job_scores(db: AsyncIOMotorDatabase, job_id: str) -> int:
+    """Drop a job's scores, including any legacy entries embedded in applications."""
+    removed = await delete_scores_for_job(db, job_id)
+    await db.applications.update_many(
+        {"global_job_scores.job_id": job_id},
+        {"$pull": {"global_job_scores": {"job_id": job_id}}}
+    )
+    return removed
+
+
+class RescoreScheduler:
+    """
+    Runs at most one rescore per job at a time in the background.
+
+    A trigger that arrives while that job is being rescored marks it dirty,
+    and the job is rescored once more after the current pass finishes.
+    """
+
+    def __init__(self):
+        self._running: Dict[str, asyncio.Task] = {}
+        self._dirty: set = set()
+        self._progress: Dict[str, dict] = {}
+        self._last_results: Dict[str, dict] = {}
+        self._history_size = 50
+
+    def schedule(self, job_id: str, reason: str = "updated"):
+        job_id = str(job_id)
+        if job_id in self._running:
+            self._dirty.add(job_id)
+            return
+        self._progress[job_id] = {"reason": reason, "started_at": datetime.utcnow().isoformat(), "processed": 0, "total": None}
+        self._running[job_id] = asyncio.create_task(self._run(job_id))
+
+    async def _run(self, job_id: str):
+        from app.db.mongodb import get_db
+
+        try:
+            while True:
+                self._dirty.discard(job_id)
+                await emit_rescore_progress({"job_id": job_id, "status": "started"})
+                try:
+                    result = await rescore_job(get_db(), job_id, self._progress[job_id])
+                    self._last_results[job_id] = {**result, "finished_at": datetime.utcnow().isoformat()}
+                    await emit_rescore_progress({"job_id": job_id, "status": "completed", **result})
+                except Exception as e:
+                    logger.exception(f"Rescore: job {job_id} failed")
+                    self._last_results[job_id] = {"job_id": job_id, "action": "failed", "error": str(e)}
+                    await emit_rescore_progress({"job_id": job_id, "status": "failed", "error": str(e)})
+                while len(self._last_results) > self._history_size:
+                    self._last_results.pop(next(iter(self._last_results)))
+                if job_id not in self._dirty:
+                    break
+        finally:
+            self._running.pop(job_id, None)
+            self._progress.pop(job_id, None)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "running": {job_id: dict(progress) for job_id, progress in self._progress.items()},
+            "pending_reruns": sorted(self._dirty),
+            "recent": list(self._last_results.values())[-20:],
+        }
+
+
+_rescore_scheduler: Optional[RescoreScheduler] = None
+
+
+def get_rescore_scheduler() -> RescoreScheduler:
+    """Get or create the global RescoreScheduler instance."""
+    global _rescore_scheduler
+    if _rescore_scheduler is None:
+        _rescore_scheduler = RescoreScheduler()
+    return _rescore_scheduler
+
+
+def schedule_job_rescore(job_id: str, reason: str = "updated"):
+    """Rescore (or, if the job is now inactive/deleted, clear) a job's scores in the background."""
+    get_rescore_scheduler().schedule(job_id, reason)
@@ -7,339 +7,278 @@ Uses LLM for intelligent data extraction with regex fallback.
 import io
 import re
 import logging
-import easyocr
-import numpy as np
-from PIL import Image
-import shutil
-import subprocess
-import pdfplumber
-import docx
 from fastapi import UploadFile
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, List, Optional, Union
+from app.core.capabilities import is_available, require
+from app.core.config import settings
+from app.services.extraction_executor import get_extraction_executor
+from app.services.ocr_service import get_ocr_service
+from app.services.parsed_document import IMAGE_EXTENSIONS, PYMUPDF_AVAILABLE, ParsedDocument, file_extension
+from app.services.skill_matcher import get_skill_matcher
 
 logger = logging.getLogger(__name__)
 
-# Check for pymupdf
-try:
-    import fitz  # pymupdf
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-
-# Check for EasyOCR (pure Python, no external dependencies)
-EASYOCR_AVAILABLE = False
-_easyocr_reader = None
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-    logger.info("EasyOCR available for scanned PDF extraction")
-except ImportError:
-    logger.warning("EasyOCR not available")
-
-# Check for pytesseract OCR  
-try:
-    from pdf2image import convert_from_bytes
-    import pytesseract
-    # Actually check if Tesseract binary is installed
-    tesseract_path = shutil.which("tesseract")
-    if tesseract_path:
-        OCR_AVAILABLE = True
-        logger.info(f"Tesseract OCR found at: {tesseract_path}")
-    else:
-        OCR_AVAILABLE = False
-        logger.warning("pytesseract installed but Tesseract binary not found in PATH")
-except ImportError:
-    OCR_AVAILABLE = False
-
-# Check for pymupdf OCR capability
-PYMUPDF_OCR_AVAILABLE = False
-if PYMUPDF_AVAILABLE:
-    try:
-        # pymupdf can do OCR if Tesseract is installed
-        result = subprocess.run(["tesseract", "--version"], capture_output=True, timeout=5)
-        if result.returncode == 0:
-            PYMUPDF_OCR_AVAILABLE = True
-            logger.info("pymupdf OCR capability available")
-    except Exception:
-        pass
+# A page's text layer is usable with at least this many characters, unless
+# images cover most of the page and the text is only a header or footer
+PAGE_MIN_TEXT_CHARS = 50
+PAGE_IMAGE_COVERAGE = 0.5
+PAGE_IMAGE_MIN_TEXT_CHARS = 300
 
+# OCR render resolution: aim for this many pixels on the long side, within DPI bounds
+OCR_TARGET_LONG_SIDE_PX = 1700
+OCR_MIN_DPI = 100
+OCR_MAX_DPI = 300
 
-def _get_easyocr_reader():
-    """Lazy-load EasyOCR reader to avoid slow startup."""
-    global _easyocr_reader
-    if _easyocr_reader is None and EASYOCR_AVAILABLE:
-        import easyocr
-        _easyocr_reader = easyocr.Reader(['en'], gpu=False)  # Use CPU for compatibility
-        logger.info("EasyOCR reader initialized")
 
-        print("_get_easyocr_reader: EasyOCR reader initialized")
-    return _easyocr_reader
+class OCRRequiredError(ValueError):
+    """Raised by extract_text_from_bytes(..., ocr=False) when the file needs OCR."""
 
 
- #Image OCR
+def _as_document(source: Union[bytes, ParsedDocument], filename: str) -> Tuple[ParsedDocument, bool]:
+    """(document, owned): wrap raw bytes in a ParsedDocument the caller must close."""
+    if isinstance(source, ParsedDocument):
+        return source, False
+    return ParsedDocument(source, filename), True
 
-reader = easyocr.Reader(['en'])
 
-def _extract_from_image_easyocr(content: bytes):
-    image = Image.open(io.BytesIO(content))
-    image_np = np.array(image)
-    results = reader.readtext(image_np, detail=0)
-    print("_extract_from_image_easyocr: Initialized")
-    return "\n".join(results)
-    
-def _extract_from_image_tesseract(content: bytes):
-    """
-    OCR fallback using pytesseract for image files
+def extract_text_from_bytes(content: Union[bytes, ParsedDocument], filename: str = "", ocr: bool = True) -> str:
     """
-    image = Image.open(io.BytesIO(content))
-    text = pytesseract.image_to_string(image)
-    print("_extract_from_image_tesseract: OCR completed")
-    return text
+    Extract text from PDF, DOCX, or Image file bytes (or an already parsed document).
 
-# def extract_text_from_bytes(content: bytes, filename: str) -> str:
+    With ocr=False, scanned PDFs and images raise OCRRequiredError instead of
+    being OCR'd here; prepare_document uses that to send only those files
+    to the shared OCR service.
     """
-    Extract text from PDF or DOCX file bytes.
-    This is the main extraction function that works with raw bytes.
-    """
-    filename_lower = filename.lower()
-    file_ext = filename_lower.split(".")[-1] if "." in filename_lower else ""
+    print("Starting text extraction from bytes...")
+    document, owned = _as_document(content, filename)
+    try:
+        return _extract_text(document, ocr)
+    finally:
+        if owned:
+            document.close()
 
+
+def _extract_text(document: ParsedDocument, ocr: bool) -> str:
     extracted_text = ""
 
-    # PDF handling
-    if file_ext == "pdf":
-        # Try pymupdf first (faster and more reliable)
-        if PYMUPDF_AVAILABLE:
-            extracted_text = _extract_from_pdf_pymupdf(content)
-        
-        # Fallback to pdfplumber if pymupdf failed
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            extracted_text = _extract_from_pdf(content)
-        
-        # OCR fallback if text is too short (likely scanned PDF)
-        if not extracted_text or len(extracted_text.strip()) < 100:
-            logger.info("PDF appears to be scanned, attempting OCR extraction...")
-            
-            # Try EasyOCR first (no external dependencies)
-            if EASYOCR_AVAILABLE:
-                logger.info("Using EasyOCR for scanned PDF...")
-                extracted_text = _extract_from_pdf_easyocr(content)
-            
-            # Try pymupdf OCR
-            if (not extracted_text or len(extracted_text.strip()) < 50) and PYMUPDF_OCR_AVAILABLE:
-                logger.info("Trying pymupdf OCR...")
-                extracted_text = _extract_from_pdf_pymupdf_ocr(content)
-            
-            # Try pytesseract OCR
-            if (not extracted_text or len(extracted_text.strip()) < 50) and OCR_AVAILABLE:
-                logger.info("Trying pytesseract OCR...")
-                extracted_text = _extract_from_pdf_ocr(content)
-            
-            if not extracted_text or len(extracted_text.strip()) < 50:
-                raise ValueError(
-                    "This PDF appears to be a scanned image and OCR extraction failed. "
-                    "Please upload a text-based PDF or DOCX file instead."
-                )
-            
+    # ---------------- PDF handling ----------------
+    if document.is_pdf:
+        pages = analyze_pdf_pages(document)
+        extracted_text = _join_pages(page["text"] for page in pages)
 
-    # DOCX handling
-    elif file_ext == "docx":
-        try:
-            doc = docx.Document(io.BytesIO(content))
-            extracted_text = "\n".join(p.text for p in doc.paragraphs)
-        except Exception:
-            raise ValueError("Invalid DOCX file. Please convert to .docx if needed.")
+        if _pdf_needs_ocr(pages):
+            ocr_pages = len([page for page in pages if page["needs_ocr"]])
+            logger.info(f"{ocr_pages}/{len(pages)} PDF pages have no usable text layer, attempting OCR extraction...")
+            if not ocr:
+                raise OCRRequiredError("PDF has pages without a usable text layer")
+            extracted_text = _check_ocr_text(_extract_from_pdf_ocr(document), document.extension)
 
-    else:
-        raise ValueError(f"Unsupported file format: {file_ext}. Please upload a PDF or DOCX file.")
+    # ---------------- DOCX / DOC handling ----------------
+    elif document.is_docx:
+        extracted_text = document.docx_text()
 
-    # Normalize text
-    normalized_text = _normalize_text(extracted_text)
-    
-    if not normalized_text or len(normalized_text.strip()) < 50:
-        raise ValueError(f"Resume text is too short or empty after extraction. Got {len(normalized_text)} chars.")
-    
-    return normalized_text
+    elif document.is_doc:
+        extracted_text = document.doc_text()
 
-def extract_text_from_bytes(content: bytes, filename: str) -> str:
-    """
-    Extract text from PDF, DOCX, or Image file bytes.
-    """
-    print("Starting text extraction from bytes...")
-    filename_lower = filename.lower()
-    file_ext = filename_lower.split(".")[-1] if "." in filename_lower else ""
+    # ---------------- IMAGE handling ----------------
+    elif document.is_image:
+        logger.info("Processing image file for OCR extraction...")
+        if not ocr:
+            raise OCRRequiredError("Image files need OCR")
+        extracted_text = _check_ocr_text(get_ocr_service().recognize([document.content]), document.extension)
 
-    extracted_text = ""
+    # ---------------- Unsupported ----------------
+    else:
+        raise ValueError(
+            f"Unsupported file format: {document.extension}. Please upload PDF, DOCX, DOC, or Image files."
+        )
 
-    # ---------------- PDF handling ----------------
-    if file_ext == "pdf":
-        if PYMUPDF_AVAILABLE:
-            extracted_text = _extract_from_pdf_pymupdf(content)
+    return _finalize_text(extracted_text)
 
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            extracted_text = _extract_from_pdf(content)
 
-        if not extracted_text or len(extracted_text.strip()) < 100:
-            logger.info("PDF appears to be scanned, attempting OCR extraction...")
+def _check_ocr_text(text: str, file_ext: str) -> str:
+    """Reject OCR output that is too short to be a resume."""
+    if file_ext == "pdf":
+        if not text or len(text.strip()) < 50:
+            raise ValueError(
+                "This PDF appears to be a scanned image and OCR extraction failed. "
+                "Please upload a text-based PDF or DOCX file instead."
+            )
+    elif not text or len(text.strip()) < 20:
+        raise ValueError(
+            "Text extraction from image failed. Please upload a clearer image or a PDF/DOCX file."
+        )
+    return text
 
-            if EASYOCR_AVAILABLE:
-                logger.info("Using EasyOCR for scanned PDF...")
-                extracted_text = _extract_from_pdf_easyocr(content)
 
-            if (not extracted_text or len(extracted_text.strip()) < 50) and PYMUPDF_OCR_AVAILABLE:
-                logger.info("Trying pymupdf OCR...")
-                extracted_text = _extract_from_pdf_pymupdf_ocr(content)
+def _finalize_text(extracted_text: str) -> str:
+    """Normalize extracted text and enforce the minimum resume length."""
+    normalized_text = _normalize_text(extracted_text)
 
-            if (not extracted_text or len(extracted_text.strip()) < 50) and OCR_AVAILABLE:
-                logger.info("Trying pytesseract OCR...")
-                extracted_text = _extract_from_pdf_ocr(content)
+    if not normalized_text or len(normalized_text.strip()) < 50:
+        raise ValueError(f"Resume text is too short or empty after extraction. Got {len(normalized_text)} chars.")
 
-            if not extracted_text or len(extracted_text.strip()) < 50:
-                raise ValueError(
-                    "This PDF appears to be a scanned image and OCR extraction failed. "
-                    "Please upload a text-based PDF or DOCX file instead."
-                )
+    return normalized_text
 
-    # ---------------- DOCX handling ----------------
-    elif file_ext == "docx":
-        try:
-            doc = docx.Document(io.BytesIO(content))
-            extracted_text = "\n".join(p.text for p in doc.paragraphs)
-        except Exception:
-            raise ValueError("Invalid DOCX file. Please convert to .docx if needed.")
 
-    # ---------------- IMAGE handling ----------------
-    elif file_ext in ["png", "jpg", "jpeg", "bmp", "tiff", "webp"]:
-        logger.info("Processing image file for OCR extraction...")
-       
+# ============================================================================
+# PARSE ONCE PER UPLOAD
+# ============================================================================
 
-        # Try EasyOCR first
-        if EASYOCR_AVAILABLE:
+def prepare_document(
+    content: Optional[bytes],
+    filename: str,
+    profile_picture: bool = True,
+    path: Optional[str] = None,
+    previews: bool = False,
+    text: bool = True
+) -> ParsedDocument:
+    """
+    Parse an upload once (runs in the extraction pool) and compute what the
+    upload pipeline needs from it: the normalized text, or the rendered pages
+    to OCR when it has no usable text layer, plus the profile picture and,
+    with `previews`, the WebP preview images (see render_previews).
+    With text=False (the extraction is already cached) only the images are
+    computed: no text layer is read and no page is rendered for OCR.
+
+    With `path` (a spooled upload) the file is read from disk here instead of
+    being sent to the worker. The document comes back without parser handles
+    or file bytes; parse_document_async re-attaches the bytes in the API process,
+    or the document reads them from `path` again if anything still needs them.
+    """
+    document = ParsedDocument(content, filename, path=path)
+    try:
+        if text:
             try:
-                extracted_text = _extract_from_image_easyocr(content)
-            except Exception:
-                extracted_text = ""
+                document.extracted_text = extract_text_from_bytes(document, ocr=False)
+            except OCRRequiredError:
+                if document.is_pdf:
+                    plan_pdf_ocr(document)
+            except ValueError as e:
+                document.extraction_error = str(e)
+
+        if document.is_pdf:
+            if profile_picture:
+                extract_profile_picture_from_pdf(document)
+            if previews:
+                render_previews(document)
+    finally:
+        document.close()
+    document.detach_content()
+    return document
+
+
+async def _run_parser(fn, *args):
+    """
+    Run a parsing task on untrusted file bytes: in a killable sandbox child
+    with the parse time and memory budgets (EXTRACTION_SANDBOX), otherwise in
+    the extraction pool. Over budget it raises ExtractionTimeoutError or
+    ExtractionAbortedError.
+    """
+    executor = get_extraction_executor()
+    if settings.EXTRACTION_SANDBOX:
+        return await executor.run_sandboxed(
+            fn, *args,
+            timeout=settings.EXTRACTION_PARSE_TIMEOUT,
+            memory_limit_mb=settings.EXTRACTION_MEMORY_LIMIT_MB
+        )
+    return await executor.run(fn, *args)
 
-        # Fallback to pytesseract
-        if (not extracted_text or len(extracted_text.strip()) < 20) and OCR_AVAILABLE:
-            try:
-                extracted_text = _extract_from_image_tesseract(content)
-            except Exception:
-                extracted_text = ""
 
-        if not extracted_text or len(extracted_text.strip()) < 20:
-            raise ValueError(
-                "Text extraction from image failed. Please upload a clearer image or a PDF/DOCX file."
-            )
+async def parse_document_async(
+    content: Optional[bytes],
+    filename: str,
+    profile_picture: bool = True,
+    path: Optional[str] = None,
+    previews: bool = False,
+    text: bool = True
+) -> ParsedDocument:
+    """
+    Run prepare_document in the extraction sandbox (or pool), within the
+    parsing budgets. When the upload is spooled at `path`, the worker opens
+    it there rather than receiving the bytes, and `content` may be None: the
+    document then reads the file again only if a later step needs the bytes.
+    """
+    if path:
+        document = await _run_parser(prepare_document, None, filename, profile_picture, path, previews, text)
+    else:
+        document = await _run_parser(prepare_document, content, filename, profile_picture, None, previews, text)
+    document.content = content
+    return document
 
-    # ---------------- Unsupported ----------------
+
+async def extract_text_from_document_async(document: ParsedDocument) -> str:
+    """
+    Normalized text of a document from parse_document_async. Files without a
+    usable text layer are OCR'd here through the shared OCR service, so
+    extraction workers never load an OCR engine of their own.
+    """
+    if document.extraction_error:
+        raise ValueError(document.extraction_error)
+    if document.extracted_text is None:
+        if document.is_pdf:
+            text = await extract_pdf_text_async(document)
+        else:
+            text = await get_ocr_service().recognize_async([document.content])
+        document.extracted_text = _finalize_text(_check_ocr_text(text, document.extension))
+        document.release_page_images()
+    return document.extracted_text
+
+
+async def extract_pdf_text_async(source: Union[bytes, ParsedDocument]) -> str:
+    """
+    Raw (unnormalized) text of a PDF. Pages that lack a usable text layer are
+    recognized in parallel by the shared OCR service; without OCR the text
+    layer alone is returned.
+
+    A document from parse_document_async is served from its caches; raw
+    bytes are parsed and rendered in the extraction pool.
+    """
+    if isinstance(source, ParsedDocument):
+        plan = plan_pdf_ocr(source)
     else:
-        raise ValueError(
-            f"Unsupported file format: {file_ext}. Please upload PDF, DOCX, or Image files."
-        )
+        plan = await _run_parser(_plan_pdf_ocr_bytes, source)
+    ocr_texts = await get_ocr_service().recognize_pages_async(
+        plan["images"], stop_after_chars=_ocr_chars_wanted(plan["texts"])
+    )
+    return _merge_ocr_pages(plan, ocr_texts)
 
-    # return extracted_text
 
-    # Normalize text
-    normalized_text = _normalize_text(extracted_text)
-    
-    if not normalized_text or len(normalized_text.strip()) < 50:
-        raise ValueError(f"Resume text is too short or empty after extraction. Got {len(normalized_text)} chars.")
-    
-    return normalized_text
+async def extract_text_from_bytes_async(content: bytes, filename: str) -> str:
+    """
+    Extract text without blocking the event loop: parsing runs in the
+    extraction process pool, OCR (when needed) in the shared OCR service.
+    """
+    document = await parse_document_async(content, filename, profile_picture=False)
+    return await extract_text_from_document_async(document)
+
 
 async def extract_text_from_file(file: UploadFile) -> str:
     """
-    Extract text from PDF or DOCX file.
+    Extract text from an uploaded PDF, DOCX or image file.
     Falls back to OCR if PDF text extraction is empty.
     Normalizes and returns clean text.
     """
     print("Starting text extraction from file...")
     content = await file.read()
-    filename = (file.filename or "").lower()
-    file_ext = filename.split(".")[-1] if "." in filename else ""
+    filename = file.filename or ""
     content_type = (file.content_type or "").lower()
 
-    extracted_text = ""
+    # Fall back to the content type when the filename has no usable extension
+    if file_extension(filename) not in ["pdf", "docx", "doc"] + IMAGE_EXTENSIONS:
+        if "pdf" in content_type:
+            filename = f"{filename}.pdf"
+        elif "wordprocessingml" in content_type or "docx" in content_type:
+            filename = f"{filename}.docx"
+        elif "msword" in content_type:
+            filename = f"{filename}.doc"
+        elif content_type.startswith("image/"):
+            filename = f"{filename}.{content_type.split('/')[-1]}"
 
-    # PDF handling
-    if file_ext == "pdf" or "pdf" in content_type:
-        # Try pymupdf first (faster and more reliable)
-        if PYMUPDF_AVAILABLE:
-            extracted_text = _extract_from_pdf_pymupdf(content)
-        
-        # Fallback to pdfplumber if pymupdf failed
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            extracted_text = _extract_from_pdf(content)
-        
-        # OCR fallback if text is too short (likely scanned PDF)
-        if not extracted_text or len(extracted_text.strip()) < 100:
-            logger.info("PDF appears to be scanned, attempting OCR extraction...")
-            
-            # Try EasyOCR first (no external dependencies)
-            if EASYOCR_AVAILABLE:
-                logger.info("Using EasyOCR for scanned PDF...")
-                extracted_text = _extract_from_pdf_easyocr(content)
-            
-            # Try pymupdf OCR
-            if (not extracted_text or len(extracted_text.strip()) < 50) and PYMUPDF_OCR_AVAILABLE:
-                logger.info("Trying pymupdf OCR...")
-                extracted_text = _extract_from_pdf_pymupdf_ocr(content)
-            
-            # Try pytesseract OCR
-            if (not extracted_text or len(extracted_text.strip()) < 50) and OCR_AVAILABLE:
-                logger.info("Trying pytesseract OCR...")
-                extracted_text = _extract_from_pdf_ocr(content)
-            
-            if not extracted_text or len(extracted_text.strip()) < 50:
-                raise ValueError(
-                    "This PDF appears to be a scanned image and OCR extraction failed. "
-                    "Please upload a text-based PDF or DOCX file instead."
-                )
-
-    # DOCX handling
-    elif file_ext == "docx" or "wordprocessingml" in content_type or "docx" in content_type:
-        try:
-            doc = docx.Document(io.BytesIO(content))
-            extracted_text = "\n".join(p.text for p in doc.paragraphs)
-        except Exception:
-            raise ValueError("Invalid DOCX file. Please convert to .docx if needed.")
-
-    elif file_ext in ["png", "jpg", "jpeg", "bmp", "tiff", "webp"] or "image" in content_type:
-        logger.info("Processing image file for OCR extraction...")
+    return await extract_text_from_bytes_async(content, filename)
 
-    # Try EasyOCR first
-    if EASYOCR_AVAILABLE:
-        try:
-            extracted_text = _extract_from_image_easyocr(content)
-        except Exception:
-            extracted_text = ""
-
-    # Fallback to pytesseract
-    if (not extracted_text or len(extracted_text.strip()) < 20) and OCR_AVAILABLE:
-        try:
-            extracted_text = _extract_from_image_tesseract(content)
-        except Exception:
-            extracted_text = ""
-
-    if not extracted_text or len(extracted_text.strip()) < 20:
-        raise ValueError(
-            "Text extraction from image failed. Please upload a clearer image or a PDF/DOCX file."
-        )
-    
-    else:
-        raise ValueError("Unsupported file format. Please upload PDF, DOCX, or Image files.")
-    
-    # Normalize text
-    normalized_text = _normalize_text(extracted_text)
-    
-    if not normalized_text or len(normalized_text.strip()) < 50:
-        raise ValueError("Resume text is too short or empty after extraction.")
-    
-    return normalized_text
 
-
-def extract_profile_picture_from_pdf(content: bytes) -> bytes:
+def extract_profile_picture_from_pdf(content: Union[bytes, ParsedDocument]) -> bytes:
     """
     Extracts the most likely profile picture from the first page of a PDF.
     Returns the image bytes or None.
@@ -347,48 +286,90 @@ def extract_profile_picture_from_pdf(content: bytes) -> bytes:
     if not PYMUPDF_AVAILABLE:
         return None
 
+    document, owned = _as_document(content, "document.pdf")
     try:
-        doc = fitz.open(stream=content, filetype="pdf")
-        if len(doc) == 0:
+        if document.page_count == 0:
             return None
-        
+
         # Only look at the first page for profile pictures
-        page = doc[0]
-        image_list = page.get_images(full=True)
-        
-        best_image_bytes = None
+        best_xref = None
         best_image_score = -1
 
-        for img in image_list:
-            xref = img[0]
-            base_image = doc.extract_image(xref)
-            if not base_image:
-                continue
-            
-            image_bytes = base_image["image"]
-            width = base_image["width"]
-            height = base_image["height"]
-            
+        for image in document.embedded_images(0):
+            width = image["width"]
+            height = image["height"]
+
             # Filter out tiny icons and massive background graphics
             if width < 80 or height < 80 or width > 800 or height > 800:
                 continue
-                
+
             # Profile pictures are usually somewhat square / portrait
             aspect_ratio = width / height
             if aspect_ratio < 0.5 or aspect_ratio > 1.5:
                 continue
-                
+
             # Score based on size (prefer decently sized images)
             score = width * height
             if score > best_image_score:
                 best_image_score = score
-                best_image_bytes = image_bytes
-                
-        doc.close()
-        return best_image_bytes
+                best_xref = image["xref"]
+
+        # Only the chosen image is decoded
+        return document.image_bytes(best_xref) if best_xref is not None else None
     except Exception as e:
         logger.warning(f"Profile picture extraction failed: {e}")
         return None
+    finally:
+        if owned:
+            document.close()
+
+async def extract_profile_picture_from_pdf_async(content: bytes) -> bytes:
+    """Run extract_profile_picture_from_pdf in the extraction sandbox (or pool)."""
+    return await _run_parser(extract_profile_picture_from_pdf, content)
+
+
+# ============================================================================
+# PREVIEWS
+# ============================================================================
+
+def thumbnail_sizes() -> List[int]:
+    """Profile thumbnail sizes (pixels on the long side) from RESUME_THUMBNAIL_SIZES."""
+    return sorted({int(size) for size in settings.RESUME_THUMBNAIL_SIZES.split(",") if size.strip()})
+
+
+def webp_thumbnail(image_bytes: bytes, size: int, quality: int) -> Optional[bytes]:
+    """The image scaled down to fit `size` x `size`, as WebP (None if it cannot be decoded)."""
+    try:
+        with require("pillow").open(io.BytesIO(image_bytes)) as image:
+            # JPEGs are decoded at a reduced scale when the thumbnail is much smaller
+            image.draft("RGB", (size, size))
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            image.thumbnail((size, size))
+            buffer = io.BytesIO()
+            image.save(buffer, format="WEBP", quality=quality)
+            return buffer.getvalue()
+    except Exception as e:
+        logger.warning(f"Profile thumbnail ({size}px) failed: {e}")
+        return None
+
+
+def render_previews(document: ParsedDocument) -> ParsedDocument:
+    """
+    Render the preview images of a PDF resume (in the extraction pool, while
+    the document is open): `page_preview`, a compressed WebP of the first
+    page, and `profile_thumbnails`, WebP thumbnails of the profile picture
+    by size. List views show these instead of downloading the resume.
+    """
+    if not document.is_pdf or not is_available("pillow"):
+        return document
+    document.page_preview = document.render_preview(0, settings.RESUME_PREVIEW_WIDTH, settings.RESUME_PREVIEW_QUALITY)
+    picture = extract_profile_picture_from_pdf(document)
+    if picture:
+        for size in thumbnail_sizes():
+            thumbnail = webp_thumbnail(picture, size, settings.RESUME_PREVIEW_QUALITY)
+            if thumbnail:
+                document.profile_thumbnails[size] = thumbnail
+    return document
 
 def _extract_from_pdf_pymupdf(content: bytes) -> str:
     """Extract text from PDF using pymupdf (fitz) - faster than pdfplumber."""
@@ -397,7 +378,7 @@ def _extract_from_pdf_pymupdf(content: bytes) -> str:
         return ""
     try:
         text = ""
-        doc = fitz.open(stream=content, filetype="pdf")
+        doc = require("pymupdf").open(stream=content, filetype="pdf")
         for page in doc:
             page_text = page.get_text()
             text += page_text + "\n"
@@ -408,80 +389,12 @@ def _extract_from_pdf_pymupdf(content: bytes) -> str:
         return ""
 
 
-def _extract_from_pdf_pymupdf_ocr(content: bytes) -> str:
-    """Extract text from scanned PDF using pymupdf OCR."""
-    print("_extract_from_pdf_pymupdf_ocr: Starting OCR extraction...")
-    if not PYMUPDF_AVAILABLE:
-        return ""
-    try:
-        text = ""
-        doc = fitz.open(stream=content, filetype="pdf")
-        for page in doc:
-            # Use pymupdf's OCR capability
-            page_text = page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-            if not page_text or len(page_text.strip()) < 20:
-                # Try OCR if direct text extraction failed
-                try:
-                    page_text = page.get_text(textpage=None, option=fitz.TEXT_OUTPUT_TEXT)
-                except Exception:
-                    pass
-            text += page_text + "\n"
-        doc.close()
-        return text
-    except Exception as e:
-        logger.warning(f"pymupdf OCR extraction failed: {e}")
-        return ""
-
-
-def _extract_from_pdf_easyocr(content: bytes) -> str:
-    """Extract text from scanned PDF using EasyOCR (pure Python, no external binaries)."""
-    print("_extract_from_pdf_easyocr: Starting EasyOCR extraction...")
-    if not EASYOCR_AVAILABLE or not PYMUPDF_AVAILABLE:
-        return ""
-    
-    try:
-        import numpy as np
-        from PIL import Image
-        
-        reader = _get_easyocr_reader()
-        if reader is None:
-            return ""
-        
-        text = ""
-        doc = fitz.open(stream=content, filetype="pdf")
-        
-        for page_num, page in enumerate(doc):
-            logger.info(f"Processing page {page_num + 1}/{len(doc)} with EasyOCR...")
-            
-            # Convert page to image (high DPI for better OCR)
-            mat = fitz.Matrix(2, 2)  # 2x zoom for better resolution
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to numpy array for EasyOCR
-            img_data = pix.tobytes("ppm")
-            img = Image.open(io.BytesIO(img_data))
-            img_array = np.array(img)
-            
-            # Run OCR
-            results = reader.readtext(img_array, detail=0, paragraph=True)
-            page_text = "\n".join(results)
-            text += page_text + "\n\n"
-        
-        doc.close()
-        logger.info(f"EasyOCR extracted {len(text)} characters")
-        return text
-        
-    except Exception as e:
-        logger.warning(f"EasyOCR extraction failed: {e}")
-        return ""
-
-
 def _extract_from_pdf(content: bytes) -> str:
     """Extract text from PDF using pdfplumber."""
     print("_extract_from_pdf: Starting extraction with pdfplumber...")
     try:
         text = ""
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
+        with require("pdfplumber").open(io.BytesIO(content)) as pdf:
             for page in pdf.pages:
                 page_text = page.extract_text() or ""
                 text += page_text + "\n"
@@ -490,21 +403,101 @@ def _extract_from_pdf(content: bytes) -> str:
         return ""
 
 
-def _extract_from_pdf_ocr(content: bytes) -> str:
-    """Extract text from PDF using OCR (pytesseract + pdf2image)."""
-    print("_extract_from_pdf_ocr: Starting OCR extraction with pytesseract...")
-    if not OCR_AVAILABLE:
-        return ""
-    
+# ============================================================================
+# PER-PAGE OCR
+# ============================================================================
+
+def analyze_pdf_pages(document: ParsedDocument) -> List[Dict[str, Any]]:
+    """
+    Classify each PDF page by its text layer and image coverage.
+    Returns the document's page layouts, each with needs_ocr added.
+    """
+    return [{**page, "needs_ocr": _page_needs_ocr(page)} for page in document.page_layouts()]
+
+
+def _page_needs_ocr(page: Dict[str, Any]) -> bool:
+    return page["text_chars"] < PAGE_MIN_TEXT_CHARS or (
+        page["image_coverage"] >= PAGE_IMAGE_COVERAGE and page["text_chars"] < PAGE_IMAGE_MIN_TEXT_CHARS
+    )
+
+
+def _join_pages(texts) -> str:
+    return "".join((text or "") + "\n" for text in texts)
+
+
+def _pdf_needs_ocr(pages: List[Dict[str, Any]]) -> bool:
+    """OCR only when some page lacks a usable text layer and the text layer alone is not enough."""
+    if not pages:
+        return True
+    if not any(page["needs_ocr"] for page in pages):
+        return False
+    return _ocr_chars_wanted([page["text"] for page in pages]) != 0
+
+
+def _ocr_chars_wanted(texts: List[str]) -> Optional[int]:
+    """How much OCR text is still wanted on top of the text layer (None: no limit, 0: none)."""
+    enough = settings.OCR_ENOUGH_TEXT_CHARS
+    if not enough or enough <= 0:
+        return None
+    return max(0, enough - sum(len((text or "").strip()) for text in texts))
+
+
+def _ocr_dpi(width: float, height: float) -> int:
+    """Render DPI for a page of the given size in points, so its long side is about OCR_TARGET_LONG_SIDE_PX."""
+    long_side_inches = max(width, height, 1.0) / 72
+    return int(min(OCR_MAX_DPI, max(OCR_MIN_DPI, OCR_TARGET_LONG_SIDE_PX / long_side_inches)))
+
+
+def plan_pdf_ocr(document: ParsedDocument) -> Dict[str, Any]:
+    """
+    Text layer per page, plus grayscale PNGs of the pages that need OCR.
+    Returns {"texts", "ocr_pages", "images"}; renders are cached on the document.
+    """
+    logger.debug("plan_pdf_ocr: classifying pages and rendering the ones that need OCR")
+    pages = analyze_pdf_pages(document)
+    plan = {"texts": [page["text"] for page in pages], "ocr_pages": [], "images": []}
+    if not pages:
+        # Unreadable page tree: try rendering every page
+        pages = [{"needs_ocr": True, "width": 0, "height": 0} for _ in range(document.pages_to_read)]
+        plan["texts"] = ["" for _ in pages]
+
+    for index, page in enumerate(pages):
+        if not page["needs_ocr"]:
+            continue
+        image = document.render_page(index, _ocr_dpi(page["width"], page["height"]))
+        if image:
+            plan["ocr_pages"].append(index)
+            plan["images"].append(image)
+    return plan
+
+
+def _plan_pdf_ocr_bytes(content: bytes) -> Dict[str, Any]:
+    with ParsedDocument(content, "document.pdf") as document:
+        return plan_pdf_ocr(document)
+
+
+def _merge_ocr_pages(plan: Dict[str, Any], ocr_texts: List[Optional[str]]) -> str:
+    """Page texts in order, using the OCR text for pages where it recovered more than the text layer."""
+    texts = list(plan["texts"])
+    for index, ocr_text in zip(plan["ocr_pages"], ocr_texts):
+        if ocr_text and len(ocr_text.strip()) > len((texts[index] or "").strip()):
+            texts[index] = ocr_text
+    return _join_pages(texts)
+
+
+def _extract_from_pdf_ocr(content: Union[bytes, ParsedDocument]) -> str:
+    """Extract text from a PDF, OCR'ing the pages without a usable text layer through the shared OCR service (blocking)."""
+    print("_extract_from_pdf_ocr: Starting OCR extraction...")
+    document, owned = _as_document(content, "document.pdf")
     try:
-        images = convert_from_bytes(content)
-        text = ""
-        for image in images:
-            page_text = pytesseract.image_to_string(image)
-            text += page_text + "\n"
-        return text
-    except Exception:
-        return ""
+        plan = plan_pdf_ocr(document)
+    finally:
+        if owned:
+            document.close()
+    ocr_texts = get_ocr_service().recognize_pages(plan["images"], stop_after_chars=_ocr_chars_wanted(plan["texts"]))
+    recognized = len([text for text in ocr_texts if text is not None])
+    logger.info(f"OCR'd {recognized}/{len(plan['texts'])} pages ({len(plan['images'])} needed OCR)")
+    return _merge_ocr_pages(plan, ocr_texts)
 
 
 """def _normalize_text(text: str) -> str:
@@ -939,8 +932,9 @@ def _extract_candidate_info_regex(resume_text: str) -> dict:
         'rest api', 'graphql', 'websocket', 'microservices', 'devops',
         'agile', 'scrum', 'jira', 'confluence', 'slack'
     ]
+    skills_in_text = get_skill_matcher(skill_keywords).matched(text)
     for skill in skill_keywords:
-        if skill in text:
+        if skill in skills_in_text:
             info["skills"].append(skill.title())
     info["skills"] = list(set(info["skills"]))
     
@@ -0,0 +1,600 @@
+"""
+Resume ingestion pipeline shared by the upload endpoint and ingestion workers.
+
+Takes raw resume bytes through text extraction, smart candidate extraction,
+B2 upload and scoring, and inserts the resulting application document. The
+B2 uploads run concurrently with parsing, extraction and scoring (see
+PIPELINE STAGES).
+"""
+
+import asyncio
+import hashlib
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException, Request
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.schemas.job import ApplicationStatus
+from app.services.b2_storage_service import delete_resumes_from_b2, upload_resume_to_b2
+from app.services.extraction_cache import EXTRACTOR_VERSION, get_extraction_cache, normalize_extracted_text
+from app.services.extraction_executor import (
+    ExtractionAbortedError,
+    ExtractionQueueFullError,
+    ExtractionTimeoutError,
+)
+from app.services.job_scores import replace_application_scores, to_global_score_entry
+from app.services.parsed_document import ParsedDocument, file_extension
+from app.services.resume_extractor import (
+    extract_profile_picture_from_pdf,
+    extract_text_from_document_async,
+    parse_document_async,
+    thumbnail_sizes,
+)
+from app.services.scoring_engine import evaluate_application_v2, evaluate_against_jobs
+from app.services.skill_index import get_skill_index
+from app.services.smart_extractor import smart_extract_candidate_info
+from app.services.upload_stream import StreamedUpload, receive_upload
+
+ALLOWED_RESUME_EXTENSIONS = ["pdf", "doc", "docx"]
+MAX_RESUME_SIZE = 5 * 1024 * 1024
+
+
+def compute_file_hash(file_content: bytes) -> str:
+    """MD5 of the raw file, used for duplicate detection."""
+    return hashlib.md5(file_content).hexdigest()
+
+
+async def receive_resume_upload(request: Request) -> StreamedUpload:
+    """
+    Stream a resume upload (form fields `file` and optional `job_id`),
+    rejecting a wrong extension, content or size while it is received.
+    """
+    return await receive_upload(
+        request,
+        max_bytes=MAX_RESUME_SIZE,
+        allowed_extensions=ALLOWED_RESUME_EXTENSIONS,
+        extension_error="Only PDF, DOC, and DOCX files are allowed.",
+        size_error="File size exceeds the 5MB limit."
+    )
+
+
+async def get_job_or_404(db: AsyncIOMotorDatabase, job_id: Optional[str]) -> Optional[dict]:
+    """Load the target job when one is given."""
+    if not job_id:
+        return None
+    job = await db.jobs.find_one({"_id": ObjectId(job_id)})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+async def check_duplicate_file(db: AsyncIOMotorDatabase, job_id: Optional[str], file_hash: str):
+    """Reject an exact duplicate file for the same job."""
+    existing_by_hash = await db.applications.find_one({
+        "job_id": job_id,
+        "file_hash": file_hash
+    })
+    if existing_by_hash:
+        raise HTTPException(
+            status_code=400,
+            detail="This exact resume file has already been uploaded for this job"
+        )
+
+
+async def extract_resume(
+    db: AsyncIOMotorDatabase,
+    file_content: Optional[bytes],
+    filename: str,
+    file_hash: str,
+    document: Optional[ParsedDocument] = None,
+    file_path: Optional[str] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract text and candidate data from a resume, reusing a cached result for
+    the same file and extractor version. Returns (extracted_text, parsed_candidate_data).
+    """
+    cached = await get_extraction_cache().get(db, file_hash)
+    if cached:
+        # Same file was extracted before (possibly for another job): skip parsing, OCR and LLM
+        print(f"✓ Extraction cache hit for {filename} ({file_hash})")
+        return cached["extracted_text"], cached["parsed_candidate_data"]
+    return await extract_resume_uncached(db, file_content, filename, file_hash, document, file_path)
+
+
+async def extract_resume_uncached(
+    db: AsyncIOMotorDatabase,
+    file_content: Optional[bytes],
+    filename: str,
+    file_hash: str,
+    document: Optional[ParsedDocument] = None,
+    file_path: Optional[str] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract text and candidate data after an extraction cache miss, and cache
+    the result. Returns (extracted_text, parsed_candidate_data).
+
+    `document` is the upload already parsed by parse_document_async; without
+    it the file (`file_content`, or the spooled upload at `file_path`) is
+    parsed here.
+    """
+    # Parse in the extraction process pool and OCR in the OCR service so the event loop stays free
+    if document is None:
+        document = await parse_document_async(file_content, filename, profile_picture=False, path=file_path)
+    extracted_text = normalize_extracted_text(await extract_text_from_document_async(document))
+
+    # Use Smart Extractor (3-tier: LlamaParse+Groq -> Mistral7B -> Regex)
+    parsed_candidate_data = await smart_extract_candidate_info(
+        file_content=file_content,
+        filename=filename,
+        resume_text=extracted_text,
+        document=document
+    )
+    await get_extraction_cache().put(db, file_hash, extracted_text, parsed_candidate_data)
+
+    extraction_tier = parsed_candidate_data.get('extraction_tier', 0)
+    tier_names = {1: 'LlamaParse+Groq', 2: 'Mistral 7B', 3: 'Regex', 0: 'Failed'}
+
+    print(f"✓ Successfully extracted {len(extracted_text)} chars from {filename}")
+    print(f"✓ Extraction Tier: {extraction_tier} ({tier_names.get(extraction_tier, 'Unknown')})")
+    print(f"✓ Parsed data: name={parsed_candidate_data.get('name')}, skills={len(parsed_candidate_data.get('skills', []))}")
+    return extracted_text, parsed_candidate_data
+
+
+def candidate_fields(parsed_candidate_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Application fields derived from extraction (flattened candidate info plus extraction metadata)."""
+    return {
+        "candidate_name_extracted": parsed_candidate_data.get("name"),
+        "candidate_email": parsed_candidate_data.get("email"),
+        "candidate_phone": parsed_candidate_data.get("phone"),
+        "candidate_linkedin": parsed_candidate_data.get("linkedin_url"),
+        "candidate_github": parsed_candidate_data.get("github_url"),
+        "candidate_experience_years": parsed_candidate_data.get("experience_years", 0),
+        "candidate_experience_months": parsed_candidate_data.get("experience_months", 0),
+        "candidate_education": parsed_candidate_data.get("education", []),
+        "candidate_skills": parsed_candidate_data.get("skills", []),
+        "candidate_certifications": parsed_candidate_data.get("certifications", []),
+        "candidate_summary": parsed_candidate_data.get("summary", ""),
+        "extraction_method": parsed_candidate_data.get("extraction_method", "regex"),
+        "extraction_tier": parsed_candidate_data.get("extraction_tier", 3),
+        "extractor_version": EXTRACTOR_VERSION,
+
+        # NEW: Rich extraction data from Smart Extractor
+        "experience_details": parsed_candidate_data.get("experience_details", []),
+        "domain_experience": parsed_candidate_data.get("domain_experience", []),
+        "awards": parsed_candidate_data.get("awards", []),
+        "education_details": parsed_candidate_data.get("education_details", []),
+    }
+
+
+# ============================================================================
+# PIPELINE STAGES
+# ============================================================================
+#
+# process_resume_upload runs as a small DAG; each stage starts as soon as its inputs exist:
+#
+#   check duplicates --+--> store_resume -----------------------------------------------------+
+#                      |                                                                       |
+#                      +--> cache_lookup (miss) --> parse --+--> store_profile_picture --------+
+#                      |                                    +--> store_previews ---------------+--> insert
+#                      |                                    |                                  |
+#                      |                                    +--> extract --> score_job,  ------+
+#                      |                                                     score_active_jobs |
+#                      +--> cache_lookup (hit) --+--> store_images (images-only parse) --------+
+#                                                +--> score_job, score_active_jobs ------------+
+#
+# Failure semantics:
+#   - parse/extract errors: rejected (422/503) for budget/queue errors, otherwise stored with empty data
+#   - extraction cache hit: nothing is rejected for parsing; an images-only parse failure drops the images
+#   - scoring errors: zero scores, the application and its files are kept
+#   - resume upload errors: retried STORAGE_UPLOAD_ATTEMPTS times, then the ingestion fails (500,
+#     which the ingest queue retries); a profile picture or preview upload failure only drops that image
+#   - any failure before the application is inserted: the stored files are deleted (compensation)
+
+RESUME_MIME_TYPES = {
+    "pdf": "application/pdf",
+    "doc": "application/msword",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+STORAGE_RETRY_DELAY = 0.5
+
+# Background compensation tasks (referenced so they are not garbage collected mid-run)
+_compensations: set = set()
+
+
+class PipelineStages:
+    """Runs the stages of one upload, as awaited coroutines or background tasks, and times each."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    def start(self, name: str, coro) -> asyncio.Task:
+        """Start a stage in the background."""
+        return asyncio.create_task(self._timed(name, coro), name=f"resume_pipeline:{name}")
+
+    async def run(self, name: str, coro):
+        """Run a stage and wait for it."""
+        return await self._timed(name, coro)
+
+    async def _timed(self, name: str, coro):
+        started = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.timings[name] = round(time.perf_counter() - started, 3)
+
+    def summary(self) -> Dict[str, float]:
+        """Seconds per stage plus the total so far (stages overlap, so they do not add up to it)."""
+        return {**self.timings, "total": round(time.perf_counter() - self.started, 3)}
+
+
+async def store_resume_file(
+    file_content: bytes, blob_name: str, file_ext: str, file_path: Optional[str] = None
+) -> Tuple[str, str]:
+    """Upload the resume to B2, retrying storage errors with backoff. Returns (file_name, url)."""
+    attempts = max(1, settings.STORAGE_UPLOAD_ATTEMPTS)
+    for attempt in range(1, attempts + 1):
+        try:
+            return await upload_resume_to_b2(
+                file_content, blob_name, RESUME_MIME_TYPES.get(file_ext, "application/octet-stream"), file_path=file_path
+            )
+        except HTTPException as e:
+            if e.status_code < 500 or attempt == attempts:
+                raise
+            print(f"✗ Resume upload attempt {attempt}/{attempts} failed: {e.detail}; retrying")
+            await asyncio.sleep(STORAGE_RETRY_DELAY * 2 ** (attempt - 1))
+
+
+async def store_profile_picture(document: ParsedDocument, blob_name: str) -> Optional[str]:
+    """Upload the profile picture found while parsing, if any. Returns its URL; never raises."""
+    try:
+        # Chosen and decoded while the document was parsed, so this does not re-open the PDF
+        profile_pic_bytes = extract_profile_picture_from_pdf(document)
+        if profile_pic_bytes:
+            _, profile_image_url = await upload_resume_to_b2(profile_pic_bytes, blob_name, "image/jpeg")
+            print(f"✓ Profile picture extracted and uploaded: {profile_image_url}")
+            return profile_image_url
+    except Exception as e:
+        print(f"✗ Profile picture extraction/upload error: {e}")
+    return None
+
+
+async def store_previews(document: ParsedDocument, blob_stem: str) -> Dict[str, Any]:
+    """
+    Upload the preview images rendered while parsing (see render_previews),
+    concurrently. Returns the resume_preview_url and profile_thumbnail_urls
+    (by size) of the application; never raises.
+    """
+    uploads = {}
+    if document.page_preview:
+        uploads["page"] = upload_resume_to_b2(document.page_preview, f"{blob_stem}_preview.webp", "image/webp")
+    for size, thumbnail in document.profile_thumbnails.items():
+        uploads[str(size)] = upload_resume_to_b2(thumbnail, f"{blob_stem}_profile_{size}.webp", "image/webp")
+
+    results = await asyncio.gather(*uploads.values(), return_exceptions=True)
+    urls = {}
+    for name, result in zip(uploads, results):
+        if isinstance(result, BaseException):
+            print(f"✗ Preview upload error ({name}): {getattr(result, 'detail', result)}")
+        else:
+            urls[name] = result[1]
+    return {
+        "resume_preview_url": urls.pop("page", None),
+        "profile_thumbnail_urls": urls,
+    }
+
+
+async def store_cached_upload_images(
+    file_content: Optional[bytes], filename: str, file_path: Optional[str], pic_filename: str, blob_stem: str
+) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    For a PDF whose extraction is cached: parse it only for the profile
+    picture and previews (no text layer, no OCR renders) and upload them.
+    Returns (profile_image_url, previews) like the two stages it stands in
+    for. Never raises: a busy queue or a blown parsing budget only drops the images.
+    """
+    try:
+        document = await parse_document_async(
+            file_content, filename, path=file_path, previews=settings.RESUME_PREVIEWS_ENABLED, text=False
+        )
+    except Exception as e:
+        print(f"✗ Profile picture/preview parse failed for {filename}: {e}")
+        return None, {}
+
+    uploads = [store_profile_picture(document, pic_filename)]
+    if settings.RESUME_PREVIEWS_ENABLED:
+        uploads.append(store_previews(document, blob_stem))
+    results = await asyncio.gather(*uploads)
+    return results[0], results[1] if len(results) > 1 else {}
+
+
+def preview_blob_names(blob_stem: str) -> List[str]:
+    """Names of every preview image store_previews may create for a resume."""
+    return [f"{blob_stem}_preview.webp"] + [f"{blob_stem}_profile_{size}.webp" for size in thumbnail_sizes()]
+
+
+def compensate_stored_files(tasks: List[asyncio.Task], blob_names: List[str]):
+    """
+    Delete the files of an upload that did not become an application. Runs
+    in the background: uploads still in flight are allowed to finish first
+    (their worker threads would complete them even if cancelled), then
+    everything that may have been stored is removed.
+    """
+    async def _compensate():
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await delete_resumes_from_b2(blob_names)
+
+    task = asyncio.create_task(_compensate())
+    _compensations.add(task)
+    task.add_done_callback(_compensations.discard)
+
+
+async def score_for_job(
+    parsed_candidate_data: Dict[str, Any], extracted_text: str, job: Optional[dict]
+) -> Dict[str, Any]:
+    """Production scoring v2 against the target job (zero scores without a job or on error)."""
+    scoring_result = {
+        "skill_score": 0.0,
+        "experience_score": 0.0,
+        "education_score": 0.0,
+        "final_score": 0.0,
+        "matched_skills": [],
+        "missing_skills": [],
+        "skill_coverage": 0.0,
+        "breakdown": {}
+    }
+
+    if job:
+        try:
+            scoring_result = await evaluate_application_v2(
+                parsed_candidate_data,
+                extracted_text,
+                job
+            )
+        except Exception as e:
+            import traceback
+            print(f"Scoring error: {e}")
+            traceback.print_exc()
+    return scoring_result
+
+
+async def score_for_active_jobs(
+    db: AsyncIOMotorDatabase, parsed_candidate_data: Dict[str, Any], extracted_text: str
+) -> List[Tuple[dict, Dict[str, Any]]]:
+    """Score against every active job for Resume Database (global talent pool). Returns (job, score) pairs."""
+    active_jobs = await db.jobs.find({"is_active": {"$ne": False}}).to_list(length=None)
+    try:
+        job_scores = await evaluate_against_jobs(parsed_candidate_data, extracted_text, active_jobs)
+    except Exception as e:
+        print(f"Error scoring against active jobs: {e}")
+        job_scores = []
+    scored_jobs = []
+    for active_job, job_score in zip(active_jobs, job_scores):
+        if job_score is None:
+            print(f"Error scoring against job {active_job.get('_id')}: invalid job data")
+            continue
+        scored_jobs.append((active_job, job_score))
+    return scored_jobs
+
+
+async def process_resume_upload(
+    db: AsyncIOMotorDatabase,
+    file_content: Optional[bytes],
+    filename: str,
+    job_id: Optional[str],
+    uploaded_by: str,
+    job: Optional[dict] = None,
+    extra_fields: Optional[Dict[str, Any]] = None,
+    file_hash: Optional[str] = None,
+    file_path: Optional[str] = None,
+    file_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run the full ingestion pipeline for one resume and insert the application.
+
+    The file has already been validated (type and size) by the caller: the
+    streamed upload, the bulk importer, or the upload that queued it.
+
+    `file_hash`, `file_path` and `file_size` come from a streamed upload
+    (hashed while it was received, spooled to disk): `file_content` may then
+    be None. The hash is not recomputed, the file is stored and parsed from
+    its path, and its bytes are only read if a later step needs them.
+
+    Raises HTTPException for validation/duplicate errors so both the HTTP
+    endpoint and the ingestion worker can report them the same way.
+    Returns the inserted application document with a string `_id`.
+    """
+    file_ext = file_extension(filename)
+    if job_id and job is None:
+        job = await get_job_or_404(db, job_id)
+
+    # Generate file hash for duplicate detection
+    file_hash = file_hash or compute_file_hash(file_content)
+
+    # Check by file hash to detect exact duplicate files early
+    await check_duplicate_file(db, job_id, file_hash)
+
+    # Neutral names (not derived from the extracted candidate name) so the files can be
+    # stored while the resume is still being parsed
+    blob_stem = f"resume_{int(time.time())}_{uuid.uuid4().hex[:12]}"
+    drive_filename = f"{blob_stem}.{file_ext}"
+    pic_filename = f"{blob_stem}_profile.jpg"
+    # Stored alongside the resume and deleted with it
+    derived_filenames = [pic_filename] + (preview_blob_names(blob_stem) if settings.RESUME_PREVIEWS_ENABLED else [])
+
+    stages = PipelineStages()
+    store_task = stages.start("store_resume", store_resume_file(file_content, drive_filename, file_ext, file_path))
+    profile_task = None
+    previews_task = None
+    images_task = None
+
+    try:
+        # Extract text and parsed data using the bytes
+        extracted_text = ""
+        parsed_candidate_data = {}
+        document = None
+
+        cached = await stages.run("cache_lookup", get_extraction_cache().get(db, file_hash))
+        if cached:
+            # Re-upload of a known file: reuse its extraction (no text parsing, OCR or LLM call).
+            # The PDF is only parsed, in the background, for its profile picture and previews
+            print(f"✓ Extraction cache hit for {filename} ({file_hash})")
+            extracted_text = cached["extracted_text"]
+            parsed_candidate_data = cached["parsed_candidate_data"]
+            if file_ext == "pdf":
+                images_task = stages.start(
+                    "store_images", store_cached_upload_images(file_content, filename, file_path, pic_filename, blob_stem)
+                )
+        else:
+            try:
+                # Parse the file once; text extraction, Tier 1 and the profile picture all reuse it
+                document = await stages.run("parse", parse_document_async(
+                    file_content, filename, path=file_path, previews=settings.RESUME_PREVIEWS_ENABLED
+                ))
+                if file_ext == "pdf" and document is not None:
+                    profile_task = stages.start("store_profile_picture", store_profile_picture(document, pic_filename))
+                    if settings.RESUME_PREVIEWS_ENABLED:
+                        previews_task = stages.start("store_previews", store_previews(document, blob_stem))
+                extracted_text, parsed_candidate_data = await stages.run("extract", extract_resume_uncached(
+                    db, file_content, filename, file_hash, document=document, file_path=file_path
+                ))
+            except ExtractionQueueFullError:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Resume extraction is busy right now. Please retry in a few seconds."
+                )
+            except (ExtractionTimeoutError, ExtractionAbortedError) as e:
+                # The file blew its parsing budget (time or memory): reject it instead of storing an empty application
+                print(f"✗ Resume parsing budget exceeded for {filename}: {e}")
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"The resume could not be parsed within the allowed time and memory limits ({e}). "
+                           "Please upload a simpler or smaller file."
+                )
+            except Exception as e:
+                import traceback
+                print(f"✗ Resume extraction error: {e}")
+                traceback.print_exc()
+                extracted_text = ""
+                parsed_candidate_data = {}
+
+        # Check for duplicate resume (same candidate email for same job)
+        candidate_email = parsed_candidate_data.get("email")
+        if candidate_email:
+            existing_app = await db.applications.find_one({
+                "job_id": job_id,
+                "candidate_email": candidate_email
+            })
+            if existing_app:
+                if job_id:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"A resume for candidate with email '{candidate_email}' already exists for this job"
+                    )
+                else:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"A global resume for candidate with email '{candidate_email}' already exists"
+                    )
+
+        # Production scoring v2, for this job and for every active job (Resume Database), concurrently.
+        # Scoring failures fall back to zero scores; the stored files are kept
+        scoring_result, scored_jobs = await asyncio.gather(
+            stages.run("score_job", score_for_job(parsed_candidate_data, extracted_text, job if job_id else None)),
+            stages.run("score_active_jobs", score_for_active_jobs(db, parsed_candidate_data, extracted_text))
+        )
+        scored_at = datetime.utcnow()
+
+        # The files were uploading all along; a resume upload that still fails after its retries fails the ingestion
+        file_name, file_url = await store_task
+        profile_image_url = await profile_task if profile_task else None
+        previews = await previews_task if previews_task else {}
+        if images_task:
+            profile_image_url, previews = await images_task
+
+        application_doc = {
+            "job_id": job_id,
+            "uploaded_by": uploaded_by,  # HR/Admin who uploaded the resume
+            "job_title": job.get("title") if job else None,
+            "file_name": file_name,
+            "file_size": file_size if file_size is not None else len(file_content),
+            "resume_url": file_url,
+            "profile_image_url": profile_image_url,
+            "resume_preview_url": previews.get("resume_preview_url"),
+            "profile_thumbnail_urls": previews.get("profile_thumbnail_urls", {}),
+            "derived_file_names": derived_filenames,
+            "extracted_text": extracted_text,
+
+            # Scores (raw 0-100 scale)
+            "skill_score": scoring_result.get("skill_score", 0.0),
+            "experience_score": scoring_result.get("experience_score", 0.0),
+            "education_score": scoring_result.get("education_score", 0.0),
+            "final_score": scoring_result.get("final_score", 0.0),
+
+            # Score display format (showing contribution out of max weight)
+            # Weights: skill=50%, experience=35%, education=15%
+            "score_display": {
+                "skill": f"{round(scoring_result.get('skill_score', 0.0) * 0.50, 1)}/50",
+                "experience": f"{round(scoring_result.get('experience_score', 0.0) * 0.35, 1)}/35",
+                "education": f"{round(scoring_result.get('education_score', 0.0) * 0.15, 1)}/15",
+                "total": f"{round(scoring_result.get('final_score', 0.0), 1)}/100"
+            },
+
+            # Scoring breakdown (actual contribution values)
+            "score_breakdown": scoring_result.get("breakdown", {}),
+
+            # Skill matching details
+            "matched_skills": scoring_result.get("matched_skills", []),
+            "missing_skills": scoring_result.get("missing_skills", []),
+            "skill_coverage": scoring_result.get("skill_coverage", 0.0),
+
+            # Candidate extracted info (flattened for easy querying)
+            **candidate_fields(parsed_candidate_data),
+
+            # File hash for duplicate detection
+            "file_hash": file_hash,
+
+            # When per-job scores in job_scores were last computed
+            "scores_updated_at": scored_at,
+
+            # Review workflow fields
+            "review_status": "pending",
+            "review_batch_id": None,
+            "sent_for_review_at": None,
+            "reviewed_at": None,
+            "reviewed_by": None,
+            "comments": [],
+
+            "status": ApplicationStatus.APPLIED.value,
+            "applied_at": datetime.utcnow(),
+
+            # Wall-clock seconds per pipeline stage (stages overlap, see PipelineStages)
+            "pipeline_timings": stages.summary()
+        }
+        if extra_fields:
+            application_doc.update(extra_fields)
+
+        result = await db.applications.insert_one(application_doc)
+    except BaseException:
+        # No application references the files: remove whatever was (or is being) stored
+        compensate_stored_files(
+            [task for task in (store_task, profile_task, previews_task, images_task) if task], [drive_filename, *derived_filenames]
+        )
+        raise
+
+    print(f"✓ Pipeline stages for {filename}: {application_doc['pipeline_timings']}")
+    application_doc["_id"] = str(result.inserted_id)
+
+    # Per-job scores live in the job_scores collection, keyed by application
+    score_docs = await replace_application_scores(
+        db, application_doc["_id"], scored_jobs, scored_at=scored_at, touch_application=False
+    )
+    application_doc["global_job_scores"] = [to_global_score_entry(doc) for doc in score_docs]
+    get_skill_index().add_application(application_doc)
+
+    return application_doc
@@ -12,6 +12,10 @@ All scores normalized to 0-100 scale.
 import re
 from typing import Dict, List, Tuple, Any, Optional
 
+import numpy as np
+
+from app.services.skill_matcher import get_skill_matcher
+
 
 class ResumeScorer:
     """Production-grade resume scoring engine."""
@@ -99,6 +103,195 @@ class ResumeScorer:
             }
         }
     
+    def score_against_jobs(
+        self,
+        parsed_candidate_data: Dict[str, Any],
+        resume_text: str,
+        jobs: List[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Score one candidate against many jobs at once.
+        
+        Produces exactly what score_application would return for each job,
+        but the resume is scanned once for the whole skill vocabulary, and the
+        per-job sums and score formulas run as NumPy array operations.
+        
+        Returns a list aligned with `jobs`; an entry is None when that job's
+        data can't be scored (score_application would raise for it).
+        """
+        if not parsed_candidate_data:
+            parsed_candidate_data = {}
+        if not jobs:
+            return []
+        
+        candidate_years = parsed_candidate_data.get('experience_years', 0)
+        try:
+            if isinstance(candidate_years, bool) or not isinstance(candidate_years, (int, float)):
+                raise TypeError("experience_years is not a number")
+            candidate_skills_lower = set(s.lower() for s in parsed_candidate_data.get('skills', []))
+        except Exception:
+            # Malformed candidate data: let the scalar scorer decide job by job
+            return [self._score_or_none(parsed_candidate_data, resume_text, job) for job in jobs]
+        candidate_education = parsed_candidate_data.get('education', [])
+        
+        # Flatten every job's skill list into parallel arrays indexed into a shared vocabulary
+        vocabulary: Dict[str, int] = {}
+        entry_job: List[int] = []
+        entry_skill: List[int] = []
+        entry_weight: List[float] = []
+        entry_names: List[str] = []
+        job_offsets = [0]
+        job_totals: List[float] = []
+        required_years: List[float] = []
+        education_scores: List[float] = []
+        education_cache: Dict[Any, float] = {}
+        valid = np.ones(len(jobs), dtype=bool)
+        
+        for job_index, job in enumerate(jobs):
+            try:
+                skills, total = self._normalize_job_skills(
+                    job.get('weighted_skills', []) or job.get('required_skills', [])
+                )
+                years = job.get('experience_required', 0)
+                if isinstance(years, bool) or not isinstance(years, (int, float)):
+                    raise TypeError(f"experience_required must be a number, got {type(years).__name__}")
+                
+                job_education = job.get('education_required', None)
+                try:
+                    education_score = education_cache[job_education]
+                except KeyError:
+                    education_score = education_cache[job_education] = self._score_education(candidate_education, job_education)
+                except TypeError:
+                    education_score = self._score_education(candidate_education, job_education)
+            except Exception:
+                valid[job_index] = False
+                skills, total, years, education_score = [], 0.0, 0, 0.0
+            
+            for name, weight, display_name in skills:
+                if name not in vocabulary:
+                    vocabulary[name] = len(vocabulary)
+                entry_job.append(job_index)
+                entry_skill.append(vocabulary[name])
+                entry_weight.append(weight)
+                entry_names.append(display_name)
+            job_offsets.append(len(entry_job))
+            job_totals.append(total)
+            required_years.append(years)
+            education_scores.append(education_score)
+        
+        # Presence of each distinct skill: listed by the candidate or mentioned in the resume
+        skills_in_text = get_skill_matcher(vocabulary).matched(resume_text)
+        skill_present = np.fromiter(
+            (name in candidate_skills_lower or name in skills_in_text for name in vocabulary),
+            dtype=bool,
+            count=len(vocabulary)
+        )
+        
+        entry_job_arr = np.asarray(entry_job, dtype=np.intp)
+        entry_weight_arr = np.asarray(entry_weight, dtype=np.float64)
+        entry_present = skill_present[np.asarray(entry_skill, dtype=np.intp)] if entry_skill else np.zeros(0, dtype=bool)
+        
+        # bincount accumulates in input order, matching the scalar loop's float sums
+        matched_weight = np.bincount(
+            entry_job_arr,
+            weights=np.where(entry_present, entry_weight_arr, 0.0),
+            minlength=len(jobs)
+        )
+        totals = np.asarray(job_totals, dtype=np.float64)
+        has_skills = totals != 0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skill_coverage = np.where(has_skills, matched_weight / np.where(has_skills, totals, 1.0) * 100, 0.0)
+            skill_scores = np.where(has_skills, skill_coverage, 50.0)
+            
+            # Experience, mirroring _score_experience / experience_match
+            required = np.asarray(required_years, dtype=np.float64)
+            years = float(candidate_years)
+            experience_scores = np.where(
+                required == 0,
+                50.0 if years == 0 else 100.0,
+                np.where(
+                    years == 0,
+                    0.0,
+                    np.where(years >= required, 100.0, years / np.where(required == 0, 1.0, required) * 100)
+                )
+            )
+            experience_match = np.where(years >= required, 100.0, years / np.maximum(required, 1) * 100)
+        
+        education = np.asarray(education_scores, dtype=np.float64)
+        final_scores = np.clip(0.50 * skill_scores + 0.35 * experience_scores + 0.15 * education, 0.0, 100.0)
+        
+        skill_list = skill_scores.tolist()
+        coverage_list = skill_coverage.tolist()
+        experience_list = experience_scores.tolist()
+        experience_match_list = np.clip(experience_match, 0.0, 100.0).tolist()
+        final_list = final_scores.tolist()
+        present_list = entry_present.tolist()
+        
+        results: List[Optional[Dict[str, Any]]] = []
+        for job_index in range(len(jobs)):
+            if not valid[job_index]:
+                results.append(None)
+                continue
+            
+            matched_skills = []
+            missing_skills = []
+            if has_skills[job_index]:
+                for entry in range(job_offsets[job_index], job_offsets[job_index + 1]):
+                    (matched_skills if present_list[entry] else missing_skills).append(entry_names[entry])
+            
+            skill_score = skill_list[job_index]
+            experience_score = experience_list[job_index]
+            education_score = education_scores[job_index]
+            results.append({
+                "skill_score": self._clamp_score(skill_score),
+                "experience_score": self._clamp_score(experience_score),
+                "education_score": self._clamp_score(education_score),
+                "final_score": final_list[job_index],
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
+                "skill_coverage": coverage_list[job_index],
+                "experience_match": experience_match_list[job_index],
+                "breakdown": {
+                    "skill_component": skill_score * 0.50,
+                    "experience_component": experience_score * 0.35,
+                    "education_component": education_score * 0.15,
+                }
+            })
+        
+        return results
+    
+    def _score_or_none(
+        self,
+        parsed_candidate_data: Dict[str, Any],
+        resume_text: str,
+        job_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return self.score_application(parsed_candidate_data, resume_text, job_data)
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _normalize_job_skills(job_required_skills: List) -> Tuple[List[Tuple[str, float, str]], float]:
+        """
+        Normalize a job's skills the same way _score_skills does.
+        Returns ([(lowercased name, weight, display name), ...], total weight).
+        """
+        if not job_required_skills:
+            return [], 0.0
+        
+        if isinstance(job_required_skills[0], dict):
+            total = sum(s.get('weight', 1.0) for s in job_required_skills)
+            skills = []
+            for job_skill in job_required_skills:
+                skill_name = job_skill.get('name', '').lower()
+                skills.append((skill_name, job_skill.get('weight', 1.0), job_skill.get('name', skill_name)))
+            return skills, total
+        
+        skills = [(s.lower(), 1.0, s.lower()) for s in job_required_skills]
+        return skills, float(len(skills))
+    
     def _score_skills(
         self,
         candidate_skills: List[str],
@@ -145,14 +338,17 @@ class ResumeScorer:
         matched_weight = 0.0
         missing_skills = []
         
-        for job_skill in weighted_job_skills:
-            skill_name = job_skill.get('name', '').lower()
+        # One word-boundary-aware pass over the resume for all of the job's skills
+        skill_names = [job_skill.get('name', '').lower() for job_skill in weighted_job_skills]
+        skills_in_text = get_skill_matcher(skill_names).matched(resume_text)
+        
+        for job_skill, skill_name in zip(weighted_job_skills, skill_names):
             skill_weight = job_skill.get('weight', 1.0)
             
             # Check if skill is in candidate skills or resume text
             skill_found = (
                 skill_name in candidate_skills_lower or
-                skill_name in resume_text.lower()
+                skill_name in skills_in_text
             )
             
             if skill_found:
@@ -368,3 +564,16 @@ async def evaluate_application_v2(
     """
     scorer = ResumeScorer()
     return scorer.score_application(parsed_candidate_data, resume_text, job_data)
+
+
+async def evaluate_against_jobs(
+    parsed_candidate_data: Dict[str, Any],
+    resume_text: str,
+    jobs: List[Dict[str, Any]]
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Batch version of evaluate_application_v2: one result per job (None if
+    the job couldn't be scored), computed in a single vectorized pass.
+    """
+    scorer = ResumeScorer()
+    return scorer.score_against_jobs(parsed_candidate_data, resume_text, jobs)
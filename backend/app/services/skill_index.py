@@ -0,0 +1,529 @@
+"""
+In-memory inverted skill index over the talent pool.
+
+Each indexed skill keeps a posting list of the applications that have it:
+either listed in their extracted skills or found in the resume text. For a
+job with weighted skills, candidates are shortlisted by summing the weights
+of the skills whose postings contain them. Only that shortlist is loaded
+from MongoDB and scored exactly with ResumeScorer, so finding the best
+candidates for a new job does not wait for a backfill or scan every
+application.
+
+The index lives in the API process:
+- it is built once at startup, or loaded from a snapshot file and caught up
+  with MongoDB;
+- uploads and deletes served by this process update it immediately;
+- applications inserted elsewhere (ingest workers, other API processes) are
+  picked up by a periodic refresh;
+- deleted applications that are still indexed are tombstoned when a query
+  finds them missing.
+
+Resume text is matched against a "text vocabulary": the known technical
+skills plus the skills of active jobs. A job skill outside that vocabulary
+only matches candidates who list it among their extracted skills until the
+index is rebuilt. Such skills are reported in the search result.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from bson import ObjectId
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.services.job_scores import CANDIDATE_SUMMARY_PROJECTION, build_job_score_doc
+from app.services.rescoring import APPLICATION_SCORING_PROJECTION, candidate_from_application
+from app.services.scoring_engine import ResumeScorer
+from app.services.skill_matcher import get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+# New applications are found by ObjectId; look back a little because ids
+# from different clients are only roughly ordered
+_CATCH_UP_OVERLAP = timedelta(minutes=2)
+
+
+def _skill_key(skill: str) -> str:
+    return skill.strip().lower()
+
+
+def _object_id_or_none(value: str) -> Optional[ObjectId]:
+    return ObjectId(value) if ObjectId.is_valid(value) else None
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+class SkillIndex:
+    """
+    Skill -> posting list of row numbers, with a row -> application id table.
+
+    Rows are append-only. Re-indexing an application tombstones its old row
+    and appends a new one, so a posting list never holds the same row twice.
+    Tombstoned rows are dropped by compact().
+    """
+
+    def __init__(self, text_vocabulary: Iterable[str] = ()):
+        self.text_vocabulary: Set[str] = {_skill_key(s) for s in text_vocabulary if isinstance(s, str) and s.strip()}
+        self.built_at = time.time()
+        self.max_object_id: Optional[ObjectId] = None
+
+        self._app_ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._alive = np.zeros(1024, dtype=bool)
+        self._dead = 0
+
+        self._skill_ids: Dict[str, int] = {}
+        self._postings: List[np.ndarray] = []
+        # Rows appended since the posting list was last materialized
+        self._pending: List[List[int]] = []
+
+    def __len__(self) -> int:
+        return len(self._app_ids) - self._dead
+
+    def __contains__(self, application_id: str) -> bool:
+        return application_id in self._row_of
+
+    @property
+    def skill_count(self) -> int:
+        return len(self._skill_ids)
+
+    def skill_keys(self, app: dict) -> Set[str]:
+        """The index keys for an application: its extracted skills plus vocabulary skills found in its text."""
+        keys = {_skill_key(s) for s in app.get("candidate_skills") or [] if isinstance(s, str) and s.strip()}
+        text = app.get("extracted_text") or ""
+        if text and self.text_vocabulary:
+            keys |= get_skill_matcher(self.text_vocabulary).matched(text)
+        return keys
+
+    def add(self, app: dict):
+        """Index (or re-index) one application document."""
+        application_id = str(app["_id"])
+        self.remove(application_id)
+
+        row = len(self._app_ids)
+        self._app_ids.append(application_id)
+        self._row_of[application_id] = row
+        if row >= len(self._alive):
+            self._alive = np.concatenate([self._alive, np.zeros(len(self._alive), dtype=bool)])
+        self._alive[row] = True
+
+        for key in self.skill_keys(app):
+            self._pending[self._skill_id(key)].append(row)
+
+        object_id = _object_id_or_none(application_id)
+        if object_id is not None and (self.max_object_id is None or object_id > self.max_object_id):
+            self.max_object_id = object_id
+
+    def remove(self, application_id: str) -> bool:
+        row = self._row_of.pop(str(application_id), None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._dead += 1
+        if self._dead > 1000 and self._dead * 4 > len(self._app_ids):
+            self.compact()
+        return True
+
+    def _skill_id(self, key: str) -> int:
+        skill_id = self._skill_ids.get(key)
+        if skill_id is None:
+            skill_id = len(self._postings)
+            self._skill_ids[key] = skill_id
+            self._postings.append(np.empty(0, dtype=np.int32))
+            self._pending.append([])
+        return skill_id
+
+    def _posting(self, skill_id: int) -> np.ndarray:
+        pending = self._pending[skill_id]
+        if pending:
+            self._postings[skill_id] = np.concatenate([self._postings[skill_id], np.asarray(pending, dtype=np.int32)])
+            self._pending[skill_id] = []
+        return self._postings[skill_id]
+
+    def compact(self):
+        """Drop tombstoned rows and renumber the rest."""
+        if not self._dead:
+            return
+        rows = len(self._app_ids)
+        alive = self._alive[:rows]
+        new_row = (np.cumsum(alive) - 1).astype(np.int32)
+        for skill_id in range(len(self._postings)):
+            posting = self._posting(skill_id)
+            self._postings[skill_id] = new_row[posting[alive[posting]]]
+
+        self._app_ids = [app_id for app_id, keep in zip(self._app_ids, alive) if keep]
+        self._row_of = {app_id: row for row, app_id in enumerate(self._app_ids)}
+        self._alive = np.ones(max(1024, len(self._app_ids)), dtype=bool)
+        self._alive[len(self._app_ids):] = False
+        self._dead = 0
+
+    def query(self, weighted_skills: List[Tuple[str, float]], k: int) -> List[Tuple[str, float]]:
+        """
+        Up to k (application_id, matched weight) pairs, best first.
+
+        Weights of the skills each candidate has are summed in one bincount
+        over the concatenated posting lists; only candidates with a non-zero
+        sum are ranked, with argpartition to avoid sorting the whole pool.
+        """
+        postings, weights = [], []
+        for name, weight in weighted_skills:
+            skill_id = self._skill_ids.get(_skill_key(name))
+            if skill_id is None or weight <= 0:
+                continue
+            posting = self._posting(skill_id)
+            if len(posting):
+                postings.append(posting)
+                weights.append(np.full(len(posting), weight, dtype=np.float64))
+        if not postings or k <= 0:
+            return []
+
+        rows = len(self._app_ids)
+        totals = np.bincount(np.concatenate(postings), weights=np.concatenate(weights), minlength=rows)
+        totals[~self._alive[:rows]] = 0.0
+
+        hits = np.flatnonzero(totals)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-totals[hits], k - 1)[:k]]
+        # Highest weight first, ties by row so results are stable
+        hits = hits[np.lexsort((hits, -totals[hits]))]
+        return [(self._app_ids[row], float(totals[row])) for row in hits]
+
+    # ---- snapshot -----------------------------------------------------------
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        self.compact()
+        postings = [self._posting(skill_id) for skill_id in range(len(self._postings))]
+        offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in postings])
+        return {
+            "format": np.array([SNAPSHOT_FORMAT]),
+            "built_at": np.array([self.built_at]),
+            "app_ids": np.array([app_id.encode() for app_id in self._app_ids], dtype="S"),
+            "skills": np.array(list(self._skill_ids), dtype=str),
+            "offsets": offsets,
+            "postings": np.concatenate(postings) if postings else np.empty(0, dtype=np.int32),
+            "text_vocabulary": np.array(sorted(self.text_vocabulary), dtype=str),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "SkillIndex":
+        if int(arrays["format"][0]) != SNAPSHOT_FORMAT:
+            raise ValueError(f"unsupported skill index snapshot format {arrays['format'][0]}")
+        index = cls(str(s) for s in arrays["text_vocabulary"])
+        index.built_at = float(arrays["built_at"][0])
+
+        index._app_ids = [app_id.decode() for app_id in arrays["app_ids"]]
+        index._row_of = {app_id: row for row, app_id in enumerate(index._app_ids)}
+        index._alive = np.ones(max(1024, len(index._app_ids)), dtype=bool)
+        index._alive[len(index._app_ids):] = False
+
+        offsets, postings = arrays["offsets"], arrays["postings"].astype(np.int32)
+        for skill_id, skill in enumerate(arrays["skills"]):
+            index._skill_ids[str(skill)] = skill_id
+            index._postings.append(postings[offsets[skill_id]:offsets[skill_id + 1]])
+            index._pending.append([])
+
+        object_ids = [oid for oid in map(_object_id_or_none, index._app_ids) if oid is not None]
+        index.max_object_id = max(object_ids) if object_ids else None
+        return index
+
+
+# ============================================================================
+# Service
+# ============================================================================
+
+# Fields needed to compute an application's index keys
+INDEX_PROJECTION = {"candidate_skills": 1, "extracted_text": 1}
+
+
+async def load_text_vocabulary(db: AsyncIOMotorDatabase) -> Set[str]:
+    """Known technical skills plus the skills of every active job."""
+    from app.services.llm_extractor import LLMResumeExtractor
+
+    vocabulary = set(LLMResumeExtractor.TECHNICAL_SKILLS)
+    async for job in db.jobs.find({"is_active": {"$ne": False}}, {"weighted_skills": 1, "required_skills": 1}):
+        skills, _ = ResumeScorer._normalize_job_skills(job.get("weighted_skills", []) or job.get("required_skills", []))
+        vocabulary.update(name for name, _, _ in skills if name)
+    return vocabulary
+
+
+class SkillIndexService:
+    """Owns the process-wide SkillIndex: build, snapshot, catch-up, incremental updates and search."""
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path or settings.SKILL_INDEX_SNAPSHOT_PATH
+        self.index: Optional[SkillIndex] = None
+        self.state = "empty"
+        self.error: Optional[str] = None
+        self._changed_since_snapshot = False
+        self._last_snapshot_at: Optional[float] = None
+        self._last_refresh_at: Optional[float] = None
+        self._queries = 0
+        self._last_query: Dict[str, Any] = {}
+
+    # ---- lifecycle ----------------------------------------------------------
+
+    async def build(self, db: AsyncIOMotorDatabase) -> SkillIndex:
+        """Index every application from scratch."""
+        started = time.perf_counter()
+        index = SkillIndex(await load_text_vocabulary(db))
+        cursor = db.applications.find({}, INDEX_PROJECTION).batch_size(1000)
+        async for app in cursor:
+            index.add(app)
+            if len(index) % 1000 == 0:
+                await asyncio.sleep(0)
+        logger.info(
+            f"Skill index: built {len(index)} applications / {index.skill_count} skills "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        self.index = index
+        self._changed_since_snapshot = True
+        return index
+
+    async def load_snapshot(self) -> Optional[SkillIndex]:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+
+        def _load():
+            with np.load(self.snapshot_path, allow_pickle=False) as arrays:
+                return SkillIndex.from_arrays(arrays)
+
+        try:
+            index = await asyncio.to_thread(_load)
+        except Exception as e:
+            logger.warning(f"Skill index: ignoring unreadable snapshot {self.snapshot_path}: {e}")
+            return None
+        self._last_snapshot_at = index.built_at
+        return index
+
+    async def save_snapshot(self):
+        if self.index is None or not self.snapshot_path:
+            return
+        # Arrays are taken on the event loop so the file is a consistent view
+        arrays = self.index.to_arrays()
+
+        def _save():
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self.snapshot_path)
+
+        await asyncio.to_thread(_save)
+        self._changed_since_snapshot = False
+        self._last_snapshot_at = time.time()
+
+    async def reconcile(self, db: AsyncIOMotorDatabase):
+        """Bring a snapshot-loaded index in line with MongoDB: drop deleted applications, add missing ones."""
+        index = self.index
+        existing = set()
+        async for app in db.applications.find({}, {"_id": 1}).batch_size(5000):
+            existing.add(str(app["_id"]))
+
+        stale = [app_id for app_id in list(index._row_of) if app_id not in existing]
+        for app_id in stale:
+            index.remove(app_id)
+
+        missing = [ObjectId(app_id) for app_id in existing if app_id not in index and ObjectId.is_valid(app_id)]
+        for start in range(0, len(missing), 1000):
+            async for app in db.applications.find({"_id": {"$in": missing[start:start + 1000]}}, INDEX_PROJECTION):
+                index.add(app)
+            await asyncio.sleep(0)
+
+        if stale or missing:
+            self._changed_since_snapshot = True
+        logger.info(f"Skill index: reconciled snapshot (-{len(stale)} deleted, +{len(missing)} new)")
+
+    async def refresh(self, db: AsyncIOMotorDatabase) -> int:
+        """Index applications inserted since the newest one already indexed; returns how many were added."""
+        index = self.index
+        if index is None:
+            return 0
+
+        # Pick up skills of jobs created since the index was built, for applications indexed from now on
+        index.text_vocabulary |= await load_text_vocabulary(db)
+
+        query = {}
+        if index.max_object_id is not None:
+            since = index.max_object_id.generation_time - _CATCH_UP_OVERLAP
+            query = {"_id": {"$gte": ObjectId.from_datetime(since)}}
+
+        added = 0
+        async for app in db.applications.find(query, INDEX_PROJECTION).batch_size(1000):
+            if str(app["_id"]) not in index:
+                index.add(app)
+                added += 1
+        if added:
+            self._changed_since_snapshot = True
+        self._last_refresh_at = time.time()
+        return added
+
+    async def run(self):
+        """Background task: load or build the index, then keep it current and snapshotted."""
+        from app.db.mongodb import get_db
+
+        self.state = "loading"
+        try:
+            db = get_db()
+            index = await self.load_snapshot()
+            if index is not None:
+                self.index = index
+                await self.reconcile(db)
+            else:
+                await self.build(db)
+                await self.save_snapshot()
+            self.state = "ready"
+            self.error = None
+        except Exception as e:
+            logger.exception("Skill index: initial load failed")
+            self.state = "failed"
+            self.error = str(e)
+            return
+
+        print(f"Skill Index Ready ({len(self.index)} applications)")
+
+        while True:
+            await asyncio.sleep(settings.SKILL_INDEX_REFRESH_SECONDS)
+            try:
+                await self.refresh(get_db())
+                snapshot_due = (
+                    self._last_snapshot_at is None
+                    or time.time() - self._last_snapshot_at >= settings.SKILL_INDEX_SNAPSHOT_SECONDS
+                )
+                if self._changed_since_snapshot and snapshot_due:
+                    await self.save_snapshot()
+            except Exception as e:
+                print(f"Skill Index Refresh Error: {str(e)}")
+
+    async def rebuild(self, db: AsyncIOMotorDatabase):
+        """Rebuild from scratch (e.g. after the text vocabulary grew) and snapshot it."""
+        await self.build(db)
+        await self.save_snapshot()
+        self.state = "ready"
+
+    # ---- incremental updates ------------------------------------------------
+
+    def add_application(self, app: dict):
+        """Index a newly stored application document (needs _id, candidate_skills and extracted_text)."""
+        if self.index is not None:
+            self.index.add(app)
+            self._changed_since_snapshot = True
+
+    def remove_applications(self, application_ids: Iterable[str]):
+        if self.index is None:
+            return
+        for application_id in application_ids:
+            if self.index.remove(str(application_id)):
+                self._changed_since_snapshot = True
+
+    # ---- search -------------------------------------------------------------
+
+    async def search(self, db: AsyncIOMotorDatabase, job: dict, limit: int = 100) -> Dict[str, Any]:
+        """
+        Best candidates for a job from the whole pool: shortlist limit x
+        SKILL_INDEX_OVERSAMPLE candidates from the index, then score them
+        exactly and return the top `limit`.
+        """
+        if self.index is None:
+            raise HTTPException(status_code=503, detail="Candidate index is still loading, try again shortly")
+        index = self.index
+
+        skills, _ = ResumeScorer._normalize_job_skills(job.get("weighted_skills", []) or job.get("required_skills", []))
+        if not skills:
+            raise HTTPException(status_code=400, detail="Job has no required skills to match candidates on")
+
+        started = time.perf_counter()
+        shortlist = index.query([(name, weight) for name, weight, _ in skills], limit * max(1, settings.SKILL_INDEX_OVERSAMPLE))
+        index_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        object_ids = [ObjectId(app_id) for app_id, _ in shortlist if ObjectId.is_valid(app_id)]
+        applications = {}
+        async for app in db.applications.find(
+            {"_id": {"$in": object_ids}},
+            {**APPLICATION_SCORING_PROJECTION, **CANDIDATE_SUMMARY_PROJECTION}
+        ):
+            applications[str(app["_id"])] = app
+
+        # Shortlisted ids that no longer exist were deleted by another process
+        self.remove_applications(app_id for app_id, _ in shortlist if app_id not in applications)
+
+        def _score_shortlist():
+            scorer = ResumeScorer()
+            scored = []
+            for app_id, index_weight in shortlist:
+                app = applications.get(app_id)
+                if app is None:
+                    continue
+                job_score = scorer._score_or_none(candidate_from_application(app), app.get("extracted_text") or "", job)
+                if job_score is not None:
+                    scored.append((app, index_weight, job_score))
+            return scored
+
+        scored = await asyncio.to_thread(_score_shortlist)
+        scored.sort(key=lambda item: (-item[2].get("final_score", 0.0), str(item[0]["_id"])))
+        rescore_ms = (time.perf_counter() - started) * 1000
+
+        scored_at = datetime.utcnow()
+        items = []
+        for rank, (app, index_weight, job_score) in enumerate(scored[:limit], start=1):
+            app_id = str(app.pop("_id"))
+            app.pop("extracted_text", None)
+            score_doc = build_job_score_doc(app_id, job, job_score, scored_at)
+            items.append({"rank": rank, **score_doc, "index_weight": index_weight, "application": {"_id": app_id, **app}})
+
+        vocabulary_misses = sorted(name for name, _, _ in skills if name not in index.text_vocabulary)
+        self._queries += 1
+        self._last_query = {
+            "job_id": str(job.get("_id")),
+            "shortlisted": len(shortlist),
+            "index_ms": round(index_ms, 2),
+            "rescore_ms": round(rescore_ms, 2),
+        }
+        return {
+            "items": items,
+            "pool_size": len(index),
+            "shortlisted": len(shortlist),
+            "index_ms": round(index_ms, 2),
+            "rescore_ms": round(rescore_ms, 2),
+            "text_unindexed_skills": vocabulary_misses,
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        index = self.index
+        return {
+            "state": self.state,
+            "error": self.error,
+            "applications": len(index) if index else 0,
+            "skills": index.skill_count if index else 0,
+            "text_vocabulary": len(index.text_vocabulary) if index else 0,
+            "built_at": datetime.utcfromtimestamp(index.built_at).isoformat() if index else None,
+            "last_refresh_at": datetime.utcfromtimestamp(self._last_refresh_at).isoformat() if self._last_refresh_at else None,
+            "last_snapshot_at": datetime.utcfromtimestamp(self._last_snapshot_at).isoformat() if self._last_snapshot_at else None,
+            "snapshot_path": self.snapshot_path,
+            "queries": self._queries,
+            "last_query": self._last_query,
+        }
+
+
+_skill_index_service: Optional[SkillIndexService] = None
+
+
+def get_skill_index() -> SkillIndexService:
+    """Get or create the global SkillIndexService instance."""
+    global _skill_index_service
+    if _skill_index_service is None:
+        _skill_index_service = SkillIndexService()
+    return _skill_index_service
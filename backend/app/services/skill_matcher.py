@@ -0,0 +1,126 @@
+"""
+Multi-pattern skill/keyword matcher shared by scoring, domain detection and
+regex extraction.
+
+Patterns are compiled once into an Aho–Corasick automaton over word tokens,
+so a resume is scanned in a single pass regardless of how many skills are
+being looked for. Matching on whole tokens gives word-boundary behaviour:
+"java" does not match inside "javascript", while punctuated skills such as
+"c++", "node.js", "ci/cd" and ".net" still match where they appear.
+
+Usage:
+    matcher = get_skill_matcher(["python", "machine learning", "c++"])
+    matcher.matched(resume_text)      # {"python", "c++"}
+    matcher.find_all(resume_text)     # [SkillHit("python", 12, 18), ...]
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+# Runs of letters/digits are single tokens; any other non-space character is its own token
+_TOKEN_RE = re.compile(r"[^\W_]+|\S")
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Lowercased (token, start, end) triples with offsets into `text`."""
+    return [(m.group(0), m.start(), m.end()) for m in _TOKEN_RE.finditer(text.lower())]
+
+
+@dataclass(frozen=True)
+class SkillHit:
+    pattern: str
+    start: int
+    end: int
+
+
+class SkillMatcher:
+    """
+    Aho–Corasick automaton whose alphabet is word tokens.
+
+    Patterns are matched case-insensitively and whitespace-insensitively
+    ("machine  learning" matches "machine learning"). Hits report the pattern
+    exactly as it was passed in, with character offsets into the scanned text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: Tuple[str, ...] = tuple(dict.fromkeys(p for p in patterns if isinstance(p, str)))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (pattern, token length) pairs ending at each state, including via failure links
+        self._out: List[List[Tuple[str, int]]] = [[]]
+
+        for pattern in self.patterns:
+            tokens = [token for token, _, _ in tokenize(pattern)]
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][token] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((pattern, len(tokens)))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def _scan(self, tokens: List[Tuple[str, int, int]]):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, (token, _, _) in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if out[state]:
+                yield index, out[state]
+
+    def find_all(self, text: str) -> List[SkillHit]:
+        """Every occurrence of every pattern, in order of where it ends in the text."""
+        if not text or not self.patterns:
+            return []
+        tokens = tokenize(text)
+        hits = []
+        for end_index, matches in self._scan(tokens):
+            for pattern, length in matches:
+                hits.append(SkillHit(pattern, tokens[end_index - length + 1][1], tokens[end_index][2]))
+        return hits
+
+    def matched(self, text: str) -> Set[str]:
+        """The set of patterns that occur at least once in the text."""
+        if not text or not self.patterns:
+            return set()
+        found = set()
+        for _, matches in self._scan(tokenize(text)):
+            for pattern, _ in matches:
+                found.add(pattern)
+        return found
+
+
+@lru_cache(maxsize=128)
+def _cached_matcher(patterns: FrozenSet[str]) -> SkillMatcher:
+    return SkillMatcher(sorted(patterns))
+
+
+def get_skill_matcher(patterns: Iterable[str]) -> SkillMatcher:
+    """Get a compiled matcher for this vocabulary, reusing one built earlier for the same set."""
+    return _cached_matcher(frozenset(p for p in patterns if isinstance(p, str)))
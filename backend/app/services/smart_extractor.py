@@ -11,13 +11,18 @@ Note: LlamaParse is incompatible with Python 3.14, so we use local PDF extractio
 
 import os
 import re
-import io
 import json
+import time
+import asyncio
 import logging
+from collections import deque
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 
+from app.core.metrics import summarize_durations
+from app.services.parsed_document import ParsedDocument
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -44,6 +49,8 @@ DOMAIN_KEYWORDS = {
     "RPA": ["rpa", "robotic process automation", "uipath", "automation anywhere", "blue prism", "power automate"],
 }
 
+_DOMAIN_PATTERNS = tuple(keyword for keywords in DOMAIN_KEYWORDS.values() for keyword in keywords)
+
 MONTH_MAP = {
     "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
     "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6,
@@ -122,11 +129,15 @@ def calculate_duration_months(dates_str: str) -> int:
 
 def detect_domain(title: str, bullets: List[str]) -> str:
     """Detect the domain/industry based on job title and responsibilities."""
-    text = f"{title} {' '.join(bullets)}".lower()
+    from app.services.skill_matcher import get_skill_matcher
+    
+    text = f"{title} {' '.join(b for b in bullets if isinstance(b, str))}"
+    found = get_skill_matcher(_DOMAIN_PATTERNS).matched(text)
     
+    # First domain (in priority order) with a whole-word keyword hit
     for domain, keywords in DOMAIN_KEYWORDS.items():
         for keyword in keywords:
-            if keyword.lower() in text:
+            if keyword in found:
                 return domain
     
     return "General"
@@ -175,105 +186,15 @@ class Tier1Extractor:
     LlamaParse's Pydantic v1 is incompatible with Python 3.14.
     """
     
-    def __init__(self):
-        self.groq_key = os.getenv("GROQ_API_KEY", "")
-        self._groq_client = None
-    
     def is_available(self) -> bool:
         """Check if Tier 1 extraction is available."""
-        return bool(self.groq_key)
-    
-    def _get_groq_client(self):
-        """Lazy-load Groq client."""
-        if self._groq_client is None:
-            try:
-                from groq import Groq
-                self._groq_client = Groq(api_key=self.groq_key)
-            except ImportError:
-                logger.warning("Groq not installed. Install with: pip install groq")
-                return None
-            except Exception as e:
-                logger.error(f"Failed to initialize Groq: {e}")
-                return None
-        return self._groq_client
-    
-    def _extract_text_from_pdf(self, file_content: bytes) -> str:
-        """Extract text from PDF using pymupdf (preferred), pdfplumber, or EasyOCR for image PDFs."""
-        text = ""
-        
-        # Try pymupdf first (fastest for text-based PDFs)
-        try:
-            import fitz  # pymupdf
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            for page in doc:
-                text += page.get_text() + "\n"
-            doc.close()
-            if text.strip() and len(text.strip()) > 100:
-                logger.info(f"Tier1: Extracted {len(text)} chars using pymupdf")
-                return text
-        except ImportError:
-            pass
-        except Exception as e:
-            logger.warning(f"pymupdf failed: {e}")
-        
-        # Fallback to pdfplumber
-        try:
-            import pdfplumber
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text() or ""
-                    text += page_text + "\n"
-            if text.strip() and len(text.strip()) > 100:
-                logger.info(f"Tier1: Extracted {len(text)} chars using pdfplumber")
-                return text
-        except Exception as e:
-            logger.warning(f"pdfplumber failed: {e}")
-        
-        # For image-based PDFs, use EasyOCR
-        logger.info("Tier1: PDF appears to be image-based, trying EasyOCR...")
-        try:
-            import easyocr
-            import fitz
-            import numpy as np
-            from PIL import Image
-            
-            # Initialize EasyOCR reader (lazy load)
-            reader = easyocr.Reader(['en'], gpu=False)
-            
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            text = ""
-            
-            for page_num, page in enumerate(doc):
-                logger.info(f"Tier1: OCR processing page {page_num + 1}/{len(doc)}...")
-                
-                # Convert page to image (high res for better OCR)
-                mat = fitz.Matrix(2, 2)  # 2x zoom
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("ppm")
-                img = Image.open(io.BytesIO(img_data))
-                img_array = np.array(img)
-                
-                # Run OCR
-                results = reader.readtext(img_array, detail=0, paragraph=True)
-                page_text = "\n".join(results)
-                text += page_text + "\n\n"
-            
-            doc.close()
-            logger.info(f"Tier1: EasyOCR extracted {len(text)} chars")
-            return text
-            
-        except ImportError as e:
-            logger.warning(f"EasyOCR not available: {e}")
-        except Exception as e:
-            logger.warning(f"EasyOCR failed: {e}")
-        
-        return text
+        from app.services.llm_gateway import get_llm_gateway
+        return get_llm_gateway().is_configured("groq")
     
-    def _extract_json_with_groq(self, resume_text: str) -> Dict:
+    async def _extract_json_with_groq(self, resume_text: str) -> Dict:
         """Extract structured JSON from resume text using Groq."""
-        client = self._get_groq_client()
-        if not client:
-            raise ValueError("Groq client not available")
+        from app.core.config import settings
+        from app.services.llm_gateway import get_llm_gateway
         
         prompt = f"""
 You are an expert Resume Parser. Convert the following Resume content into a structured JSON object.
@@ -312,37 +233,46 @@ RESUME CONTENT:
 """
         
         logger.info("Tier1: Extracting JSON via Groq Llama 3.3-70B...")
-        chat_completion = client.chat.completions.create(
+        response = await get_llm_gateway().chat(
+            "groq",
             messages=[
                 {"role": "system", "content": "You are a specialized resume parser that always returns valid JSON."},
                 {"role": "user", "content": prompt}
             ],
-            model="llama-3.1-8b-instant",
+            model=settings.GROQ_MODEL,
+            tier="tier1",
             temperature=0.1,
-            stream=False,
             response_format={"type": "json_object"}
         )
         
-        raw_content = chat_completion.choices[0].message.content
-        return json.loads(raw_content)
+        return json.loads(response.content)
     
-    async def extract(self, file_content: bytes, filename: str, resume_text: str = "") -> Dict[str, Any]:
+    async def extract(
+        self,
+        file_content: bytes,
+        filename: str,
+        resume_text: str = "",
+        document: Optional[ParsedDocument] = None
+    ) -> Dict[str, Any]:
         """
         Extract resume data using local PDF extraction + Groq.
         Returns structured data with domain analysis.
+        A ParsedDocument from the upload pipeline is reused instead of parsing the file again.
         """
         if not self.is_available():
             raise ValueError("Tier 1 extraction not available - missing GROQ_API_KEY")
         
         # Step 1: Use provided text or extract from PDF locally if not provided
         if not resume_text:
-            resume_text = self._extract_text_from_pdf(file_content)
+            from app.services.resume_extractor import extract_pdf_text_async
+            resume_text = await extract_pdf_text_async(document if document is not None else file_content)
+            logger.info(f"Tier1: Extracted {len(resume_text)} chars (text layer + OCR where needed)")
         
         if not resume_text or len(resume_text.strip()) < 100:
             raise ValueError(f"Could not extract sufficient text from PDF (got {len(resume_text)} chars)")
         
         # Step 2: Extract structured JSON using Groq
-        structured_data = self._extract_json_with_groq(resume_text)
+        structured_data = await self._extract_json_with_groq(resume_text)
         
         # Step 3: Enrich experience data
         total_months = 0
@@ -453,7 +383,7 @@ class Tier2Extractor:
         self._lazy_init()
         return self._is_llm_available()
     
-    def extract(self, resume_text: str) -> Dict[str, Any]:
+    async def extract(self, resume_text: str) -> Dict[str, Any]:
         """
         Extract resume data using Mistral 7B.
         """
@@ -462,8 +392,9 @@ class Tier2Extractor:
             raise ValueError("Tier 2 extraction not available - HuggingFace API not configured")
         
         logger.info("Tier2: Extracting via Mistral 7B...")
-        result = self._extractor.extract_resume_data(resume_text)
-  
+        # Call the LLM path directly so provider failures surface to the router
+        # (extract_resume_data would silently fall back to regex)
+        result = await self._extractor._extract_with_llm(resume_text)
         
         # Add extraction metadata
         result["extraction_method"] = "mistral_7b"
@@ -525,6 +456,117 @@ class Tier3Extractor:
         return result
 
 
+# ============================================================================
+# TIER ROUTING: ROLLING STATS + CIRCUIT BREAKERS
+# ============================================================================
+
+class TierCircuitBreaker:
+    """
+    Rolling latency/error statistics and a circuit breaker for one tier.
+    
+    closed    -> calls go through; opens after `failure_threshold` consecutive
+                 failures, or when the error rate over the window exceeds
+                 `error_rate_threshold` (with at least `min_samples` calls)
+    open      -> tier is skipped until `cooldown` seconds have passed
+    half_open -> a single probe call is let through; success closes the
+                 breaker, failure re-opens it
+    
+    Only provider-side problems (gateway errors, timeouts, hedged-out slow
+    calls) count as failures; bad input such as an unreadable PDF does not.
+    """
+    
+    def __init__(self, name: str):
+        from app.core.config import settings
+        
+        self.name = name
+        self.failure_threshold = settings.CIRCUIT_FAILURE_THRESHOLD
+        self.error_rate_threshold = settings.CIRCUIT_ERROR_RATE
+        self.min_samples = settings.CIRCUIT_MIN_SAMPLES
+        self.cooldown = settings.CIRCUIT_COOLDOWN_SECONDS
+        
+        self.state = "closed"
+        self.opened_at: Optional[float] = None
+        self.consecutive_failures = 0
+        self.total_calls = 0
+        self.total_failures = 0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._outcomes = deque(maxlen=settings.CIRCUIT_WINDOW)
+        self._latencies = deque(maxlen=settings.CIRCUIT_WINDOW)
+    
+    def allow_request(self) -> bool:
+        """Whether the router should try this tier now."""
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+    
+    def record_success(self, latency: float):
+        self.total_calls += 1
+        self.consecutive_failures = 0
+        self._outcomes.append(True)
+        self._latencies.append(latency)
+        if self.state != "closed":
+            logger.info(f"Circuit {self.name}: closed after successful probe")
+        self.state = "closed"
+        self._probe_in_flight = False
+    
+    def record_failure(self, latency: float):
+        self.total_calls += 1
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self._outcomes.append(False)
+        self._latencies.append(latency)
+        
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold or (
+            len(self._outcomes) >= self.min_samples and self.error_rate() > self.error_rate_threshold
+        ):
+            self._open()
+    
+    def release_probe(self):
+        """Give up a half-open probe slot without recording an outcome."""
+        self._probe_in_flight = False
+    
+    def _open(self):
+        if self.state != "open":
+            self.times_opened += 1
+            logger.warning(f"Circuit {self.name}: opened (consecutive failures={self.consecutive_failures}, error rate={self.error_rate():.0%})")
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+    
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+    
+    def get_state(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == "open":
+            retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "retry_in_seconds": retry_in,
+            "consecutive_failures": self.consecutive_failures,
+            "window_error_rate": round(self.error_rate(), 4),
+            "window_latency": summarize_durations(self._latencies),
+            "total_calls": self.total_calls,
+            "total_failures": self.total_failures,
+            "times_opened": self.times_opened,
+        }
+
+
+def _is_provider_failure(error: Exception) -> bool:
+    from app.services.llm_gateway import LLMGatewayError
+    return isinstance(error, (LLMGatewayError, asyncio.TimeoutError, TimeoutError))
+
+
 # ============================================================================
 # SMART EXTRACTOR (Main Entry Point)
 # ============================================================================
@@ -539,41 +581,148 @@ class SmartExtractor:
     """
     
     def __init__(self):
+        from app.core.config import settings
+        
         self.tier1 = Tier1Extractor()
         self.tier2 = Tier2Extractor()
         self.tier3 = Tier3Extractor()
+        self.breakers = {
+            1: TierCircuitBreaker("tier1"),
+            2: TierCircuitBreaker("tier2"),
+        }
+        self.hedge_after = settings.EXTRACTION_HEDGE_AFTER_SECONDS
+        self.hedges_started = 0
+        self.hedges_won = 0
+    
+    async def _call_tier(self, tier: int, call, hedged_out: Optional[asyncio.Event] = None) -> Dict[str, Any]:
+        """
+        Run one LLM tier call and feed the outcome into its circuit breaker.
+        `hedged_out` is set by the hedging code before it cancels a slow call.
+        """
+        breaker = self.breakers[tier]
+        started = time.perf_counter()
+        try:
+            result = await call
+        except asyncio.CancelledError:
+            if hedged_out is not None and hedged_out.is_set():
+                # Hedged out: the call was too slow to be useful
+                breaker.record_failure(time.perf_counter() - started)
+            else:
+                # Client disconnect, request timeout or shutdown: no outcome, just free a probe slot
+                breaker.release_probe()
+            raise
+        except Exception as e:
+            if _is_provider_failure(e):
+                breaker.record_failure(time.perf_counter() - started)
+            else:
+                breaker.release_probe()
+            raise
+        breaker.record_success(time.perf_counter() - started)
+        return result
+    
+    async def _run_tier1(
+        self,
+        file_content: bytes,
+        filename: str,
+        resume_text: str,
+        document: Optional[ParsedDocument] = None
+    ) -> Dict[str, Any]:
+        """
+        Run Tier 1, hedged with Tier 3 when a hedge deadline is configured.
+        
+        If Groq has not answered within `hedge_after` seconds, the regex result
+        is returned instead and the slow call is cancelled (and counted against
+        the Tier 1 breaker), capping upload latency during provider incidents.
+        """
+        hedged_out = asyncio.Event()
+        tier1_call = self._call_tier(1, self.tier1.extract(file_content, filename, resume_text, document), hedged_out)
+        if not self.hedge_after or self.hedge_after <= 0 or not resume_text:
+            return await tier1_call
+        
+        task = asyncio.ensure_future(tier1_call)
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.hedge_after)
+        except asyncio.CancelledError:
+            # The caller went away: stop the call too, without blaming the provider
+            task.cancel()
+            raise
+        if done:
+            return task.result()
+        
+        self.hedges_started += 1
+        try:
+            hedge_result = self.tier3.extract(resume_text)
+        except Exception:
+            # Regex failed too; keep waiting on Tier 1
+            return await task
+        
+        hedged_out.set()
+        task.cancel()
+        self.hedges_won += 1
+        hedge_result["hedged"] = True
+        hedge_result["degraded"] = True
+        logger.warning(f"SmartExtractor: Tier 1 exceeded {self.hedge_after}s, returned Tier 3 hedge result")
+        return hedge_result
+    
+    def get_routing_state(self) -> Dict[str, Any]:
+        """Per-tier availability, breaker state and rolling stats for the admin endpoint."""
+        return {
+            "hedge_after_seconds": self.hedge_after,
+            "hedges_started": self.hedges_started,
+            "hedges_won": self.hedges_won,
+            "tiers": {
+                "tier1": {"configured": self.tier1.is_available(), **self.breakers[1].get_state()},
+                "tier2": {"configured": self.tier2.is_available(), **self.breakers[2].get_state()},
+                "tier3": {"configured": True, "state": "closed"},
+            },
+        }
     
     async def extract(
         self, 
         file_content: bytes, 
         filename: str,
-        resume_text: str = ""
+        resume_text: str = "",
+        document: Optional[ParsedDocument] = None
     ) -> Dict[str, Any]:
         """
         Extract resume data using the best available method.
         
+        Tiers whose circuit breaker is open are skipped, so during a provider
+        outage uploads go straight to the next tier instead of waiting out
+        the failing one.
+        
         Args:
             file_content: Raw bytes of the PDF/DOCX file
             filename: Original filename (used for format detection)
             resume_text: Pre-extracted text (used for Tier 2/3 if Tier 1 fails)
+            document: The upload's ParsedDocument, reused by Tier 1 instead of re-parsing
         
         Returns:
             Extracted resume data with extraction_method and extraction_tier fields
         """
         
         errors = []
+        # Set when a better tier was skipped or failed for provider reasons, so the
+        # result is a stand-in rather than the best extraction for this file
+        degraded = False
         
         # Tier 1: Groq Llama 3.3-70B (Primary)
         if self.tier1.is_available() and filename.lower().endswith(('.pdf', '.docx','.txt','.png','.jpg','.jpeg','.gif','.webp')):
-            try:
-                logger.info("SmartExtractor: Attempting Tier 1 (PyMuPDF + Groq)...")
-                result = await self.tier1.extract(file_content, filename, resume_text)
-                logger.info("SmartExtractor: Tier 1 successful!")
-                return result
-            except Exception as e:
-                error_msg = f"Tier 1 failed: {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
+            if self.breakers[1].allow_request():
+                try:
+                    logger.info("SmartExtractor: Attempting Tier 1 (PyMuPDF + Groq)...")
+                    result = await self._run_tier1(file_content, filename, resume_text, document)
+                    logger.info(f"SmartExtractor: Tier {result.get('extraction_tier')} successful!")
+                    return result
+                except Exception as e:
+                    error_msg = f"Tier 1 failed: {str(e)}"
+                    logger.warning(error_msg)
+                    errors.append(error_msg)
+                    degraded = degraded or _is_provider_failure(e)
+            else:
+                degraded = True
+                errors.append("Tier 1 skipped: circuit open")
+                logger.info("SmartExtractor: Tier 1 skipped (circuit open)")
         elif not filename.lower().endswith('.pdf'):
             logger.info("SmartExtractor: Tier 1 skipped (not a PDF file)")
         else:
@@ -581,15 +730,22 @@ class SmartExtractor:
         
         # Tier 2: Mistral 7B (Secondary)
         if self.tier2.is_available() and resume_text:
-            try:
-                logger.info("SmartExtractor: Attempting Tier 2 (Mistral 7B)...")
-                result = self.tier2.extract(resume_text)
-                logger.info("SmartExtractor: Tier 2 successful!")
-                return result
-            except Exception as e:
-                error_msg = f"Tier 2 failed: {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
+            if self.breakers[2].allow_request():
+                try:
+                    logger.info("SmartExtractor: Attempting Tier 2 (Mistral 7B)...")
+                    result = await self._call_tier(2, self.tier2.extract(resume_text))
+                    result["degraded"] = degraded
+                    logger.info("SmartExtractor: Tier 2 successful!")
+                    return result
+                except Exception as e:
+                    error_msg = f"Tier 2 failed: {str(e)}"
+                    logger.warning(error_msg)
+                    errors.append(error_msg)
+                    degraded = degraded or _is_provider_failure(e)
+            else:
+                degraded = True
+                errors.append("Tier 2 skipped: circuit open")
+                logger.info("SmartExtractor: Tier 2 skipped (circuit open)")
         elif not resume_text:
             logger.info("SmartExtractor: Tier 2 skipped (no text available)")
         else:
@@ -600,6 +756,7 @@ class SmartExtractor:
             try:
                 logger.info("SmartExtractor: Attempting Tier 3 (Regex)...")
                 result = self.tier3.extract(resume_text)
+                result["degraded"] = degraded
                 logger.info("SmartExtractor: Tier 3 successful!")
                 return result
             except Exception as e:
@@ -650,7 +807,8 @@ def get_smart_extractor() -> SmartExtractor:
 async def smart_extract_candidate_info(
     file_content: bytes,
     filename: str, 
-    resume_text: str = ""
+    resume_text: str = "",
+    document: Optional[ParsedDocument] = None
 ) -> Dict[str, Any]:
     """
     Convenience function for smart extraction.
@@ -659,9 +817,15 @@ async def smart_extract_candidate_info(
         file_content: Raw bytes of the uploaded file
         filename: Original filename
         resume_text: Pre-extracted text (optional, used for Tier 2/3)
+        document: Parsed upload from resume_extractor.parse_document_async (optional)
     
     Returns:
         Extracted candidate data
     """
     extractor = get_smart_extractor()
-    return await extractor.extract(file_content, filename, resume_text)
+    return await extractor.extract(file_content, filename, resume_text, document)
+
+
+def get_extraction_routing_state() -> Dict[str, Any]:
+    """Current tier routing / circuit breaker state (admin endpoint)."""
+    return get_smart_extractor().get_routing_state()
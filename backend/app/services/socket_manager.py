@@ -431,3 +431,40 @@ async def emit_job_created(job_data: dict):
     """
     await sio.emit('job:created', job_data)
     print(f"[Socket.IO] Emitted job:created: {job_data.get('title')}")
+
+
+async def emit_ingest_status(user_id: str, ingest_data: dict):
+    """
+    Emit a finished resume ingestion to the user who uploaded it.
+    
+    Args:
+        user_id: Uploader's user ID
+        ingest_data: {ingest_id, status, filename, job_id, application_id, error}
+    """
+    await sio.emit(
+        'ingest:completed' if ingest_data.get('status') == 'done' else 'ingest:failed',
+        ingest_data,
+        room=f"user:{user_id}"
+    )
+    print(f"[Socket.IO] Emitted ingest:{ingest_data.get('status')} to user:{user_id}")
+
+
+async def emit_bulk_import_progress(user_id: str, progress_data: dict):
+    """
+    Emit per-file progress of a bulk resume import to the uploader.
+    
+    Args:
+        user_id: Uploader's user ID
+        progress_data: {import_id, filename, status, error, processed, total}
+    """
+    await sio.emit('bulk_import:progress', progress_data, room=f"user:{user_id}")
+
+
+async def emit_rescore_progress(progress_data: dict):
+    """
+    Emit background rescoring progress for a job to all connected clients.
+    
+    Args:
+        progress_data: {job_id, status, processed, total}
+    """
+    await sio.emit('rescore:progress', progress_data)
@@ -0,0 +1,383 @@
+"""
+Streaming multipart uploads.
+
+FastAPI's `UploadFile` only reaches the endpoint after Starlette has read
+the whole request body, so size and type checks run after the full upload
+has been received, and `await file.read()` then copies it into memory once
+more. `receive_upload` reads the request body itself, chunk by chunk as it
+arrives, and:
+
+    - rejects a disallowed extension as soon as the part headers are parsed
+    - checks the file's magic bytes against its extension on the first chunk
+    - enforces the size limit while streaming (and up front from Content-Length)
+    - computes the MD5 (same value as resume_pipeline.compute_file_hash) incrementally
+    - keeps the file in memory up to UPLOAD_SPOOL_THRESHOLD bytes, then spools
+      it to a temp file, written off the event loop
+
+so a bad upload is refused after its first few KB and a large one never
+sits in memory more than once. Parsers can open the spooled file by path.
+
+Usage:
+    async with await receive_upload(request, max_bytes=..., allowed_extensions=[...]) as upload:
+        job_id = upload.fields.get("job_id")
+        path = await upload.ensure_path()
+        content = await upload.read()
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, Request
+
+try:
+    import python_multipart as multipart
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    import multipart
+    from multipart.multipart import parse_options_header
+
+from app.core.config import settings
+from app.services.docx_extractor import OLE_SIGNATURE, ZIP_SIGNATURE
+from app.services.parsed_document import file_extension
+
+# Bytes of the file looked at to identify its type (PDFs may have junk before "%PDF-" in the first 1 KB)
+SNIFF_BYTES = 1024
+MAX_FIELD_BYTES = 64 * 1024
+# Allowance for multipart boundaries, part headers and small form fields in the Content-Length pre-check
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Extension -> sniffed types its content may have. Extensions not listed (text, csv, some audio) are not sniffed.
+EXTENSION_SIGNATURES: Dict[str, tuple] = {
+    "pdf": ("pdf",),
+    "docx": ("zip",),
+    "xlsx": ("zip",),
+    "doc": ("ole", "zip"),  # .doc files are often DOCX renamed
+    "xls": ("ole", "zip"),
+    "jpg": ("jpeg",),
+    "jpeg": ("jpeg",),
+    "png": ("png",),
+    "gif": ("gif",),
+    "webp": ("webp",),
+    "webm": ("webm",),
+    "ogg": ("ogg",),
+    "wav": ("wav",),
+}
+
+
+def sniff_file_type(head: bytes) -> Optional[str]:
+    """Type of a file from its first bytes: pdf, zip, ole, jpeg, png, gif, webp, wav, webm, ogg or None."""
+    if b"%PDF-" in head[:SNIFF_BYTES]:
+        return "pdf"
+    if head.startswith(ZIP_SIGNATURE):
+        return "zip"
+    if head.startswith(OLE_SIGNATURE):
+        return "ole"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "webp"
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return "wav"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    if head.startswith(b"OggS"):
+        return "ogg"
+    return None
+
+
+def content_matches_extension(extension: str, head: bytes) -> bool:
+    """Whether the file's first bytes fit its extension (always True for extensions that are not sniffed)."""
+    expected = EXTENSION_SIGNATURES.get(extension)
+    return expected is None or sniff_file_type(head) in expected
+
+
+# ============================================================================
+# SPOOLED UPLOAD
+# ============================================================================
+
+class StreamedUpload:
+    """
+    One uploaded file and the form's other fields. The file is kept in
+    memory until it grows past `spool_threshold` bytes, then moved to a temp
+    file that is removed by close(). Size and MD5 are tracked as it is written.
+    """
+
+    def __init__(self, spool_threshold: Optional[int] = None, tmp_dir: Optional[str] = None):
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.size = 0
+        self.spool_threshold = settings.UPLOAD_SPOOL_THRESHOLD if spool_threshold is None else spool_threshold
+        self.tmp_dir = tmp_dir or settings.UPLOAD_TMP_DIR or None
+        self._md5 = hashlib.md5()
+        self._buffer = bytearray()
+        self._file = None
+        self._path: Optional[str] = None
+
+    @property
+    def extension(self) -> str:
+        return file_extension(self.filename)
+
+    @property
+    def file_hash(self) -> str:
+        """MD5 hex digest of the content received so far."""
+        return self._md5.hexdigest()
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the spooled temp file (complete once receive_upload returns), None while in memory."""
+        return self._path
+
+    async def write(self, chunk: bytes):
+        self.size += len(chunk)
+        self._md5.update(chunk)
+        if self._file is not None:
+            await asyncio.to_thread(self._file.write, chunk)
+            return
+        self._buffer.extend(chunk)
+        if len(self._buffer) > self.spool_threshold:
+            await asyncio.to_thread(self._rollover)
+
+    def _rollover(self):
+        if self.tmp_dir:
+            os.makedirs(self.tmp_dir, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(
+            prefix="upload_", suffix=f".{self.extension}" if self.extension else "", dir=self.tmp_dir, delete=False
+        )
+        self._path = self._file.name
+        self._file.write(self._buffer)
+        self._buffer = bytearray()
+
+    def _flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    async def ensure_path(self) -> str:
+        """Spool the file to disk if it is still in memory; returns its path."""
+        if self._file is None:
+            await asyncio.to_thread(self._rollover)
+        await asyncio.to_thread(self._flush)
+        return self._path
+
+    async def read(self) -> bytes:
+        """The whole file."""
+        if self._file is None:
+            return bytes(self._buffer)
+        await asyncio.to_thread(self._flush)
+        return await asyncio.to_thread(_read_file, self._path)
+
+    async def close(self):
+        """Drop the buffer and delete the temp file, if any."""
+        self._buffer = bytearray()
+        if self._file is not None:
+            file, path = self._file, self._path
+            self._file = None
+            self._path = None
+            await asyncio.to_thread(_discard_file, file, path)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _discard_file(file, path: str):
+    file.close()
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+# ============================================================================
+# RECEIVING
+# ============================================================================
+
+class _UploadReceiver:
+    """python-multipart callbacks: collects form fields and queues the file part's data for writing."""
+
+    def __init__(
+        self,
+        upload: StreamedUpload,
+        file_field: str,
+        max_bytes: int,
+        allowed_extensions: Optional[List[str]],
+        extension_error: str,
+        size_error: str,
+        sniff: bool
+    ):
+        self.upload = upload
+        self.file_field = file_field
+        self.max_bytes = max_bytes
+        self.allowed_extensions = allowed_extensions
+        self.extension_error = extension_error
+        self.size_error = size_error
+        self.sniff = sniff
+
+        self.pending: List[bytes] = []
+        self.sniffed = not sniff
+        self._head = bytearray()
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._part_content_type: Optional[str] = None
+        self._part: Optional[str] = None  # "file", "field" or "skip"
+        self._field_name = ""
+        self._field_data = bytearray()
+        self._received_size = 0
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self):
+        self._disposition = b""
+        self._part_content_type = None
+        self._part = None
+        self._field_data = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        name = self._header_name.lower()
+        if name == b"content-disposition":
+            self._disposition = self._header_value
+        elif name == b"content-type":
+            self._part_content_type = self._header_value.decode("latin-1")
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        self._field_name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        if b"filename" not in options:
+            self._part = "field"
+            return
+        if self._field_name != self.file_field or self.upload.filename is not None:
+            self._part = "skip"
+            return
+        self._part = "file"
+        self.upload.filename = options[b"filename"].decode("utf-8", errors="replace")
+        self.upload.content_type = self._part_content_type
+        if self.allowed_extensions is not None and self.upload.extension not in self.allowed_extensions:
+            raise HTTPException(status_code=400, detail=self.extension_error)
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._part == "field":
+            if len(self._field_data) + end - start > MAX_FIELD_BYTES:
+                raise HTTPException(status_code=400, detail=f"Form field '{self._field_name}' is too large.")
+            self._field_data += data[start:end]
+        elif self._part == "file":
+            self._received_size += end - start
+            if self._received_size > self.max_bytes:
+                raise HTTPException(status_code=400, detail=self.size_error)
+            chunk = data[start:end]
+            if not self.sniffed:
+                self._head += chunk[:SNIFF_BYTES - len(self._head)]
+                if len(self._head) >= SNIFF_BYTES:
+                    self.check_content_type()
+            self.pending.append(chunk)
+
+    def on_part_end(self):
+        if self._part == "field":
+            self.upload.fields[self._field_name] = self._field_data.decode("utf-8", errors="replace")
+        elif self._part == "file" and not self.sniffed:
+            self.check_content_type()
+
+    def check_content_type(self):
+        self.sniffed = True
+        extension = self.upload.extension
+        if not content_matches_extension(extension, bytes(self._head)):
+            raise HTTPException(
+                status_code=400,
+                detail=f"The file content does not match its .{extension} extension."
+            )
+
+
+async def receive_upload(
+    request: Request,
+    max_bytes: int,
+    file_field: str = "file",
+    allowed_extensions: Optional[Iterable[str]] = None,
+    extension_error: str = "File type not allowed",
+    size_error: Optional[str] = None,
+    sniff: bool = True,
+    spool_threshold: Optional[int] = None
+) -> StreamedUpload:
+    """
+    Read a multipart/form-data request with one file in `file_field`,
+    streaming the file into a StreamedUpload and validating it as it arrives.
+    Form fields other than the file are returned in `upload.fields`.
+
+    Raises HTTPException(400) as soon as the extension, the magic bytes or
+    the size is wrong (the rest of the body is not read), 413 when
+    Content-Length alone is already over the limit, and 400 when no file
+    was sent. The caller must close() the upload (it is an async context manager).
+    """
+    size_error = size_error or f"File size exceeds the {max_bytes // (1024 * 1024)}MB limit."
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload.")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=size_error)
+
+    upload = StreamedUpload(spool_threshold=spool_threshold)
+    receiver = _UploadReceiver(
+        upload,
+        file_field,
+        max_bytes,
+        [extension.lower().lstrip(".") for extension in allowed_extensions] if allowed_extensions is not None else None,
+        extension_error,
+        size_error,
+        sniff
+    )
+    parser = multipart.MultipartParser(params[b"boundary"], receiver.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for data in receiver.pending:
+                await upload.write(data)
+            receiver.pending.clear()
+        parser.finalize()
+    except HTTPException:
+        await upload.close()
+        raise
+    except multipart.exceptions.MultipartParseError as e:
+        await upload.close()
+        raise HTTPException(status_code=400, detail=f"Malformed multipart upload: {e}")
+    except BaseException:
+        await upload.close()
+        raise
+
+    if upload.filename is None:
+        await upload.close()
+        raise HTTPException(status_code=400, detail=f"No file uploaded in field '{file_field}'.")
+    # Complete on disk, so upload.path can be opened by other code (and processes) right away
+    await asyncio.to_thread(upload._flush)
+    return upload
@@ -0,0 +1,130 @@
+"""
+Resume ingestion worker.
+
+Claims queued `ingest_jobs` and runs the same pipeline as the synchronous
+upload endpoint (text extraction, smart extraction, B2 upload, scoring).
+Scale ingestion by running more of these processes:
+
+    python -m app.workers.ingest
+    python -m app.workers.ingest --concurrency 4
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import traceback
+import uuid
+
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_db
+from app.services.extraction_executor import shutdown_extraction_executor
+from app.services.ingest_queue import (
+    claim_ingest_job,
+    complete_ingest_job,
+    fail_ingest_job,
+    keep_lease_alive,
+    load_ingest_file,
+)
+from app.services.resume_pipeline import process_resume_upload
+
+
+async def process_ingest_job(db: AsyncIOMotorDatabase, ingest_job: dict, worker_id: str):
+    """Run one claimed job to completion, recording success or failure on the job document."""
+    ingest_id = ingest_job["_id"]
+
+    if ingest_job.get("attempts", 0) > ingest_job.get("max_attempts", settings.INGEST_MAX_ATTEMPTS):
+        await fail_ingest_job(db, ingest_job, worker_id, "Exceeded maximum attempts", retryable=False)
+        return
+
+    # A previous attempt may have inserted the application before crashing
+    existing_app = await db.applications.find_one({"ingest_job_id": str(ingest_id)}, {"_id": 1})
+    if existing_app:
+        await complete_ingest_job(db, ingest_job, worker_id, str(existing_app["_id"]))
+        return
+
+    heartbeat = asyncio.create_task(keep_lease_alive(db, ingest_id, worker_id))
+    try:
+        file_content = await load_ingest_file(db, ingest_job["file_id"])
+        application_doc = await process_resume_upload(
+            db,
+            file_content=file_content,
+            filename=ingest_job["filename"],
+            job_id=ingest_job.get("job_id"),
+            uploaded_by=ingest_job["uploaded_by"],
+            extra_fields={"ingest_job_id": str(ingest_id)}
+        )
+        await complete_ingest_job(db, ingest_job, worker_id, application_doc["_id"])
+        print(f"[Ingest] {ingest_id} done -> application {application_doc['_id']}")
+    except HTTPException as e:
+        # 4xx means the upload itself is bad (duplicate, unsupported, missing job); don't retry
+        retryable = e.status_code >= 500
+        await fail_ingest_job(db, ingest_job, worker_id, str(e.detail), retryable=retryable)
+        print(f"[Ingest] {ingest_id} failed ({e.status_code}): {e.detail}")
+    except Exception as e:
+        traceback.print_exc()
+        await fail_ingest_job(db, ingest_job, worker_id, str(e), retryable=True)
+        print(f"[Ingest] {ingest_id} error: {e}")
+    finally:
+        heartbeat.cancel()
+
+
+async def _worker_loop(worker_id: str, stop: asyncio.Event):
+    db = get_db()
+    while not stop.is_set():
+        try:
+            ingest_job = await claim_ingest_job(db, worker_id)
+        except Exception as e:
+            print(f"[Ingest] Claim error: {e}")
+            ingest_job = None
+
+        if ingest_job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.INGEST_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        await process_ingest_job(db, ingest_job, worker_id)
+
+
+async def run_worker(concurrency: int = None):
+    """Connect to Mongo and run `concurrency` claim loops until interrupted."""
+    concurrency = concurrency or settings.INGEST_WORKER_CONCURRENCY
+    base_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    await connect_to_mongo()
+    print(f"Ingest Worker {base_id} started with concurrency {concurrency}")
+
+    stop = asyncio.Event()
+    loops = [
+        asyncio.create_task(_worker_loop(f"{base_id}/{i}", stop))
+        for i in range(concurrency)
+    ]
+    try:
+        await asyncio.gather(*loops)
+    finally:
+        stop.set()
+        for task in loops:
+            task.cancel()
+        shutdown_extraction_executor()
+        await close_mongo_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume ingestion worker")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Jobs processed in parallel by this worker (default: INGEST_WORKER_CONCURRENCY)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_worker(args.concurrency))
+    except KeyboardInterrupt:
+        print("Ingest Worker stopped")
+
+
+if __name__ == "__main__":
+    main()
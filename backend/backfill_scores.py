@@ -1,91 +1,345 @@
+"""
+Backfill / rescore candidate-job scores for the whole talent pool.
+
+Scores applications against every active job in a process pool and writes
+the results to the job_scores collection with batched bulk writes. Progress
+is checkpointed (last processed _id) in the backfill_checkpoints collection,
+so an interrupted (or --limit'ed) run picks up where it stopped when started
+again with the same arguments.
+
+Modes:
+    missing   applications that were never scored into job_scores (default)
+    stale     applications scored before --since (e.g. after scoring weights changed)
+    all       every application
+    reextract applications extracted by an older extractor version: download
+              the resume, extract it again, then rescore
+
+Examples (run from the backend directory):
+    python backfill_scores.py --dry-run
+    python backfill_scores.py --mode stale --since 2026-10-01 --workers 4
+    python backfill_scores.py --mode all --max-rate 200 --drop-embedded
+    python backfill_scores.py --mode reextract --extract-concurrency 2
+"""
+
+import argparse
 import asyncio
-import sys
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 # Adjust Python path to load backend modules
-sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteMany, UpdateOne
+
 from app.core.config import settings
-from app.services.scoring_engine import evaluate_application_v2
+from app.services.extraction_cache import EXTRACTOR_VERSION
+from app.services.job_scores import build_job_score_doc, score_upsert
+from app.services.rescoring import APPLICATION_SCORING_PROJECTION, candidate_from_application, primary_score_fields
+from app.services.scoring_engine import ResumeScorer
+
+# Everything candidate_from_application reads, plus what re-extraction needs
+BACKFILL_PROJECTION = {
+    **APPLICATION_SCORING_PROJECTION,
+    "candidate_name_extracted": 1,
+    "candidate_email": 1,
+    "candidate_phone": 1,
+    "candidate_linkedin": 1,
+    "candidate_github": 1,
+    "candidate_certifications": 1,
+    "candidate_summary": 1,
+    "file_name": 1,
+    "file_hash": 1,
+    "extractor_version": 1,
+}
+
+
+# ============================================================================
+# Scoring workers
+# ============================================================================
+
+_worker_jobs: List[dict] = []
+
+
+def _init_worker(jobs: List[dict]):
+    """Process pool initializer: receive the active jobs once per worker instead of once per batch."""
+    global _worker_jobs
+    _worker_jobs = jobs
+
+
+def score_chunk(apps: List[dict], jobs: Optional[List[dict]] = None) -> List[List[Optional[Dict[str, Any]]]]:
+    """Score each application against every job; one list of per-job results (None on failure) per application."""
+    jobs = _worker_jobs if jobs is None else jobs
+    scorer = ResumeScorer()
+    results = []
+    for app in apps:
+        try:
+            results.append(scorer.score_against_jobs(candidate_from_application(app), app.get("extracted_text") or "", jobs))
+        except Exception as e:
+            print(f"  Error scoring application {app.get('_id')}: {e}")
+            results.append([None] * len(jobs))
+    return results
+
+
+# ============================================================================
+# Backfill
+# ============================================================================
+
+def build_filter(args) -> dict:
+    if args.mode == "missing":
+        return {"scores_updated_at": None}
+    if args.mode == "stale":
+        return {"$or": [{"scores_updated_at": None}, {"scores_updated_at": {"$lt": args.since}}]}
+    if args.mode == "reextract":
+        return {"extractor_version": {"$ne": EXTRACTOR_VERSION}}
+    return {}
+
+
+def checkpoint_name(args) -> str:
+    if args.checkpoint:
+        return args.checkpoint
+    if args.mode == "stale":
+        return f"scores:stale:{args.since.isoformat()}"
+    if args.mode == "reextract":
+        return f"scores:reextract:{EXTRACTOR_VERSION}"
+    return f"scores:{args.mode}"
+
+
+class Progress:
+    """Throughput and ETA for the console."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.started = time.perf_counter()
+        self.processed = 0
+        self.scored = 0
+        self.failed = 0
+        self.reextracted = 0
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        rate = self.rate()
+        remaining = max(0, self.total - self.processed)
+        eta = f"{remaining / rate / 60:.1f} min" if rate > 0 else "?"
+        percent = self.processed / self.total * 100 if self.total else 100.0
+        return (
+            f"{self.processed}/{self.total} ({percent:.1f}%) | {rate:.1f} apps/s | ETA {eta} | "
+            f"scored {self.scored}, failed {self.failed}, re-extracted {self.reextracted}"
+        )
+
+
+async def reextract_batch(db, apps: List[dict], concurrency: int, progress: Progress) -> Dict[Any, dict]:
+    """
+    Download and re-extract each application's resume. Returns the updated
+    extraction fields by application _id; applications that fail keep their
+    stored data and are scored as they are.
+    """
+    from app.services.b2_storage_service import download_resume_from_b2
+    from app.services.resume_pipeline import candidate_fields, compute_file_hash, extract_resume
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    updates = {}
+
+    async def _reextract(app: dict):
+        file_name = app.get("file_name")
+        if not file_name:
+            return
+        async with semaphore:
+            try:
+                file_content = await download_resume_from_b2(file_name)
+                file_hash = app.get("file_hash") or compute_file_hash(file_content)
+                extracted_text, parsed_candidate_data = await extract_resume(db, file_content, file_name, file_hash)
+            except Exception as e:
+                print(f"  Re-extraction failed for {app['_id']} ({file_name}): {e}")
+                return
+        if not parsed_candidate_data.get("extraction_tier"):
+            print(f"  Re-extraction produced no data for {app['_id']} ({file_name}); keeping stored data")
+            return
+        fields = {**candidate_fields(parsed_candidate_data), "extracted_text": extracted_text}
+        app.update(fields)
+        updates[app["_id"]] = fields
+        progress.reextracted += 1
+
+    await asyncio.gather(*[_reextract(app) for app in apps])
+    return updates
+
 
-async def backfill():
+def build_operations(apps, results, jobs, active_job_ids, extraction_updates, drop_embedded, scored_at, progress):
+    """Bulk operations for one batch: job_scores upserts/cleanup and per-application updates."""
+    score_operations = []
+    application_operations = []
+    scored_app_ids = []
+
+    for app, job_results in zip(apps, results):
+        application_id = str(app["_id"])
+        updates = dict(extraction_updates.get(app["_id"], {}))
+
+        scored_any = False
+        for job, job_score in zip(jobs, job_results):
+            if job_score is None:
+                continue
+            scored_any = True
+            score_operations.append(score_upsert(build_job_score_doc(application_id, job, job_score, scored_at)))
+            if app.get("job_id") == str(job["_id"]):
+                updates.update(primary_score_fields(job_score))
+
+        scored = scored_any or not jobs
+        if scored:
+            progress.scored += 1
+            scored_app_ids.append(application_id)
+            updates["scores_updated_at"] = scored_at
+        else:
+            progress.failed += 1
+        # Legacy embedded scores are only dropped once job_scores has replaced them
+        unset = {"global_job_scores": ""} if drop_embedded and scored else {}
+
+        if updates or unset:
+            update = {"$set": updates} if updates else {}
+            if unset:
+                update["$unset"] = unset
+            application_operations.append(UpdateOne({"_id": app["_id"]}, update))
+
+    if scored_app_ids:
+        # Scores for jobs that are no longer active
+        score_operations.insert(0, DeleteMany({"application_id": {"$in": scored_app_ids}, "job_id": {"$nin": active_job_ids}}))
+    return score_operations, application_operations
+
+
+async def backfill(args):
     client = AsyncIOMotorClient(settings.MONGODB_URL)
     db = client[settings.DB_NAME]
-    
+
     print("Fetching active jobs...")
-    active_jobs = await db.jobs.find({"is_active": {"$ne": False}}).to_list(length=200)
-    print(f"Found {len(active_jobs)} active jobs.")
-    
-    print("Fetching applications without global_job_scores...")
-    # Find applications where global_job_scores is missing or empty
-    cursor = db.applications.find({
-        "$or": [
-            {"global_job_scores": {"$exists": False}},
-            {"global_job_scores": None},
-            {"global_job_scores": {"$size": 0}}
-        ]
-    })
-    
-    updated_count = 0
-    skipped_count = 0
-    error_count = 0
-    
-    async for app in cursor:
-        app_id = app.get("_id")
-        parsed_data = app.get("parsed_data", {})
-        extracted_text = app.get("extracted_text", "")
-        
-        # In our DB schema, parsed_data might be missing but we can try to reconstruct it or evaluate_application_v2 might need it.
-        # Wait, if parsed_data is not stored in app, but only extracted_text is, then evaluate_application_v2 will be limited to using extracted_text?
-        # Let's check if evaluate_application_v2 requires parsed_data. Yes, it takes (parsed_data, extracted_text, job).
-        # We can construct parsed_data from app's fields: candidate_name_extracted, education, experience, etc.
-        if not parsed_data:
-            parsed_data = {
-                "name": app.get("candidate_name_extracted"),
-                "email": app.get("candidate_email") or app.get("candidate_email_extracted"),
-                "phone": app.get("candidate_phone_extracted"),
-                "skills": app.get("skills_extracted", []),
-                "experience": app.get("experience_extracted", []),
-                "education": app.get("education_extracted", []),
-            }
-            
-        print(f"Processing application {app_id} for candidate {parsed_data.get('name')}")
-        global_job_scores = []
-        
-        for job in active_jobs:
-            try:
-                job_score = await evaluate_application_v2(
-                    parsed_data,
-                    extracted_text,
-                    job
-                )
-                global_job_scores.append({
-                    "job_id": str(job["_id"]),
-                    "job_title": job.get("title"),
-                    "final_score": job_score.get("final_score", 0.0),
-                    "skill_score": job_score.get("skill_score", 0.0),
-                    "experience_score": job_score.get("experience_score", 0.0),
-                    "education_score": job_score.get("education_score", 0.0),
-                    "matched_skills": job_score.get("matched_skills", []),
-                    "status": "applied",
-                    "applied_at": datetime.utcnow()
-                })
-            except Exception as e:
-                print(f"  Error scoring against job {job.get('title')}: {e}")
-                
-        if global_job_scores:
-            await db.applications.update_one(
-                {"_id": app_id},
-                {"$set": {"global_job_scores": global_job_scores}}
+    jobs = await db.jobs.find({"is_active": {"$ne": False}}).to_list(length=None)
+    active_job_ids = [str(job["_id"]) for job in jobs]
+    print(f"Found {len(jobs)} active jobs.")
+
+    query = build_filter(args)
+    name = checkpoint_name(args)
+    checkpoint = None if args.restart else await db.backfill_checkpoints.find_one({"_id": name})
+    last_id = checkpoint.get("last_id") if checkpoint else None
+    if last_id is not None:
+        print(f"Resuming '{name}' after _id {last_id} ({checkpoint.get('processed', 0)} already processed)")
+
+    def _page_filter():
+        return {"$and": [query, {"_id": {"$gt": last_id}}]} if last_id is not None else query
+
+    total = await db.applications.count_documents(_page_filter())
+    print(f"{total} applications to process (mode={args.mode}{', dry run' if args.dry_run else ''})")
+    if not total:
+        return
+
+    progress = Progress(total)
+    scored_at = datetime.utcnow()
+    pool = None
+    if args.workers > 0:
+        pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(jobs,))
+    loop = asyncio.get_running_loop()
+
+    try:
+        while True:
+            apps = await db.applications.find(_page_filter(), BACKFILL_PROJECTION).sort("_id", 1).limit(args.batch_size).to_list(length=args.batch_size)
+            if not apps:
+                break
+
+            extraction_updates = {}
+            if args.mode == "reextract":
+                # Failed re-extractions keep their old extractor_version, so a --restart retries them
+                extraction_updates = await reextract_batch(db, apps, args.extract_concurrency, progress)
+
+            if pool is not None:
+                chunk_size = max(1, -(-len(apps) // args.workers))
+                chunks = [apps[i:i + chunk_size] for i in range(0, len(apps), chunk_size)]
+                chunk_results = await asyncio.gather(*[loop.run_in_executor(pool, score_chunk, chunk) for chunk in chunks])
+                results = [result for chunk in chunk_results for result in chunk]
+            else:
+                results = score_chunk(apps, jobs)
+
+            score_operations, application_operations = build_operations(
+                apps, results, jobs, active_job_ids, extraction_updates, args.drop_embedded, scored_at, progress
             )
-            updated_count += 1
-            print(f"  Updated successfully with {len(global_job_scores)} scores.")
-        else:
-            skipped_count += 1
-            
-    print(f"Done! Updated: {updated_count}, Skipped: {skipped_count}, Errors: {error_count}")
+            last_id = apps[-1]["_id"]
+            progress.processed += len(apps)
+
+            if args.dry_run:
+                print(f"  [dry run] would write {len(score_operations)} score ops, {len(application_operations)} application updates")
+            else:
+                if score_operations:
+                    await db.job_scores.bulk_write(score_operations, ordered=True)
+                if application_operations:
+                    await db.applications.bulk_write(application_operations, ordered=False)
+                await db.backfill_checkpoints.update_one(
+                    {"_id": name},
+                    {
+                        "$set": {"last_id": last_id, "processed": progress.processed + (checkpoint or {}).get("processed", 0),
+                                 "mode": args.mode, "updated_at": datetime.utcnow()},
+                        "$setOnInsert": {"started_at": datetime.utcnow()}
+                    },
+                    upsert=True
+                )
+
+            print(progress.report())
+
+            # Stay under --max-rate applications per second
+            if args.max_rate > 0:
+                ahead_by = progress.processed / args.max_rate - (time.perf_counter() - progress.started)
+                if ahead_by > 0:
+                    await asyncio.sleep(ahead_by)
+
+            if args.limit and progress.processed >= args.limit:
+                break
+
+        # A finished run needs no resume point; the next run starts from the beginning
+        if not args.dry_run and not (args.limit and progress.processed >= args.limit):
+            await db.backfill_checkpoints.delete_one({"_id": name})
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if args.mode == "reextract":
+            from app.services.extraction_executor import shutdown_extraction_executor
+            from app.services.llm_gateway import close_llm_gateway
+            shutdown_extraction_executor()
+            await close_llm_gateway()
+        client.close()
+
+    print(f"Done! {progress.report()}")
+    if progress.reextracted:
+        print("Candidate skills changed: rebuild the skill index (POST /api/v1/system/skill-index/rebuild).")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill or rescore candidate-job scores into job_scores.")
+    parser.add_argument("--mode", choices=["missing", "stale", "all", "reextract"], default="missing")
+    parser.add_argument("--since", type=datetime.fromisoformat,
+                        help="stale mode: rescore applications scored before this ISO date/time")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="scoring processes (0 scores in this process)")
+    parser.add_argument("--max-rate", type=float, default=0,
+                        help="maximum applications per second (0 = unlimited)")
+    parser.add_argument("--extract-concurrency", type=int, default=2,
+                        help="reextract mode: resumes downloaded and extracted at once")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many applications")
+    parser.add_argument("--dry-run", action="store_true", help="score but write nothing (including the checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="ignore any saved checkpoint and start from the beginning")
+    parser.add_argument("--checkpoint", help="checkpoint name (defaults to one derived from the mode)")
+    parser.add_argument("--drop-embedded", action="store_true",
+                        help="remove the legacy embedded global_job_scores arrays once migrated")
+    args = parser.parse_args(argv)
+
+    if args.mode == "stale" and not args.since:
+        parser.error("--mode stale requires --since")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    return args
+
 
 if __name__ == "__main__":
-    asyncio.run(backfill())
+    asyncio.run(backfill(parse_args()))
@@ -0,0 +1,10 @@
+"""
+Offline performance benchmarks for the backend.
+
+Run from the backend directory, e.g.:
+    python -m benchmarks.bench_scoring
+    python -m benchmarks.bench_scoring --compare benchmarks/results/scoring-<before>.json
+
+Each run writes a JSON result file (benchmarks/results/ by default) tagged
+with the git commit, so runs before and after a change can be compared.
+"""
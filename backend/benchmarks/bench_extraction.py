@@ -0,0 +1,271 @@
+"""
+Text-extraction benchmarks over the generated corpus (see benchmarks/corpus.py).
+
+Every (document, stage) pair runs in a fresh subprocess, so the import cost,
+model loading and peak RSS of each stage are measured on their own.
+Reported per case (<kind>/<stage>):
+    import_s       importing app.services.resume_extractor
+    first_s        first call (includes lazy initialisation such as OCR models)
+    median_s       median of the following calls
+    chars          characters extracted, and coverage of the source text
+    peak_rss_mb    process peak RSS; rss_growth_mb is the growth caused by the stage itself
+
+Stages:
+    extract_text_from_bytes   the full upload path (all kinds, including DOCX)
+    pymupdf                   _extract_from_pdf_pymupdf
+    pdfplumber                _extract_from_pdf
+    easyocr                   _extract_from_pdf_ocr with OCR_ENGINE=easyocr     (scanned/mixed PDFs unless --ocr-all)
+    tesseract                 _extract_from_pdf_ocr with OCR_ENGINE=tesseract   (scanned/mixed PDFs unless --ocr-all)
+    docx_stream               docx_extractor.extract_docx_text                  (DOCX only)
+    python_docx               python-docx paragraphs + table cells, as a baseline (DOCX only)
+
+OCR runs in the shared OCR worker pool, so for OCR stages first_s includes
+starting the worker and loading the engine, and peak_rss_mb covers only the
+calling process (the worker's memory is not included).
+
+Usage (from the backend directory, offline once OCR models are cached):
+    python -m benchmarks.bench_extraction
+    python -m benchmarks.bench_extraction --stages pymupdf pdfplumber --repeat 5
+    python -m benchmarks.bench_extraction --compare benchmarks/results/extraction-<before>.json
+    python -m benchmarks.bench_extraction --show before.json after.json --metric peak_rss_mb
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import BACKEND_DIR, compare_table, load_results, write_results
+from benchmarks.corpus import DEFAULT_CORPUS_DIR, build_corpus, load_manifest
+
+RESULT_MARKER = "BENCH_RESULT "
+
+PDF_KINDS = {"text_pdf", "multicol_pdf", "scanned_pdf", "mixed_pdf"}
+OCR_KINDS = {"scanned_pdf", "mixed_pdf"}
+OCR_STAGES = {"easyocr", "tesseract"}
+DOCX_KINDS = {"docx_tables", "docx_large"}
+DOCX_STAGES = {"docx_stream", "python_docx"}
+
+# stage -> (resume_extractor attribute or "module:function", passes filename too, OCR_ENGINE for the child)
+STAGES = {
+    "extract_text_from_bytes": ("extract_text_from_bytes", True, None),
+    "pymupdf": ("_extract_from_pdf_pymupdf", False, None),
+    "pdfplumber": ("_extract_from_pdf", False, None),
+    "easyocr": ("_extract_from_pdf_ocr", False, "easyocr"),
+    "tesseract": ("_extract_from_pdf_ocr", False, "tesseract"),
+    "docx_stream": ("app.services.docx_extractor:extract_docx_text", False, None),
+    "python_docx": ("benchmarks.bench_extraction:python_docx_text", False, None),
+}
+
+
+def python_docx_text(content: bytes) -> str:
+    """Baseline DOCX extraction with python-docx: body paragraphs, then every table row."""
+    import io
+    import docx
+
+    document = docx.Document(io.BytesIO(content))
+    lines = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            lines.append(" | ".join(cell.text for cell in row.cells))
+    return "\n".join(lines)
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ============================================================================
+# Child process: one stage on one document
+# ============================================================================
+
+def run_child(stage: str, path: str, repeat: int) -> dict:
+    result = {"stage": stage, "file": Path(path).name}
+    baseline_rss = _peak_rss_mb()
+    started = time.perf_counter()
+    try:
+        from app.services import resume_extractor
+    except Exception as e:
+        return {**result, "error": f"import failed: {type(e).__name__}: {e}"}
+    result["import_s"] = time.perf_counter() - started
+    result["import_rss_mb"] = _peak_rss_mb() - baseline_rss
+
+    attribute, with_filename, _ = STAGES[stage]
+    if ":" in attribute:
+        import importlib
+        module_name, attribute = attribute.split(":")
+        fn = getattr(importlib.import_module(module_name), attribute, None)
+    else:
+        module_name = "resume_extractor"
+        fn = getattr(resume_extractor, attribute, None)
+    if fn is None:
+        return {**result, "skipped": f"{module_name}.{attribute} not found"}
+
+    data = Path(path).read_bytes()
+    args = (data, Path(path).name) if with_filename else (data,)
+    rss_before = _peak_rss_mb()
+    timings, text = [], ""
+    try:
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            text = fn(*args) or ""
+            timings.append(time.perf_counter() - started)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    if timings:
+        result["first_s"] = timings[0]
+        result["median_s"] = statistics.median(timings[1:] or timings)
+    result["chars"] = len(text.strip())
+    result["peak_rss_mb"] = _peak_rss_mb()
+    result["rss_growth_mb"] = max(0.0, result["peak_rss_mb"] - rss_before)
+    return result
+
+
+# ============================================================================
+# Parent: corpus x stages
+# ============================================================================
+
+def applicable(kind: str, stage: str, ocr_all: bool) -> bool:
+    if stage == "extract_text_from_bytes":
+        return True
+    if stage in DOCX_STAGES:
+        return kind in DOCX_KINDS
+    if kind not in PDF_KINDS:
+        return False
+    if stage in OCR_STAGES:
+        return ocr_all or kind in OCR_KINDS
+    return True
+
+
+def run_case(stage: str, path: Path, repeat: int, timeout: float) -> dict:
+    command = [sys.executable, "-m", "benchmarks.bench_extraction", "--child", stage, str(path), "--repeat", str(repeat)]
+    env = dict(os.environ)
+    if STAGES[stage][2]:
+        env["OCR_ENGINE"] = STAGES[stage][2]
+    try:
+        completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"stage": stage, "file": path.name, "error": f"timed out after {timeout:.0f}s"}
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    tail = (completed.stderr or completed.stdout).strip().splitlines()[-1:] or ["no output"]
+    return {"stage": stage, "file": path.name, "error": f"exit {completed.returncode}: {tail[0]}"}
+
+
+def aggregate(rows: list, manifest: list) -> dict:
+    """Per <kind>/<stage> medians over documents (max for memory)."""
+    source_chars = {entry["file"]: entry["source_chars"] for entry in manifest}
+    kinds = {entry["file"]: entry["kind"] for entry in manifest}
+    groups = {}
+    for row in rows:
+        groups.setdefault(f"{kinds[row['file']]}/{row['stage']}", []).append(row)
+
+    cases = {}
+    for name, group in groups.items():
+        ok = [row for row in group if "median_s" in row and not row.get("error")]
+        case = {
+            "documents": len(group),
+            "errors": len([row for row in group if row.get("error")]),
+            "skipped": len([row for row in group if row.get("skipped")]),
+        }
+        if ok:
+            case.update({
+                "import_s": statistics.median(row["import_s"] for row in ok),
+                "first_s": statistics.median(row["first_s"] for row in ok),
+                "median_s": statistics.median(row["median_s"] for row in ok),
+                "chars": round(statistics.mean(row["chars"] for row in ok)),
+                "coverage": round(statistics.mean(row["chars"] / max(1, source_chars[row["file"]]) for row in ok), 3),
+                "peak_rss_mb": round(max(row["peak_rss_mb"] for row in ok), 1),
+                "rss_growth_mb": round(max(row["rss_growth_mb"] for row in ok), 1),
+            })
+        cases[name] = case
+    return cases
+
+
+def print_cases(cases: dict):
+    print(f"\n{'case':<40} {'first':>9} {'median':>9} {'chars':>7} {'cover':>6} {'peakRSS':>8} {'+RSS':>7}  notes")
+    for name, case in cases.items():
+        if "median_s" not in case:
+            print(f"{name:<40} {'-':>9} {'-':>9} {'-':>7} {'-':>6} {'-':>8} {'-':>7}  "
+                  f"errors={case['errors']} skipped={case['skipped']}")
+            continue
+        notes = f"errors={case['errors']}" if case["errors"] else ""
+        print(f"{name:<40} {case['first_s'] * 1000:8.1f}ms {case['median_s'] * 1000:8.1f}ms {case['chars']:>7} "
+              f"{case['coverage']:>6.2f} {case['peak_rss_mb']:>6.0f}MB {case['rss_growth_mb']:>5.0f}MB  {notes}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark resume text extraction stages.")
+    parser.add_argument("--child", nargs=2, metavar=("STAGE", "FILE"), help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR))
+    parser.add_argument("--regenerate", action="store_true", help="rebuild the corpus first")
+    parser.add_argument("--per-kind", type=int, default=3, help="documents per kind when generating the corpus")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--kinds", nargs="+", help="only these document kinds")
+    parser.add_argument("--ocr-all", action="store_true", help="also OCR the PDFs that have a text layer")
+    parser.add_argument("--repeat", type=int, default=3, help="calls per document and stage (first one reported separately)")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds per document and stage")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/extraction-<commit>-<time>.json)")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT", help="print this run against earlier result files")
+    parser.add_argument("--show", nargs="+", metavar="RESULT", help="only print a comparison of existing result files")
+    parser.add_argument("--metric", default="median_s", help="metric for comparison tables")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(RESULT_MARKER + json.dumps(run_child(args.child[0], args.child[1], args.repeat)))
+        return
+    if args.show:
+        print(compare_table([load_results(p) for p in args.show], metric=args.metric))
+        return
+
+    corpus_dir = Path(args.corpus)
+    manifest = [] if args.regenerate else load_manifest(corpus_dir)
+    if not manifest:
+        print(f"Generating corpus in {corpus_dir} ...")
+        manifest = build_corpus(corpus_dir, per_kind=args.per_kind)
+    if args.kinds:
+        manifest = [entry for entry in manifest if entry["kind"] in args.kinds]
+
+    rows = []
+    for entry in manifest:
+        for stage in args.stages:
+            if not applicable(entry["kind"], stage, args.ocr_all):
+                continue
+            row = run_case(stage, corpus_dir / entry["file"], args.repeat, args.timeout)
+            rows.append(row)
+            status = row.get("error") or row.get("skipped") or f"{row.get('median_s', 0) * 1000:.1f} ms, {row.get('chars')} chars"
+            print(f"{entry['file']:<22} {stage:<24} {status}")
+
+    cases = aggregate(rows, manifest)
+    print_cases(cases)
+
+    results = {
+        "parameters": {"repeat": args.repeat, "stages": args.stages, "ocr_all": args.ocr_all, "corpus": str(corpus_dir)},
+        "corpus": manifest,
+        "documents": rows,
+        "cases": cases,
+    }
+    if not args.no_save:
+        path = write_results("extraction", results, args.output)
+        print(f"\nResults written to {path}")
+        results = load_results(str(path))
+    if args.compare:
+        print()
+        print(compare_table([load_results(p) for p in args.compare] + [results], metric=args.metric))
+
+
+if __name__ == "__main__":
+    main()
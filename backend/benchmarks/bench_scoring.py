@@ -0,0 +1,112 @@
+"""
+ResumeScorer benchmarks on synthetic candidates and jobs.
+
+Cases:
+    score_application            one candidate against one job
+    score_skills/plain|weighted  _score_skills alone
+    fanout/<N>_jobs/per_job      upload-style scoring against N active jobs, one score_application per job
+    fanout/<N>_jobs/batch        the same through score_against_jobs (what uploads use)
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_scoring
+    python -m benchmarks.bench_scoring --jobs 10 100 1000 10000 --output before.json
+    python -m benchmarks.bench_scoring --compare before.json
+    python -m benchmarks.bench_scoring --show before.json after.json
+"""
+
+import argparse
+import itertools
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.scoring_engine import ResumeScorer
+from benchmarks.common import compare_table, load_results, measure, measure_allocations, write_results
+from benchmarks.synthetic import make_candidates, make_jobs
+
+
+def run(job_counts, candidates: int, words: int, repeat: int, skip_per_job_above: int) -> dict:
+    scorer = ResumeScorer()
+    pairs = make_candidates(candidates, seed=1, words=words)
+    jobs = make_jobs(max(job_counts + [200]), seed=2)
+    plain_jobs = [job for job in jobs if "required_skills" in job][:100]
+    weighted_jobs = [job for job in jobs if "weighted_skills" in job][:100]
+    cases = {}
+
+    def _record(name: str, fn, items_per_call: int = 1):
+        stats = measure(fn, repeat=repeat)
+        stats.update(measure_allocations(fn))
+        if items_per_call > 1 and stats["median_s"]:
+            stats["items_per_call"] = items_per_call
+            stats["items_per_s"] = items_per_call / stats["median_s"]
+        cases[name] = stats
+        rate = f"{stats['items_per_s']:.0f} jobs/s" if "items_per_s" in stats else f"{stats['calls_per_s']:.0f} calls/s"
+        print(f"{name:<32} {stats['median_s'] * 1000:10.3f} ms  {rate:>16}  peak {stats['peak_traced_kb']:.0f} KB")
+
+    # Rotate through candidates/jobs so caches see a realistic mix
+    single = itertools.cycle([(c, t, j) for (c, t), j in zip(itertools.cycle(pairs), jobs[:200])])
+    _record("score_application", lambda: scorer.score_application(*next(single)))
+
+    for label, job_list in (("plain", plain_jobs), ("weighted", weighted_jobs)):
+        skill_inputs = itertools.cycle([
+            (c["skills"], job.get("weighted_skills") or job.get("required_skills"), t)
+            for (c, t), job in zip(itertools.cycle(pairs), job_list)
+        ])
+        _record(f"score_skills/{label}", lambda: scorer._score_skills(*next(skill_inputs)))
+
+    for count in job_counts:
+        job_set = jobs[:count]
+        candidate_cycle = itertools.cycle(pairs)
+
+        if count <= skip_per_job_above:
+            def _per_job():
+                candidate, text = next(candidate_cycle)
+                for job in job_set:
+                    scorer.score_application(candidate, text, job)
+            _record(f"fanout/{count}_jobs/per_job", _per_job, items_per_call=count)
+
+        def _batch():
+            candidate, text = next(candidate_cycle)
+            scorer.score_against_jobs(candidate, text, job_set)
+        _record(f"fanout/{count}_jobs/batch", _batch, items_per_call=count)
+
+    return {
+        "parameters": {
+            "job_counts": job_counts, "candidates": candidates, "resume_words": words, "repeat": repeat,
+        },
+        "cases": cases,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ResumeScorer on synthetic data.")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 100, 1000, 10000], help="fan-out job counts")
+    parser.add_argument("--candidates", type=int, default=20, help="distinct synthetic candidates to rotate through")
+    parser.add_argument("--words", type=int, default=700, help="approximate resume length in words")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-per-job-above", type=int, default=10000,
+                        help="skip the per-job fan-out loop above this many jobs")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/scoring-<commit>-<time>.json)")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT", help="print this run against earlier result files")
+    parser.add_argument("--show", nargs="+", metavar="RESULT", help="only print a comparison of existing result files")
+    parser.add_argument("--metric", default="median_s", help="metric for comparison tables")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        print(compare_table([load_results(p) for p in args.show], metric=args.metric))
+        return
+
+    results = run(sorted(args.jobs), args.candidates, args.words, args.repeat, args.skip_per_job_above)
+    if not args.no_save:
+        path = write_results("scoring", results, args.output)
+        print(f"\nResults written to {path}")
+        results = load_results(str(path))
+    if args.compare:
+        print()
+        print(compare_table([load_results(p) for p in args.compare] + [results], metric=args.metric))
+
+
+if __name__ == "__main__":
+    main()
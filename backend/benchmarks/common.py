@@ -0,0 +1,169 @@
+"""
+Shared helpers for benchmark runners: timing, allocation tracking, result
+files and before/after comparison tables.
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def git_commit() -> Dict[str, Any]:
+    """Current commit and whether the working tree has uncommitted changes."""
+    def _git(*args) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+
+    try:
+        return {"sha": _git("rev-parse", "HEAD") or None, "dirty": bool(_git("status", "--porcelain", "--", "."))}
+    except Exception:
+        return {"sha": None, "dirty": None}
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> Dict[str, Any]:
+    """
+    Time fn: calibrate a loop count so one sample takes at least min_time,
+    then take `repeat` samples. Reports per-call seconds (best / median).
+    """
+    fn()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "loops": number,
+        "repeat": repeat,
+        "best_s": min(samples),
+        "median_s": statistics.median(samples),
+        "calls_per_s": 1.0 / statistics.median(samples) if statistics.median(samples) > 0 else None,
+    }
+
+
+def measure_allocations(fn: Callable[[], Any]) -> Dict[str, Any]:
+    """
+    Allocation profile of one call under tracemalloc: peak traced memory,
+    and the number/size of blocks still allocated afterwards (by allocation site).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    diff = after.compare_to(before, "lineno")
+    return {
+        "peak_traced_kb": round(peak / 1024, 1),
+        "retained_blocks": sum(stat.count_diff for stat in diff if stat.count_diff > 0),
+        "retained_kb": round(sum(stat.size_diff for stat in diff if stat.size_diff > 0) / 1024, 1),
+    }
+
+
+def write_results(name: str, results: Dict[str, Any], output: Optional[str] = None) -> Path:
+    """Write a result file tagged with commit/environment; returns its path."""
+    commit = git_commit()
+    payload = {
+        "benchmark": name,
+        "created_at": datetime.utcnow().isoformat(),
+        "commit": commit,
+        "environment": environment(),
+        **results,
+    }
+    if output:
+        path = Path(output)
+    else:
+        sha = (commit.get("sha") or "nogit")[:10] + ("-dirty" if commit.get("dirty") else "")
+        path = RESULTS_DIR / f"{name}-{sha}-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, default=str))
+    return path
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def compare_table(runs: List[Dict[str, Any]], metric: str = "median_s", key: str = "cases") -> str:
+    """
+    Text table of one metric per case across runs, with the change of the
+    last run relative to the first. `runs` are loaded result files whose
+    `key` maps case name -> metrics dict.
+    """
+    labels = [
+        ((run.get("commit") or {}).get("sha") or "?")[:10] + ("*" if (run.get("commit") or {}).get("dirty") else "")
+        for run in runs
+    ]
+    cases = []
+    for run in runs:
+        for case in run.get(key, {}):
+            if case not in cases:
+                cases.append(case)
+
+    width = max([len(c) for c in cases] + [10])
+    lines = [f"{'case':<{width}}  " + "  ".join(f"{label:>14}" for label in labels) + ("  change" if len(runs) > 1 else "")]
+    for case in cases:
+        values = [run.get(key, {}).get(case, {}).get(metric) for run in runs]
+        cells = [f"{_format_value(v, metric):>14}" for v in values]
+        change = ""
+        if len(runs) > 1 and values[0] and values[-1] is not None:
+            change = f"  {(values[-1] - values[0]) / values[0] * 100:+.1f}%"
+        lines.append(f"{case:<{width}}  " + "  ".join(cells) + change)
+    return "\n".join(lines)
+
+
+def _format_value(value, metric: str) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float) and metric.endswith("_s"):
+        if value < 1e-3:
+            return f"{value * 1e6:.1f}us"
+        if value < 1:
+            return f"{value * 1e3:.2f}ms"
+        return f"{value:.3f}s"
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
@@ -0,0 +1,223 @@
+"""
+Generated resume corpus for extraction benchmarks.
+
+Builds, from the synthetic resume texts, these kinds of documents:
+    text_pdf       single-column text PDF
+    multicol_pdf   two-column text PDF (sidebar-style layouts)
+    scanned_pdf    the text PDF rendered to images, with no text layer
+    mixed_pdf      text PDF of at least two pages whose last page is scanned
+    docx_tables    DOCX with a contact header, paragraphs plus skills/experience tables
+    docx_large     docx_tables plus a long project table (thousands of rows), for memory comparisons
+
+Generation is deterministic and offline (PyMuPDF and python-docx only).
+A manifest.json next to the files records each document's kind, page count
+and how many characters of source text it contains.
+"""
+
+import io
+import json
+import random
+import textwrap
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.synthetic import make_candidate, make_resume_text
+
+KINDS = ["text_pdf", "multicol_pdf", "scanned_pdf", "mixed_pdf", "docx_tables", "docx_large"]
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+_PAGE_WIDTH, _PAGE_HEIGHT = 595, 842  # A4 in points
+_MARGIN = 48
+_FONT_SIZE = 9.5
+_LINE_HEIGHT = 12.5
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines = []
+    for paragraph in text.split("\n"):
+        lines.extend(textwrap.wrap(paragraph, width) or [""])
+    return lines
+
+
+def _text_pdf(text: str, min_pages: int = 1) -> bytes:
+    import fitz
+
+    doc = fitz.open()
+    lines = _wrap(text, 95)
+    per_page = int((_PAGE_HEIGHT - 2 * _MARGIN) / _LINE_HEIGHT)
+    per_page = min(per_page, -(-len(lines) // min_pages))
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+        page.insert_text((_MARGIN, _MARGIN), "\n".join(lines[start:start + per_page]),
+                         fontsize=_FONT_SIZE, lineheight=_LINE_HEIGHT / _FONT_SIZE)
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def _multicolumn_pdf(text: str) -> bytes:
+    import fitz
+
+    doc = fitz.open()
+    column_width = (_PAGE_WIDTH - 2 * _MARGIN - 24) / 2
+    lines = _wrap(text, 46)
+    per_column = int((_PAGE_HEIGHT - 2 * _MARGIN) / _LINE_HEIGHT)
+    for start in range(0, len(lines), per_column * 2):
+        page = doc.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+        for column in range(2):
+            chunk = lines[start + column * per_column:start + (column + 1) * per_column]
+            if chunk:
+                x = _MARGIN + column * (column_width + 24)
+                page.insert_text((x, _MARGIN), "\n".join(chunk),
+                                 fontsize=_FONT_SIZE, lineheight=_LINE_HEIGHT / _FONT_SIZE)
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def _scanned_pdf(text: str, dpi: int = 150) -> bytes:
+    """Render each page of the text PDF to an image and keep only the images."""
+    import fitz
+
+    source = fitz.open(stream=_text_pdf(text), filetype="pdf")
+    doc = fitz.open()
+    for source_page in source:
+        pixmap = source_page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        page = doc.new_page(width=source_page.rect.width, height=source_page.rect.height)
+        page.insert_image(page.rect, stream=pixmap.tobytes("png"))
+    source.close()
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def _mixed_pdf(text: str, dpi: int = 150) -> bytes:
+    """Text PDF whose last page is replaced by an image of itself (e.g. a scanned certificate page)."""
+    import fitz
+
+    doc = fitz.open(stream=_text_pdf(text, min_pages=2), filetype="pdf")
+    last = doc[-1]
+    pixmap = last.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+    width, height = last.rect.width, last.rect.height
+    doc.delete_page(-1)
+    page = doc.new_page(width=width, height=height)
+    page.insert_image(page.rect, stream=pixmap.tobytes("png"))
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def _docx_text(document) -> str:
+    """All text written into a python-docx document: header, body paragraphs and table cells."""
+    parts = [paragraph.text for section in document.sections for paragraph in section.header.paragraphs]
+    parts.extend(paragraph.text for paragraph in document.paragraphs)
+    for table in document.tables:
+        for row in table.rows:
+            parts.extend(cell.text for cell in row.cells)
+    return "\n".join(part for part in parts if part)
+
+
+def _docx_with_tables(rng: random.Random, candidate: dict, text: str, project_rows: int = 0) -> Tuple[bytes, str]:
+    """Return the DOCX bytes and the text written into it (tables included)."""
+    import docx
+
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = f"{candidate['name']} | {candidate['email']}"
+    document.add_heading(candidate["name"], level=1)
+    for paragraph in text.split("\n"):
+        if paragraph.isupper():
+            document.add_heading(paragraph.title(), level=2)
+        elif paragraph:
+            document.add_paragraph(paragraph)
+
+    document.add_heading("Skills Matrix", level=2)
+    skills = candidate["skills"]
+    table = document.add_table(rows=0, cols=3)
+    for start in range(0, len(skills), 3):
+        cells = table.add_row().cells
+        for offset, skill in enumerate(skills[start:start + 3]):
+            cells[offset].text = skill
+
+    document.add_heading("Employment History", level=2)
+    history = document.add_table(rows=1, cols=3)
+    for cell, header in zip(history.rows[0].cells, ["Company", "Role", "Years"]):
+        cell.text = header
+    for _ in range(rng.randint(2, 5)):
+        cells = history.add_row().cells
+        cells[0].text = rng.choice(["Acme Corp", "Globex", "Initech", "Hooli"])
+        cells[1].text = rng.choice(["Engineer", "Senior Engineer", "Lead", "Analyst"])
+        cells[2].text = f"{rng.randint(2010, 2020)}-{rng.randint(2021, 2025)}"
+
+    if project_rows:
+        document.add_heading("Projects", level=2)
+        projects = document.add_table(rows=0, cols=3)
+        for number in range(project_rows):
+            cells = projects.add_row().cells
+            cells[0].text = f"Project {number}"
+            cells[1].text = ", ".join(rng.sample(candidate["skills"], min(3, len(candidate["skills"]))))
+            cells[2].text = f"{rng.randint(2010, 2025)}"
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue(), _docx_text(document)
+
+
+def build_corpus(out_dir: Path = DEFAULT_CORPUS_DIR, per_kind: int = 3, seed: int = 0,
+                 words: List[int] = (400, 900, 1600)) -> List[Dict]:
+    """Write the corpus to out_dir (replacing earlier files) and return its manifest."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    manifest = []
+
+    for kind in KINDS:
+        for index in range(per_kind):
+            candidate = make_candidate(rng)
+            text = make_resume_text(rng, candidate, words=words[index % len(words)])
+            source = text
+            if kind == "text_pdf":
+                data, ext = _text_pdf(text), "pdf"
+            elif kind == "multicol_pdf":
+                data, ext = _multicolumn_pdf(text), "pdf"
+            elif kind == "scanned_pdf":
+                data, ext = _scanned_pdf(text), "pdf"
+            elif kind == "mixed_pdf":
+                data, ext = _mixed_pdf(text), "pdf"
+            elif kind == "docx_tables":
+                (data, source), ext = _docx_with_tables(rng, candidate, text), "docx"
+            else:
+                (data, source), ext = _docx_with_tables(rng, candidate, text, project_rows=3000), "docx"
+
+            filename = f"{kind}_{index}.{ext}"
+            (out_dir / filename).write_bytes(data)
+            pages = None
+            if ext == "pdf":
+                import fitz
+                with fitz.open(stream=data, filetype="pdf") as doc:
+                    pages = doc.page_count
+            manifest.append({
+                "file": filename, "kind": kind, "bytes": len(data), "pages": pages,
+                "source_chars": len(source),
+            })
+
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def load_manifest(corpus_dir: Path = DEFAULT_CORPUS_DIR) -> List[Dict]:
+    path = Path(corpus_dir) / "manifest.json"
+    return json.loads(path.read_text()) if path.exists() else []
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    parser = argparse.ArgumentParser(description="Generate the extraction benchmark corpus.")
+    parser.add_argument("--out", default=str(DEFAULT_CORPUS_DIR))
+    parser.add_argument("--per-kind", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for entry in build_corpus(Path(args.out), args.per_kind, args.seed):
+        print(f"{entry['file']:<22} {entry['bytes'] / 1024:8.1f} KB  pages={entry['pages']}  chars={entry['source_chars']}")
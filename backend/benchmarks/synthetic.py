@@ -0,0 +1,114 @@
+"""
+Deterministic synthetic candidates, resume texts and job definitions for
+benchmarks. Everything is generated from a seeded random.Random, so the
+same seed always produces the same data.
+"""
+
+import random
+from typing import Any, Dict, List, Tuple
+
+SKILLS = [
+    "python", "java", "c++", "javascript", "typescript", "html", "css", "sql", "nosql",
+    "react", "angular", "vue", "node.js", "django", "flask", "fastapi", "spring boot",
+    "docker", "kubernetes", "aws", "azure", "gcp", "ci/cd", "jenkins", "git",
+    "machine learning", "deep learning", "nlp", "tensorflow", "pytorch", "scikit-learn",
+    "pandas", "numpy", "tableau", "power bi", "excel", "mongodb", "postgresql", "mysql",
+    "redis", "kafka", "spark", "hadoop", "airflow", "terraform", "ansible", "linux",
+    "graphql", "rest api", "microservices", "go", "rust", "scala", "kotlin", "swift",
+    "selenium", "jira", "agile", "scrum", "figma", "uipath", "salesforce", "sap",
+    ".net", "c#", "php", "laravel", "ruby on rails", "elasticsearch", "snowflake",
+]
+
+DEGREES = [
+    "Bachelor of Technology in Computer Science", "B.Tech Information Technology",
+    "Master of Science in Data Science", "MBA", "Bachelor of Engineering",
+    "M.Tech Software Systems", "PhD in Computer Science", "Diploma in Computer Applications",
+    "BSc Mathematics", "Master of Computer Applications",
+]
+
+EDUCATION_REQUIREMENTS = [None, "", "Any", "Bachelor's", "Master's", "PhD", "B.Tech", "MBA", "Diploma"]
+
+TITLES = [
+    "Software Engineer", "Data Scientist", "Backend Developer", "Frontend Engineer",
+    "DevOps Engineer", "ML Engineer", "Full Stack Developer", "QA Automation Engineer",
+    "Cloud Architect", "Data Analyst", "RPA Developer", "Mobile Developer",
+]
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Tyrell"]
+
+FILLER = [
+    "Designed and delivered features end to end, collaborating with product and design",
+    "Improved reliability and performance of production services and reduced incident volume",
+    "Mentored junior engineers, reviewed code and drove adoption of testing best practices",
+    "Owned the release process and worked closely with stakeholders to prioritise the roadmap",
+]
+
+
+def make_candidate(rng: random.Random) -> Dict[str, Any]:
+    """Parsed candidate data shaped like the smart extractor's output."""
+    return {
+        "name": f"Candidate {rng.randint(1, 10**6)}",
+        "email": f"candidate{rng.randint(1, 10**6)}@example.com",
+        "phone": f"+91 9{rng.randint(10**8, 10**9 - 1)}",
+        "skills": [s.title() if rng.random() < 0.3 else s for s in rng.sample(SKILLS, rng.randint(5, 25))],
+        "experience_years": rng.choice([0, 0.5, 1, 2, 2.5, 3, 4, 5, 7, 10, 15]),
+        "experience_months": rng.randint(0, 11),
+        "education": rng.sample(DEGREES, rng.randint(1, 2)),
+        "certifications": [],
+        "summary": "",
+    }
+
+
+def make_resume_text(rng: random.Random, candidate: Dict[str, Any], words: int = 700) -> str:
+    """A resume-like text of roughly `words` words mentioning the candidate's skills and more."""
+    sections = [
+        candidate["name"],
+        f"{candidate['email']} | {candidate['phone']} | linkedin.com/in/candidate",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {candidate['experience_years']} years of experience.",
+        "SKILLS",
+        ", ".join(candidate["skills"]),
+        "EXPERIENCE",
+    ]
+    text_skills = list(candidate["skills"]) + rng.sample(SKILLS, 10)
+    while sum(len(s.split()) for s in sections) < words - 40:
+        sections.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({rng.randint(2010, 2025)})")
+        for _ in range(rng.randint(3, 6)):
+            sentence = rng.choice(FILLER)
+            sections.append(f"- {sentence} using {rng.choice(text_skills)} and {rng.choice(text_skills)}.")
+    sections.append("EDUCATION")
+    sections.extend(candidate["education"])
+    return "\n".join(sections)
+
+
+def make_job(rng: random.Random, weighted: bool = None) -> Dict[str, Any]:
+    """A job with either plain required_skills or weighted_skills (random if `weighted` is None)."""
+    skills = rng.sample(SKILLS, rng.randint(3, 15))
+    job = {
+        "title": rng.choice(TITLES),
+        "experience_required": rng.choice([0, 1, 2, 3, 5, 8]),
+        "education_required": rng.choice(EDUCATION_REQUIREMENTS),
+        "is_active": True,
+    }
+    if weighted is None:
+        weighted = rng.random() < 0.5
+    if weighted:
+        job["weighted_skills"] = [{"name": s, "weight": rng.choice([1, 2, 3, 5, 8, 10])} for s in skills]
+    else:
+        job["required_skills"] = skills
+    return job
+
+
+def make_jobs(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [make_job(rng) for _ in range(count)]
+
+
+def make_candidates(count: int, seed: int = 0, words: int = 700) -> List[Tuple[Dict[str, Any], str]]:
+    """(parsed candidate, resume text) pairs."""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        candidate = make_candidate(rng)
+        pairs.append((candidate, make_resume_text(rng, candidate, words)))
+    return pairs
@@ -0,0 +1,112 @@
+"""
+Local stand-in for the Groq / HuggingFace chat-completions API.
+
+Returns a canned resume JSON (with the email and name pulled from the prompt
+when present) so the LLM gateway and extraction tiers can be exercised
+without API keys or network access. Latency and failures can be injected:
+
+    STUB_LATENCY=0.5 STUB_FAIL_RATE=0.2 STUB_RATE_LIMIT_RATE=0.1 \
+        python scripts/llm_stub_server.py --port 8099
+
+Then run the backend (or test_llm_gateway.py) with:
+
+    GROQ_API_KEY=stub GROQ_API_BASE=http://127.0.0.1:8099/v1
+    HUGGINGFACEHUB_API_TOKEN=stub HF_API_BASE=http://127.0.0.1:8099/v1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY = float(os.getenv("STUB_LATENCY", 0.2))
+FAIL_RATE = float(os.getenv("STUB_FAIL_RATE", 0))
+RATE_LIMIT_RATE = float(os.getenv("STUB_RATE_LIMIT_RATE", 0))
+
+app = FastAPI(title="LLM stub server")
+stats = {"requests": 0, "failures": 0, "rate_limited": 0}
+
+
+def _fake_resume(prompt: str) -> dict:
+    email = re.search(r"[\w.+-]+@[\w-]+\.[\w.]+", prompt)
+    content = prompt.split("RESUME CONTENT:")[-1].split("Resume Text:")[-1].strip()
+    first_line = next((line.strip() for line in content.splitlines() if line.strip()), "")
+    name = first_line if 0 < len(first_line.split()) <= 4 else "Jane Doe"
+    return {
+        "personal_info": {
+            "name": name,
+            "email": email.group(0) if email else "",
+            "phone": "+1 555 0100",
+            "links": ["https://linkedin.com/in/janedoe", "https://github.com/janedoe"]
+        },
+        "name": name,
+        "email": email.group(0) if email else "",
+        "phone": "+1 555 0100",
+        "skills": ["Python", "FastAPI", "MongoDB", "Docker", "AWS"],
+        "experience": [
+            {
+                "company": "Acme Corp",
+                "title": "Software Engineer",
+                "dates": "Jan 2020 - Present",
+                "bullets": ["Built backend services in Python", "Ran workloads on Kubernetes"]
+            }
+        ],
+        "experience_years": 4.5,
+        "experience_months": 54,
+        "education": [{"institution": "State University", "degree": "B.Tech Computer Science", "year": "2019"}],
+        "certifications": ["AWS Certified Developer"],
+        "awards": ["AWS Certified Developer"],
+        "summary": ""
+    }
+
+
+@app.post("/v1/chat/completions")
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+    await asyncio.sleep(LATENCY * random.uniform(0.5, 1.5))
+
+    roll = random.random()
+    if roll < RATE_LIMIT_RATE:
+        stats["rate_limited"] += 1
+        return JSONResponse(status_code=429, content={"error": {"message": "Rate limit reached"}},
+                            headers={"retry-after": "0.2"})
+    if roll < RATE_LIMIT_RATE + FAIL_RATE:
+        stats["failures"] += 1
+        return JSONResponse(status_code=503, content={"error": {"message": "Service unavailable"}})
+
+    prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+    content = json.dumps(_fake_resume(prompt))
+    return {
+        "id": f"chatcmpl-stub-{stats['requests']}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4
+        }
+    }
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Groq/HuggingFace chat-completions stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Exercise the blob storage backends: the S3 backend against moto's in-process
+S3 stand-in (pip install moto), and the local filesystem backend.
+Checks put/get/stream/head/delete, multipart uploads above the threshold,
+concurrent operations on the shared client and not-found errors.
+Run from backend directory: python test_blob_storage.py [--objects 50]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.blob_storage import BlobNotFoundError, LocalBlobStorage, S3BlobStorage
+
+BUCKET = "test-resumes"
+MULTIPART_THRESHOLD = 5 * 1024 * 1024  # S3's minimum part size
+
+
+async def exercise(storage, objects: int) -> bool:
+    ok = True
+    print(f"\n{'='*60}\n{storage.name} backend\n{'='*60}")
+
+    # Round trip
+    content = os.urandom(200 * 1024)
+    blob = await storage.put("resumes/round_trip.pdf", content, "application/pdf")
+    fetched = await storage.get("resumes/round_trip.pdf")
+    info, chunks = await storage.stream("resumes/round_trip.pdf", chunk_size=64 * 1024)
+    streamed = b"".join([chunk async for chunk in chunks])
+    head = await storage.head("resumes/round_trip.pdf")
+    round_trip = fetched == content and streamed == content and head.size == len(content) == info.size
+    print(f"{'✓' if round_trip else '✗'} put/get/stream/head round trip ({blob.content_type}, url={blob.url})")
+    ok = ok and round_trip
+
+    # Multipart (from a file on disk, not read into memory)
+    large = os.urandom(MULTIPART_THRESHOLD * 2 + 123)
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(large)
+    try:
+        started = time.perf_counter()
+        await storage.put_file("resumes/large.pdf", f.name, "application/pdf")
+        elapsed = time.perf_counter() - started
+    finally:
+        os.unlink(f.name)
+    large_ok = hashlib.md5(await storage.get("resumes/large.pdf")).digest() == hashlib.md5(large).digest()
+    etag = (await storage.head("resumes/large.pdf")).etag or ""
+    print(f"{'✓' if large_ok else '✗'} {len(large) / 2**20:.1f} MB put_file in {elapsed:.2f}s (etag {etag})")
+    ok = ok and large_ok
+
+    # Concurrent operations on the shared client
+    keys = [f"chat_attachments/{i}.txt" for i in range(objects)]
+    started = time.perf_counter()
+    await asyncio.gather(*[storage.put(key, key.encode(), "text/plain") for key in keys])
+    bodies = await asyncio.gather(*[storage.get(key) for key in keys])
+    errors = await storage.delete_many(keys + ["resumes/round_trip.pdf", "resumes/large.pdf"])
+    elapsed = time.perf_counter() - started
+    concurrent_ok = bodies == [key.encode() for key in keys] and not any(errors.values())
+    print(f"{'✓' if concurrent_ok else '✗'} {objects} concurrent puts + gets + deletes in {elapsed:.2f}s")
+    ok = ok and concurrent_ok
+
+    # Missing objects
+    try:
+        await storage.get("resumes/round_trip.pdf")
+        print("✗ deleted object is still readable")
+        ok = False
+    except BlobNotFoundError:
+        print("✓ deleted object raises BlobNotFoundError")
+    await storage.delete("resumes/never_existed.pdf")
+    print("✓ deleting a missing object is not an error")
+    return ok
+
+
+def run_s3(objects: int) -> bool:
+    try:
+        from moto import mock_aws
+    except ImportError:
+        print("✗ moto is not installed (pip install moto); skipping the S3 backend")
+        return True
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        import boto3
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        storage = S3BlobStorage(
+            bucket=BUCKET,
+            endpoint_url=None,
+            access_key_id="test",
+            secret_access_key="test",
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunk_size=MULTIPART_THRESHOLD,
+        )
+        try:
+            return asyncio.run(exercise(storage, objects))
+        finally:
+            storage.close()
+
+
+def run_local(objects: int) -> bool:
+    with tempfile.TemporaryDirectory() as root:
+        return asyncio.run(exercise(LocalBlobStorage(root), objects))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=50)
+    args = parser.parse_args()
+
+    ok = run_s3(args.objects)
+    ok = run_local(args.objects) and ok
+    sys.exit(0 if ok else 1)
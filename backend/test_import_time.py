@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Import-time profile of the API: runs `python -X importtime -c "import app.main"`
+in a fresh interpreter, prints the slowest imports, and checks that no heavy
+extraction/OCR/storage dependency is imported at startup (they are loaded
+lazily through app.core.capabilities) and that the whole import stays within
+the startup budget.
+Run from backend directory: python test_import_time.py [--budget-ms 2000] [--top 25]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent
+
+# Must not be imported by `import app.main`
+HEAVY_MODULES = [
+    "fitz", "pymupdf", "pdfplumber", "pdfminer", "docx", "pdf2image",
+    "easyocr", "torch", "cv2", "pytesseract", "PIL",
+    "boto3", "botocore", "s3transfer",
+]
+
+
+def profile_import(module: str = "app.main") -> list:
+    """(module, self_us, cumulative_us, depth) per import, in import order."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=dict(os.environ), capture_output=True, text=True, timeout=300
+    )
+    if completed.returncode != 0:
+        print(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import failed")
+        raise SystemExit(f"✗ import {module} failed (exit {completed.returncode})")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def print_report(rows: list, top: int):
+    print(f"\nSlowest imports by cumulative time (top {top}):")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms self  {name}")
+
+    # Top-level packages by their own import time, to see where the budget goes
+    packages = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print(f"\nSlowest packages by self time (top {top}):")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+
+def check_heavy_modules(rows: list) -> bool:
+    imported = sorted({name for name, *_ in rows if name.split(".")[0] in HEAVY_MODULES})
+    if imported:
+        print(f"✗ heavy modules imported at startup: {', '.join(imported[:10])}")
+        return False
+    print("✓ no heavy extraction/OCR/storage module imported by app.main")
+    return True
+
+
+def check_budget(rows: list, budget_ms: float) -> bool:
+    total_ms = next((cumulative_us for name, _, cumulative_us, depth in rows if name == "app.main" and depth == 0), 0) / 1000
+    ok = total_ms <= budget_ms
+    print(f"{'✓' if ok else '✗'} import app.main took {total_ms:.0f} ms (budget {budget_ms:.0f} ms, includes -X importtime overhead)")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", 2000)))
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    rows = profile_import()
+    print_report(rows, args.top)
+    print()
+    ok = check_heavy_modules(rows)
+    ok = check_budget(rows, args.budget_ms) and ok
+    sys.exit(0 if ok else 1)
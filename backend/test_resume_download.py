@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Exercise the resume download endpoint logic (resume_download_response) on
+both of its proxy paths: served from the local disk cache, and streamed
+from storage when the cache is disabled. Checks 200 with ETag, Range (206),
+suffix ranges, If-None-Match (304), unsatisfiable ranges (416), fresh and
+stale If-Range, and 404. Runs against the S3 backend on moto (pip install
+moto) and the local filesystem backend; also checks that cache directories
+of exited processes are swept.
+Run from backend directory: python test_resume_download.py
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.services import blob_cache, blob_storage
+from app.services.b2_storage_service import resume_download_response, upload_resume_to_b2
+from app.services.blob_cache import BlobDiskCache, remove_dead_process_dirs
+from app.services.blob_storage import LocalBlobStorage, S3BlobStorage
+
+BUCKET = "test-resumes"
+CONTENT = os.urandom(300_000)
+
+app = FastAPI()
+
+
+@app.get("/resume/{filename}")
+async def download(filename: str, request: Request):
+    return await resume_download_response(request, filename)
+
+
+def check(name: str, condition: bool) -> bool:
+    print(f"{'✓' if condition else '✗'} {name}")
+    return condition
+
+
+def exercise(client: TestClient, path: str) -> bool:
+    results = []
+    full = client.get("/resume/cv.pdf")
+    etag = full.headers.get("etag")
+    results.append(check(f"[{path}] 200 full body with ETag {etag}", full.status_code == 200 and full.content == CONTENT and bool(etag)))
+
+    ranged = client.get("/resume/cv.pdf", headers={"Range": "bytes=100-199"})
+    results.append(check(
+        f"[{path}] 206 for bytes=100-199 ({ranged.headers.get('content-range')})",
+        ranged.status_code == 206 and ranged.content == CONTENT[100:200]
+        and ranged.headers.get("content-range") == f"bytes 100-199/{len(CONTENT)}"
+    ))
+
+    suffix = client.get("/resume/cv.pdf", headers={"Range": "bytes=-10"})
+    results.append(check(f"[{path}] 206 for suffix range bytes=-10", suffix.status_code == 206 and suffix.content == CONTENT[-10:]))
+
+    not_modified = client.get("/resume/cv.pdf", headers={"If-None-Match": etag or ""})
+    results.append(check(f"[{path}] 304 for a matching If-None-Match", not_modified.status_code == 304 and not not_modified.content))
+
+    unsatisfiable = client.get("/resume/cv.pdf", headers={"Range": f"bytes={len(CONTENT) + 10}-"})
+    results.append(check(f"[{path}] 416 for a range past the end", unsatisfiable.status_code == 416))
+
+    fresh = client.get("/resume/cv.pdf", headers={"Range": "bytes=0-9", "If-Range": etag or ""})
+    results.append(check(f"[{path}] 206 for a current If-Range", fresh.status_code == 206 and fresh.content == CONTENT[:10]))
+
+    stale = client.get("/resume/cv.pdf", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    results.append(check(f"[{path}] 200 full body for a stale If-Range", stale.status_code == 200 and stale.content == CONTENT))
+
+    missing = client.get("/resume/never_uploaded.pdf")
+    results.append(check(f"[{path}] 404 for a missing resume", missing.status_code == 404))
+    return all(results)
+
+
+def run_backend(storage) -> bool:
+    print(f"\n{'='*60}\n{storage.name} backend\n{'='*60}")
+    blob_storage._blob_storage = storage
+    asyncio.run(upload_resume_to_b2(CONTENT, "cv.pdf"))
+    ok = True
+    with tempfile.TemporaryDirectory() as cache_dir, TestClient(app) as client:
+        blob_cache._blob_cache = BlobDiskCache(cache_dir, 16 * 1024 * 1024)
+        ok = exercise(client, "cached") and ok
+        stats = blob_cache._blob_cache.get_stats()
+        # Misses: the first request and the 404; the other six requests are served from disk
+        ok = check(f"[cached] one download, later requests hit the cache ({stats['misses']} misses, {stats['hits']} hits)",
+                   stats["objects"] == 1 and stats["misses"] == 2 and stats["hits"] == 6) and ok
+
+        blob_cache._blob_cache = BlobDiskCache(cache_dir, 0)
+        ok = exercise(client, "streamed") and ok
+    blob_cache._blob_cache = None
+    return ok
+
+
+def run_s3() -> bool:
+    try:
+        from moto import mock_aws
+    except ImportError:
+        print("✗ moto is not installed (pip install moto); skipping the S3 backend")
+        return True
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        import boto3
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        storage = S3BlobStorage(bucket=BUCKET, endpoint_url=None, access_key_id="test", secret_access_key="test")
+        try:
+            return run_backend(storage)
+        finally:
+            storage.close()
+
+
+def run_local() -> bool:
+    with tempfile.TemporaryDirectory() as root:
+        return run_backend(LocalBlobStorage(root))
+
+
+def run_sweep() -> bool:
+    print(f"\n{'='*60}\ncache directories of exited processes\n{'='*60}")
+    with tempfile.TemporaryDirectory() as root:
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        for pid in (exited.pid, os.getpid()):
+            os.makedirs(os.path.join(root, str(pid)))
+        removed = remove_dead_process_dirs(root)
+        return check(
+            f"exited process directory removed, live one kept ({removed} removed)",
+            sorted(os.listdir(root)) == [str(os.getpid())]
+        )
+
+
+if __name__ == "__main__":
+    ok = run_s3()
+    ok = run_local() and ok
+    ok = run_sweep() and ok
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Exercise the extraction sandbox (ExtractionExecutor.run_sandboxed): a task
+that runs past its timeout is killed, one that allocates past its memory
+limit is aborted, exceptions raised by a task reach the caller, a
+cancelled task's child is killed while its slot stays taken until the child
+has exited, and a PDF round-trips through parse_document_async.
+Run from backend directory: python test_sandbox.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.extraction_executor import (
+    ExtractionAbortedError,
+    ExtractionExecutor,
+    ExtractionTimeoutError,
+)
+
+
+# Sandbox tasks (module level, so the child process can unpickle them)
+
+def spin(seconds: float) -> str:
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        pass
+    return "finished"
+
+
+def hog(megabytes: int) -> int:
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def fail(message: str):
+    raise ValueError(message)
+
+
+def make_pdf() -> bytes:
+    import fitz
+    document = fitz.open()
+    page = document.new_page()
+    page.insert_text((72, 72), "Jane Doe\njane.doe@example.com\nSoftware Engineer, Python and FastAPI", fontsize=11)
+    return document.tobytes()
+
+
+async def expect(name: str, coro, error: type) -> bool:
+    started = time.perf_counter()
+    try:
+        result = await coro
+        print(f"✗ {name}: returned {result!r} instead of raising {error.__name__}")
+        return False
+    except error as e:
+        print(f"✓ {name}: {error.__name__} after {time.perf_counter() - started:.2f}s ({e})")
+        return True
+    except Exception as e:
+        print(f"✗ {name}: raised {type(e).__name__} instead of {error.__name__}: {e}")
+        return False
+
+
+async def check_cancellation() -> bool:
+    executor = ExtractionExecutor(pool_size=1)
+    task = asyncio.create_task(executor.run_sandboxed(spin, 5, timeout=30))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    held = executor.get_metrics()["running"] == 1
+    print(f"{'✓' if held else '✗'} slot still held right after the caller is cancelled")
+
+    # With one slot, the next task can only start once the cancelled child is gone
+    started = time.perf_counter()
+    result = await executor.run_sandboxed(spin, 0.1, timeout=10)
+    elapsed = time.perf_counter() - started
+    freed = result == "finished" and elapsed < 3 and executor.get_metrics()["running"] == 0
+    print(f"{'✓' if freed else '✗'} cancelled child killed, next task ran after {elapsed:.2f}s")
+    executor.shutdown()
+    return held and freed
+
+
+async def run() -> bool:
+    executor = ExtractionExecutor(pool_size=2)
+    ok = True
+
+    result = await executor.run_sandboxed(spin, 0.1, timeout=10)
+    print(f"{'✓' if result == 'finished' else '✗'} short task returns its result: {result!r}")
+    ok = ok and result == "finished"
+
+    ok = await expect("2s spin with a 0.5s timeout", executor.run_sandboxed(spin, 2, timeout=0.5), ExtractionTimeoutError) and ok
+    ok = await expect(
+        "512 MB allocation with a 256 MB limit",
+        executor.run_sandboxed(hog, 512, timeout=30, memory_limit_mb=256),
+        ExtractionAbortedError
+    ) and ok
+    ok = await expect("task raising ValueError", executor.run_sandboxed(fail, "bad file", timeout=10), ValueError) and ok
+
+    metrics = executor.get_metrics()
+    counters = {name: metrics[name] for name in ("completed", "timed_out", "aborted", "failed")}
+    counted = counters == {"completed": 1, "timed_out": 1, "aborted": 1, "failed": 1}
+    print(f"{'✓' if counted else '✗'} executor counters: {counters}")
+    ok = ok and counted
+
+    ok = await check_cancellation() and ok
+
+    # A normal parse through the sandbox (EXTRACTION_SANDBOX default)
+    from app.services.resume_extractor import extract_text_from_document_async, parse_document_async
+    document = await parse_document_async(make_pdf(), "resume.pdf")
+    text = await extract_text_from_document_async(document)
+    parsed = document.content is not None and "jane.doe@example.com" in text and document.page_count == 1
+    print(f"{'✓' if parsed else '✗'} parse_document_async round trip ({len(text)} chars, {document.page_count} page)")
+    ok = ok and parsed
+
+    executor.shutdown()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run()) else 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Check that ResumeScorer.score_against_jobs matches score_application job by job,
+and time both against a large set of synthetic jobs.
+Run from backend directory: python test_scoring_batch.py [--jobs 5000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.scoring_engine import ResumeScorer
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "react", "angular", "node.js", "django",
+    "fastapi", "docker", "kubernetes", "aws", "azure", "gcp", "sql", "mongodb", "redis",
+    "machine learning", "pandas", "numpy", "terraform", "git", "linux", "c++", "go",
+    "rust", "scala", "spark", "kafka", "graphql", "rest api", "ci/cd", "jenkins", "uipath",
+]
+EDUCATION = [None, "Any", "", "Bachelor's", "Master's", "PhD", "B.Tech", "MBA", "Diploma"]
+
+
+def make_job(rng: random.Random) -> dict:
+    skills = rng.sample(SKILLS, rng.randint(0, 12))
+    job = {
+        "title": "Synthetic Job",
+        "experience_required": rng.choice([0, 1, 2, 3, 5, 8, 2.5]),
+        "education_required": rng.choice(EDUCATION),
+    }
+    if rng.random() < 0.5:
+        job["weighted_skills"] = [
+            {"name": s.title() if rng.random() < 0.3 else s, "weight": rng.choice([1, 2, 5, 10, 0.5, 3.3])}
+            for s in skills
+        ]
+    else:
+        job["required_skills"] = [s.upper() if rng.random() < 0.2 else s for s in skills]
+    return job
+
+
+def make_candidate(rng: random.Random) -> tuple:
+    skills = rng.sample(SKILLS, rng.randint(0, 10))
+    candidate = {
+        "skills": [s.title() for s in skills],
+        "experience_years": rng.choice([0, 0.5, 1, 2.7, 4, 10]),
+        "education": rng.sample(["B.Tech Computer Science", "Master of Science", "MBA", "PhD Physics", "BSc"], rng.randint(0, 2)),
+    }
+    text_skills = rng.sample(SKILLS, rng.randint(0, 15))
+    resume_text = "Experienced engineer. " + " ".join(f"Worked with {s}." for s in text_skills)
+    return candidate, resume_text
+
+
+def check_equivalence(cases: int, jobs_per_case: int) -> bool:
+    rng = random.Random(42)
+    scorer = ResumeScorer()
+    mismatches = 0
+    for _ in range(cases):
+        candidate, resume_text = make_candidate(rng)
+        jobs = [make_job(rng) for _ in range(jobs_per_case)]
+        batch = scorer.score_against_jobs(candidate, resume_text, jobs)
+        for job, batch_result in zip(jobs, batch):
+            expected = scorer.score_application(candidate, resume_text, job)
+            if batch_result != expected:
+                mismatches += 1
+                if mismatches <= 3:
+                    print(f"✗ Mismatch for job {job}:\n  expected {expected}\n  got      {batch_result}")
+    total = cases * jobs_per_case
+    print(f"{'✓' if not mismatches else '✗'} {total - mismatches}/{total} batch results identical to score_application")
+    return mismatches == 0
+
+
+def benchmark(job_count: int):
+    rng = random.Random(7)
+    scorer = ResumeScorer()
+    candidate, resume_text = make_candidate(rng)
+    resume_text = resume_text * 50
+    jobs = [make_job(rng) for _ in range(job_count)]
+
+    started = time.perf_counter()
+    for job in jobs:
+        scorer.score_application(candidate, resume_text, job)
+    scalar = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scorer.score_against_jobs(candidate, resume_text, jobs)
+    batch = time.perf_counter() - started
+
+    print(f"{job_count} jobs: per-job loop {scalar * 1000:.1f} ms, batch {batch * 1000:.1f} ms ({scalar / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=5000)
+    args = parser.parse_args()
+
+    ok = check_equivalence(cases=200, jobs_per_case=25)
+    benchmark(args.jobs)
+    sys.exit(0 if ok else 1)
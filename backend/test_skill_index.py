@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Check the in-memory skill index against a brute-force scan, and time a
+10-skill query over a large synthetic pool.
+Run from backend directory: python test_skill_index.py [--pool 1000000]
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from bson import ObjectId
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.skill_index import SkillIndex
+
+SKILLS = [f"skill-{i}" for i in range(2000)]
+COMMON_SKILLS = SKILLS[:200]
+
+
+def make_pool(size: int, rng: random.Random) -> list:
+    return [
+        {"_id": ObjectId(), "candidate_skills": rng.sample(COMMON_SKILLS, 10) + rng.sample(SKILLS, 10)}
+        for _ in range(size)
+    ]
+
+
+def brute_force(pool: list, deleted: set, query: list) -> dict:
+    totals = {}
+    for app in pool:
+        app_id = str(app["_id"])
+        if app_id in deleted:
+            continue
+        skills = {s.lower() for s in app["candidate_skills"]}
+        total = sum(weight for name, weight in query if name in skills)
+        if total:
+            totals[app_id] = total
+    return totals
+
+
+def check_correctness() -> bool:
+    rng = random.Random(42)
+    pool = make_pool(20000, rng)
+    index = SkillIndex()
+    for app in pool:
+        index.add(app)
+
+    deleted = {str(app["_id"]) for app in rng.sample(pool, 6000)}
+    for app_id in deleted:
+        index.remove(app_id)
+
+    ok = True
+    for _ in range(20):
+        query = [(name, rng.choice([1, 2, 5, 0.5])) for name in rng.sample(COMMON_SKILLS, 10)]
+        expected = brute_force(pool, deleted, query)
+        best = sorted(expected.values(), reverse=True)[:100]
+        got = index.query(query, 100)
+        if [round(total, 6) for _, total in got] != [round(total, 6) for total in best]:
+            ok = False
+        if any(app_id in deleted or expected.get(app_id) != total for app_id, total in got):
+            ok = False
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **index.to_arrays())
+    buffer.seek(0)
+    restored = SkillIndex.from_arrays(np.load(buffer))
+    query = [(name, 1.0) for name in COMMON_SKILLS[:10]]
+    ok = ok and restored.query(query, 100) == index.query(query, 100) and len(restored) == len(index)
+
+    print(f"{'✓' if ok else '✗'} index top-100 matches brute force (with tombstones, compaction and snapshot round-trip)")
+    return ok
+
+
+def benchmark(pool_size: int):
+    rng = random.Random(7)
+    index = SkillIndex()
+    started = time.perf_counter()
+    for app in make_pool(pool_size, rng):
+        index.add(app)
+    build = time.perf_counter() - started
+
+    query = [(name, rng.choice([1, 2, 5])) for name in rng.sample(COMMON_SKILLS, 10)]
+    index.query(query, 300)
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        index.query(query, 300)
+        timings.append(time.perf_counter() - started)
+    print(f"{pool_size} candidates: built in {build:.1f}s, 10-skill top-300 shortlist in {min(timings) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pool", type=int, default=1000000)
+    args = parser.parse_args()
+
+    ok = check_correctness()
+    benchmark(args.pool)
+    sys.exit(0 if ok else 1)